@@ -0,0 +1,165 @@
+"""
+Load benchmark comparing the two ASGI serving modes.
+
+Drives a small AsyncFlask app in-process through ASGI, once wrapped in the
+WSGI bridge (ASGI_NATIVE=false) and once served natively (ASGI_NATIVE=true).
+The async route simulates an LLM-bound view (sync decorator around an async
+view awaiting I/O), the sync route a cheap JSON endpoint.
+
+    python benchmarks/asgi_modes.py --requests 2000 --concurrency 200 --latency 0.05
+
+Reports throughput, latency percentiles and the peak number of threads.
+"""
+
+import argparse
+import asyncio
+import inspect
+import threading
+import time
+from functools import wraps
+from statistics import quantiles
+
+from flask import g, jsonify
+
+from flask_structured_api.core.asgi import (
+    AsyncCompatibleWsgiToAsgi,
+    AsyncFlask,
+    NativeASGIApp,
+)
+
+
+def build_app(latency: float) -> AsyncFlask:
+    app = AsyncFlask(__name__)
+
+    def fake_auth(f):
+        # Sync decorator like require_auth, passing the coroutine through
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            g.user_id = 1
+            return f(*args, **kwargs)
+
+        return decorated
+
+    @app.route("/llm", methods=["POST"])
+    @fake_auth
+    async def llm():
+        await asyncio.sleep(latency)  # Upstream model call
+        return jsonify({"user": g.user_id, "result": "ok"})
+
+    @app.route("/ping")
+    def ping():
+        return jsonify({"status": "ok"})
+
+    @app.after_request
+    async def after_request(response):
+        # Resolves coroutine responses in WSGI mode, as setup_request_context does
+        if inspect.iscoroutine(response):
+            response = await response
+        return response
+
+    return app
+
+
+def build_asgi(mode: str, app: AsyncFlask):
+    if mode == "native":
+        return NativeASGIApp(app)
+    asgi_app = AsyncCompatibleWsgiToAsgi(app)
+    asgi_app.flask_app = app
+    return asgi_app
+
+
+async def call(asgi_app, method: str, path: str, body: bytes = b"") -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"bench"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    status = 0
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.Event().wait()  # No disconnect while the request runs
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await asyncio.wait_for(asgi_app(scope, receive, send), timeout=60)
+    return status
+
+
+async def run(mode: str, path: str, total: int, concurrency: int, latency: float):
+    asgi_app = build_asgi(mode, build_app(latency))
+    method = "POST" if path == "/llm" else "GET"
+    semaphore = asyncio.Semaphore(concurrency)
+    timings, statuses = [], []
+    peak_threads = threading.active_count()
+
+    async def one():
+        nonlocal peak_threads
+        async with semaphore:
+            start = time.perf_counter()
+            statuses.append(await call(asgi_app, method, path, b"{}"))
+            timings.append(time.perf_counter() - start)
+            peak_threads = max(peak_threads, threading.active_count())
+
+    await call(asgi_app, method, path, b"{}")  # Warm up
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+
+    cuts = quantiles(timings, n=100)
+    return {
+        "mode": mode,
+        "path": path,
+        "req_s": total / elapsed,
+        "p50_ms": cuts[49] * 1000,
+        "p95_ms": cuts[94] * 1000,
+        "errors": sum(1 for status in statuses if status != 200),
+        "threads": peak_threads,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="Simulated LLM latency (s)"
+    )
+    args = parser.parse_args()
+
+    print(
+        "{:<8} {:<6} {:>10} {:>10} {:>10} {:>7} {:>8}".format(
+            "mode", "path", "req/s", "p50 ms", "p95 ms", "errors", "threads"
+        )
+    )
+    for path in ("/llm", "/ping"):
+        for mode in ("wsgi", "native"):
+            result = asyncio.run(
+                run(mode, path, args.requests, args.concurrency, args.latency)
+            )
+            print(
+                "{mode:<8} {path:<6} {req_s:>10.1f} {p50_ms:>10.1f} {p95_ms:>10.1f} "
+                "{errors:>7} {threads:>8}".format(**result)
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Import-time regression benchmark.
+
+Imports each entry point in a fresh interpreter with ``python -X importtime``
+and fails when its cumulative import time exceeds the budget, or when it pulls
+in a module that must stay lazy (LLM SDKs, pandas).
+
+    python benchmarks/importtime.py
+    python benchmarks/importtime.py --runs 5 --top 15
+
+Needs the same environment as the app (REDIS_URL etc.); nothing connects to
+Postgres or Redis at import time.
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Entry point -> budget in milliseconds. Anything under flask_structured_api.core
+# loads the settings (pydantic-settings, ~200 ms) first. Each entry point is
+# imported on its own, so a circular import between packages shows up as ERROR.
+BUDGETS: Dict[str, int] = {
+    "flask_structured_api": 50,
+    "flask_structured_api.core.ai": 300,
+    "flask_structured_api.core.exceptions": 300,
+    "flask_structured_api.factory": 1200,
+    "flask_structured_api.core.cli": 1200,
+    "flask_structured_api.core.scripts.init_db": 1500,
+    "flask_structured_api.core.scripts.celery": 1800,
+}
+
+# Only imported when an AI provider is built or prompts are exported
+LAZY_MODULES = ("langchain", "langchain_core", "openai", "anthropic", "pandas")
+
+LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)")
+
+
+def measure(module: str) -> Tuple[float, List[Tuple[int, str]]]:
+    """Cumulative import time of ``module`` in ms and all (self us, name) pairs"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import {}".format(module)],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines()
+        message = lines[-1] if lines else "exit code {}".format(result.returncode)
+        raise RuntimeError(message)
+
+    cumulative = 0
+    imports = []
+    for match in LINE.finditer(result.stderr):
+        self_us, cumulative_us, _, name = match.groups()
+        imports.append((int(self_us), name))
+        if name == module:
+            cumulative = int(cumulative_us)
+    return cumulative / 1000, imports
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=3, help="Best of N runs")
+    parser.add_argument("--top", type=int, default=0, help="Show slowest imports")
+    args = parser.parse_args()
+
+    failed = False
+    for module, budget in BUDGETS.items():
+        try:
+            runs = [measure(module) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print("{:<45} ERROR {}".format(module, e))
+            failed = True
+            continue
+
+        elapsed, imports = min(runs, key=lambda run: run[0])
+        eager = sorted({
+            name.split(".")[0]
+            for _, name in imports
+            if name.split(".")[0] in LAZY_MODULES
+        })
+        ok = elapsed <= budget and not eager
+        failed |= not ok
+        print(
+            "{:<45} {:>8.1f} ms  (budget {:>4} ms)  {}{}".format(
+                module,
+                elapsed,
+                budget,
+                "ok" if ok else "FAIL",
+                "  eager: {}".format(", ".join(eager)) if eager else "",
+            )
+        )
+        for self_us, name in sorted(imports, reverse=True)[: args.top]:
+            print("    {:>8.1f} ms  {}".format(self_us / 1000, name))
+
+    if failed:
+        print("FAILED: an entry point did not import, missed its budget or "
+              "imported a lazy module")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
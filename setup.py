@@ -71,12 +71,20 @@ setup(
         ],
         "postgres": ["psycopg2-binary>=2.9.0"],  # Optional PostgreSQL driver
         "redis": ["redis>=5.0.0"],  # Optional Redis driver
+        # Optional storage compression codecs (zlib and lzma are built in)
+        "compression": ["zstandard>=0.22.0", "lz4>=4.3.0"],
+        # Optional faster serializers (stdlib json is the fallback)
+        "serialization": ["orjson>=3.9.0", "msgpack>=1.0.0"],
+        # Optional async database driver and SQLAlchemy asyncio (greenlet) for
+        # DB_ASYNC_ENABLED
+        "async": ["asyncpg>=0.29.0", "sqlalchemy[asyncio]>=2.0.0"],
     },
     entry_points={
         "flask.commands": [
             "tokens=flask_structured_api.core.cli.tokens:tokens_cli",
             "api-keys=flask_structured_api.core.cli.api_keys:api_keys_cli",
             "backup=flask_structured_api.core.cli.backup:backup_cli",
+            "storage=flask_structured_api.core.cli.storage:storage_cli",
         ],
         "console_scripts": [
             "flask-structured-api=flask_structured_api.cli:main",
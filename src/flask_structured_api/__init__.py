@@ -1,4 +1,12 @@
 from .__version__ import __version__
-from .factory import create_app
 
 __all__ = ["create_app", "__version__"]
+
+
+def __getattr__(name: str):
+    # Importing the package (CLI, Celery, scripts) shouldn't load the whole app
+    if name == "create_app":
+        from .factory import create_app
+
+        return create_app
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
@@ -3,7 +3,7 @@ import hashlib
 from flask import Blueprint, g, request
 
 from flask_structured_api.core.auth import require_auth
-from flask_structured_api.core.db import get_session
+from flask_structured_api.core.db import get_request_session
 from flask_structured_api.core.exceptions import APIError
 from flask_structured_api.core.models.requests.auth import (
     APIKeyRequest,
@@ -24,7 +24,7 @@ def register():
     data = request.get_json()
     register_data = RegisterRequest(**data)
 
-    db = next(get_session())
+    db = get_request_session()
     auth_service = AuthService(db)
 
     user = auth_service.register_user(register_data)
@@ -43,7 +43,7 @@ def login():
     data = request.get_json()
     login_data = LoginRequest(**data)
 
-    db = next(get_session())
+    db = get_request_session()
     auth_service = AuthService(db)
 
     token = auth_service.login(login_data)
@@ -55,7 +55,7 @@ def login():
 @require_auth
 def get_current_user():
     """Get current user information"""
-    db = next(get_session())
+    db = get_request_session()
     auth_service = AuthService(db)
 
     user = auth_service.get_user_by_id(g.user_id)
@@ -76,7 +76,7 @@ def refresh_token():
     data = request.get_json()
     refresh_data = RefreshTokenRequest(**data)
 
-    db = next(get_session())
+    db = get_request_session()
     auth_service = AuthService(db)
 
     token = auth_service.refresh_token(refresh_data.refresh_token)
@@ -90,7 +90,7 @@ def refresh_token():
 @require_auth
 def list_api_keys():
     """List all API keys for the authenticated user"""
-    db = next(get_session())
+    db = get_request_session()
     auth_service = AuthService(db)
 
     keys = auth_service.get_user_api_keys(g.user_id)
@@ -117,7 +117,7 @@ def create_api_key():
     data = request.get_json()
     key_data = APIKeyRequest(**data)
 
-    db = next(get_session())
+    db = get_request_session()
     auth_service = AuthService(db)
 
     # Create new API key
@@ -142,7 +142,7 @@ def create_api_key():
 @require_auth
 def revoke_api_key(key_id: int):
     """Revoke an API key"""
-    db = next(get_session())
+    db = get_request_session()
     auth_service = AuthService(db)
 
     # Get the current key hash if we're using API key auth
@@ -2,14 +2,20 @@ import platform
 import time
 
 import psutil
-from flask import Blueprint, current_app, g, jsonify, request
+from flask import Blueprint, Response, g, jsonify, request
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from sqlalchemy import text
 
-from flask_structured_api.core.auth import optional_auth, require_auth
-from flask_structured_api.core.cache import redis_client
+from flask_structured_api.core.auth import (
+    has_required_roles,
+    optional_auth,
+    require_auth,
+    require_roles,
+)
+from flask_structured_api.core.cache import get_redis
 from flask_structured_api.core.config import settings
-from flask_structured_api.core.db import engine
-from flask_structured_api.core.enums import StorageType
+from flask_structured_api.core.db import engine, get_pool_status
+from flask_structured_api.core.enums import StorageType, UserRole
 from flask_structured_api.core.models.responses import SuccessResponse
 from flask_structured_api.core.storage.decorators import store_api_data
 from flask_structured_api.core.utils.routes import get_filtered_routes
@@ -31,7 +37,7 @@ def check_database() -> bool:
 def check_redis() -> bool:
     """Check Redis connectivity"""
     try:
-        redis_client.ping()
+        get_redis().ping()
         return True
     except Exception:
         return False
@@ -57,6 +63,9 @@ def health_check():
             "redis": "healthy" if check_redis() else "unhealthy",
         },
     }
+    # Pool internals are for admins only, like /metrics
+    if hasattr(g, "user") and has_required_roles(g.user, UserRole.ADMIN):
+        response_data["database_pool"] = get_pool_status()
 
     response_data.update(
         {
@@ -87,3 +96,11 @@ def health_check():
     response.headers['X-Response-Time'] = str(response_time)
 
     return response
+
+
+@health_bp.route("/metrics", methods=["GET"])
+@require_auth
+@require_roles(UserRole.ADMIN)  # Exposes pool and write-behind internals
+def metrics():
+    """Prometheus metrics (database pool, storage writer)"""
+    return Response(generate_latest(), mimetype=CONTENT_TYPE_LATEST)
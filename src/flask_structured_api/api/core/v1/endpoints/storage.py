@@ -4,7 +4,7 @@ from flask import Blueprint, current_app, g, request
 from pydantic import ValidationError
 
 from flask_structured_api.core.auth import require_auth, require_roles
-from flask_structured_api.core.db import get_session
+from flask_structured_api.core.db import get_request_session
 from flask_structured_api.core.enums import (
     StorageType,
     UserRole,
@@ -68,7 +68,7 @@ def query_storage():
         data = _convert_storage_type(data)
         query = StorageQueryRequest(**data)
 
-        db = next(get_session())
+        db = get_request_session()
         storage_service = StorageService(db)
 
         result = storage_service.query_storage(user_id=g.user_id, **query.model_dump())
@@ -98,7 +98,7 @@ def delete_storage():
     data = request.get_json()
     delete_request = StorageDeleteRequest(**data)
 
-    db = next(get_session())
+    db = get_request_session()
     storage_service = StorageService(db)
 
     deleted_count = storage_service.delete_storage(
@@ -133,9 +133,9 @@ def list_sessions():
         query = params.to_session_query()
 
         # Exclude metadata_filters from the parameters
-        query_params = query.model_dump(exclude={"metadata_filters"})
+        query_params = query.model_dump(exclude={"metadata_filters", "include_data"})
 
-        db = next(get_session())
+        db = get_request_session()
         storage_service = StorageService(db)
 
         result = storage_service.list_user_sessions(user_id=g.user_id, **query_params)
@@ -166,7 +166,7 @@ def query_sessions():
         data = _convert_storage_type(data)
         query = SessionQueryRequest(**data)
 
-        db = next(get_session())
+        db = get_request_session()
         storage_service = StorageService(db)
 
         result = storage_service.get_user_sessions(
@@ -194,9 +194,11 @@ def list_sessions_post():
     data = request.get_json()
     query = SessionQueryRequest(**data)
 
-    db = next(get_session())
+    db = get_request_session()
     storage_service = StorageService(db)
 
-    result = storage_service.list_user_sessions(user_id=g.user_id, **query.model_dump())
+    result = storage_service.list_user_sessions(
+        user_id=g.user_id, **query.model_dump(exclude={"include_data"})
+    )
 
     return SuccessResponse(message="Storage sessions listed", data=result).model_dump()
@@ -1,7 +1,9 @@
 from flask import Blueprint, current_app, request, jsonify
 from flask_structured_api.api.custom.decorators import validate_country_code
 from flask_structured_api.core.auth import require_auth
+from flask_structured_api.core.config import settings
 from flask_structured_api.core.middleware.logging import debug_request, debug_response
+from flask_structured_api.core.middleware.rate_limit import rate_limit
 from flask_structured_api.core.models.errors import ErrorDetail
 from flask_structured_api.core.models.responses import ErrorResponse, SuccessResponse
 from flask_structured_api.core.storage.decorators import store_api_data
@@ -14,6 +16,7 @@ bp = Blueprint("stip_process", __name__)
 @bp.route("/<country_code>/process", methods=["POST", "OPTIONS"])
 @debug_request
 @require_auth
+@rate_limit(settings.RATE_LIMIT_STIP_PROCESS, scope="stip_process")
 @validate_country_code
 @store_api_data(ttl_days=365)
 @debug_response
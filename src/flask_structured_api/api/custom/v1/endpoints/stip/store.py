@@ -1,3 +1,7 @@
+from typing import Any, Optional
+
+from pydantic import ValidationError as PydanticValidationError
+
 from flask import Blueprint, request, current_app, g
 from flask_structured_api.core.auth import require_auth
 from flask_structured_api.core.middleware.logging import debug_request, debug_response
@@ -10,17 +14,34 @@ from flask_structured_api.core.enums import ErrorCode
 from flask_structured_api.core.enums import StorageType
 from flask_structured_api.core.models.errors import ErrorDetail
 from flask_structured_api.core.models.requests import StorageQueryRequest
-from flask_structured_api.core.services.storage import StorageService, StorageEntryResponse
-from flask_structured_api.core.db import get_session
-from flask_structured_api.core.models.requests.storage import StoreDataRequest, DataQueryRequest, DataQueryParamsRequest
-from flask_structured_api.core.models.domain.storage import APIStorage
-import json
-from sqlalchemy import select
+from flask_structured_api.core.services.storage import (
+    AsyncStorageService,
+    StorageEntryResponse,
+    StorageService,
+)
+from flask_structured_api.core.db import (
+    async_engine_enabled,
+    get_async_session,
+    get_request_session,
+)
+from flask_structured_api.core.models.requests.storage import (
+    StoreDataBatchRequest,
+    DataQueryRequest,
+    DataQueryParamsRequest,
+)
 
 from flask_structured_api.core.storage.decorators import store_api_data
 
 bp = Blueprint("stip_storage", __name__)
 
+
+def _initiative_name(data: Any) -> Optional[str]:
+    """Pull the initiative name out of a stored STIP result"""
+    # The STIP response (data) is stored inside the API response envelope (data)
+    response = data.get("data") if isinstance(data, dict) else None
+    result = response.get("data") if isinstance(response, dict) else None
+    return result.get("initiative_name") if isinstance(result, dict) else None
+
 # Note: These endpoints don't have an associated service because it's using the
 # storage decorators directly in order to store data in the database.
 
@@ -40,13 +61,17 @@ def store_data(country_code: str):
                 )
             ).to_response(status_code=400)
 
-        storage_service = StorageService(next(get_session()))
+        storage_service = StorageService(get_request_session())
 
         # Store the data and refresh to ensure we have the latest state
         stored_data = storage_service.store_data(
             user_id=g.user_id,
             data=data,
-            metadata={"country_code": country_code}
+            metadata={
+                "country_code": country_code,
+                # Kept in metadata so listings don't need to load the payload
+                "initiative_name": _initiative_name(data)
+            }
         )
         storage_service.db.refresh(stored_data)  # Refresh from DB instead of new query
 
@@ -58,8 +83,7 @@ def store_data(country_code: str):
             endpoint=stored_data.endpoint,
             ttl=stored_data.ttl,
             storage_info=stored_data.storage_metadata,
-            data=json.loads(
-                stored_data.response_data) if stored_data.response_data else None
+            data=stored_data.decode_data(stored_data.response_data)
         ).model_dump()  # Convert to dict using Pydantic's model_dump()
 
         # Return success response with stored data
@@ -79,6 +103,70 @@ def store_data(country_code: str):
         ).to_response(status_code=500)
 
 
+@bp.route("/<country_code>/data/store/batch", methods=["POST"])
+@require_auth
+def store_data_batch(country_code: str):
+    """
+    Store several data payloads for a given country code in one request.
+
+    Accepts either a JSON array of payloads or an object with ``items`` plus
+    optional ``ttl_days``, ``compress`` and shared ``metadata``. All entries are
+    inserted with a single statement and commit.
+
+    Returns:
+        JSON response with the stored IDs, in the order of the submitted items.
+    """
+    try:
+        body = request.get_json()
+        if not body:
+            return ErrorResponse(
+                message="No data provided",
+                error=ErrorDetail(
+                    code=ErrorCode.VALIDATION_ERROR,
+                    details={"error": "Request body is empty"}
+                )
+            ).to_response(status_code=400)
+
+        batch = StoreDataBatchRequest(
+            **({"items": body} if isinstance(body, list) else body)
+        )
+
+        storage_service = StorageService(get_request_session())
+        storage_ids = storage_service.store_many(
+            user_id=g.user_id,
+            items=batch.items,
+            ttl_days=batch.ttl_days,
+            compress=batch.compress,
+            metadata={**batch.storage_metadata, "country_code": country_code},
+            item_metadata=[
+                {"initiative_name": _initiative_name(item)} for item in batch.items
+            ]
+        )
+
+        return SuccessResponse(
+            message="Data stored successfully",
+            data={"ids": storage_ids, "count": len(storage_ids)}
+        ).to_response(status_code=200)
+
+    except PydanticValidationError as e:
+        return ErrorResponse(
+            message="Invalid batch format",
+            error=ErrorDetail(
+                code=ErrorCode.VALIDATION_ERROR,
+                details={"errors": e.errors(include_url=False, include_context=False)}
+            )
+        ).to_response(status_code=400)
+    except Exception as e:
+        current_app.logger.error(f"Failed to store data batch: {str(e)}", exc_info=True)
+        return ErrorResponse(
+            message="Failed to store data",
+            error=ErrorDetail(
+                code=ErrorCode.STORAGE_ERROR,
+                details={"error": str(e)}
+            )
+        ).to_response(status_code=500)
+
+
 @bp.route("/<country_code>/data/list", methods=["GET", "POST"])
 @require_auth
 def list_arbitrary_data(country_code: str):
@@ -100,7 +188,7 @@ def list_arbitrary_data(country_code: str):
         else:
             query_request = DataQueryParamsRequest(**request.args).to_query_request()
 
-        storage_service = StorageService(next(get_session()))
+        storage_service = StorageService(get_request_session())
 
         # Get the raw result from storage service
         result = storage_service.list_data(
@@ -109,14 +197,29 @@ def list_arbitrary_data(country_code: str):
             end_date=query_request.end_date,
             metadata_filters=query_request.metadata_filters,
             page=query_request.page,
-            page_size=query_request.page_size
+            page_size=query_request.page_size,
+            after_id=query_request.after_id,
+            include_data=False
+        )
+
+        # Entries stored before initiative_name moved into metadata need their payload
+        legacy_data = storage_service.get_data_many(
+            user_id=g.user_id,
+            storage_ids=[
+                item.id for item in result.items
+                if "initiative_name" not in item.storage_info
+            ]
         )
 
         # Transform items to only include metadata
         simplified_items = [
             {
                 "id": item.id,
-                "initiative_name": item.data.get("data").get("data").get("initiative_name"),
+                "initiative_name": (
+                    item.storage_info["initiative_name"]
+                    if "initiative_name" in item.storage_info
+                    else _initiative_name(legacy_data.get(item.id))
+                ),
                 "created_at": item.created_at,
                 "country_code": item.storage_info.get("country_code"),
                 "session_id": item.storage_info.get("session_id")
@@ -130,7 +233,8 @@ def list_arbitrary_data(country_code: str):
             "items": simplified_items,
             "page": result.page,
             "page_size": result.page_size,
-            "total": result.total
+            "total": result.total,
+            "next_after_id": result.next_after_id
         }
 
         response = SuccessResponse(
@@ -182,8 +286,14 @@ async def get_arbitrary_data(country_code: str, storage_id: int):
         JSON response with the retrieved data or an error message if not found.
     """
     try:
-        storage_service = StorageService(next(get_session()))
-        data = storage_service.get_data(user_id=g.user_id, storage_id=storage_id)
+        if async_engine_enabled():
+            async with get_async_session() as db:
+                data = await AsyncStorageService(db).get_data(
+                    user_id=g.user_id, storage_id=storage_id
+                )
+        else:
+            storage_service = StorageService(get_request_session())
+            data = storage_service.get_data(user_id=g.user_id, storage_id=storage_id)
 
         if data is None:
             response = ErrorResponse(
@@ -221,7 +331,7 @@ def delete_data(country_code: str, identifier: str):
     Delete stored data by storage ID or session ID for a given country code.
     """
     try:
-        storage_service = StorageService(next(get_session()))
+        storage_service = StorageService(get_request_session())
 
         # First check if data exists before attempting deletion
         if identifier.isdigit():
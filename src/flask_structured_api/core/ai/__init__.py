@@ -1,12 +1,17 @@
-from .decorators import log_ai_request, log_ai_response
-from .providers import (
-    BaseProvider,
-    OpenAIProvider,
-    AzureProvider,
-    AnthropicProvider,
-    get_provider,
-    PROVIDER_REGISTRY
-)
+from . import providers
+from .providers import get_provider
+
+
+def __getattr__(name: str):
+    # The decorators need Flask, provider classes their SDKs; both load lazily
+    if name in ("log_ai_request", "log_ai_response"):
+        from . import decorators
+
+        return getattr(decorators, name)
+    if name in providers.__all__:
+        return getattr(providers, name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
 
 __all__ = [
     # Decorators
@@ -1,24 +1,46 @@
-from typing import Dict, Type
-from flask_structured_api.core.ai.providers.base import BaseProvider
-from flask_structured_api.core.ai.providers.openai import OpenAIProvider
-from flask_structured_api.core.ai.providers.azure import AzureProvider
-from flask_structured_api.core.ai.providers.anthropic import AnthropicProvider
-from flask_structured_api.core.config import settings
-
-PROVIDER_REGISTRY: Dict[str, Type[BaseProvider]] = {
-    "openai": OpenAIProvider,
-    "azure": AzureProvider,
-    "anthropic": AnthropicProvider
+from importlib import import_module
+from typing import TYPE_CHECKING, Dict, Type
+
+if TYPE_CHECKING:
+    from flask_structured_api.core.ai.providers.base import BaseProvider
+
+# Provider classes are imported on first use, they pull in langchain and the
+# vendor SDKs which take seconds to import
+PROVIDER_MODULES: Dict[str, str] = {
+    "openai": "flask_structured_api.core.ai.providers.openai:OpenAIProvider",
+    "azure": "flask_structured_api.core.ai.providers.azure:AzureProvider",
+    "anthropic": "flask_structured_api.core.ai.providers.anthropic:AnthropicProvider",
+}
+_LAZY_ATTRIBUTES = {
+    "BaseProvider": "flask_structured_api.core.ai.providers.base:BaseProvider",
+    **{path.rsplit(":", 1)[1]: path for path in PROVIDER_MODULES.values()},
 }
 
 
-def get_provider(provider_name: str) -> BaseProvider:
-    """Get provider instance by name"""
-    provider_class = PROVIDER_REGISTRY.get(provider_name.lower())
-    if not provider_class:
+def _load(path: str):
+    module, name = path.split(":")
+    return getattr(import_module(module), name)
+
+
+def get_provider_class(provider_name: str) -> Type["BaseProvider"]:
+    """Import and return the provider class registered under a name"""
+    path = PROVIDER_MODULES.get(provider_name.lower())
+    if not path:
         raise ValueError("Unsupported AI provider: {}".format(provider_name))
+    return _load(path)
+
+
+def get_provider(provider_name: str) -> "BaseProvider":
+    """Get provider instance by name"""
+    return get_provider_class(provider_name)()
+
 
-    return provider_class()
+def __getattr__(name: str):
+    if name == "PROVIDER_REGISTRY":
+        return {key: get_provider_class(key) for key in PROVIDER_MODULES}
+    if name in _LAZY_ATTRIBUTES:
+        return _load(_LAZY_ATTRIBUTES[name])
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
 
 __all__ = [
@@ -27,5 +49,7 @@ __all__ = [
     'AzureProvider',
     'AnthropicProvider',
     'get_provider',
+    'get_provider_class',
+    'PROVIDER_MODULES',
     'PROVIDER_REGISTRY'
 ]
@@ -0,0 +1,293 @@
+import asyncio
+import contextvars
+import inspect
+import sys
+from io import BytesIO
+from itertools import chain
+from typing import Any, Dict, Optional
+
+from asgiref.wsgi import WsgiToAsgi
+from flask import Flask, Response, request
+from flask.globals import request_ctx
+from flask.signals import request_finished, request_started
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import RequestRedirect
+
+# Set while a request is dispatched natively on the server's event loop
+_native_dispatch: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "native_dispatch", default=False
+)
+
+# The event loop NativeASGIApp serves on, set by the lifespan startup
+_server_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def on_server_loop() -> bool:
+    """
+    Whether the running event loop is the ASGI server's.
+
+    Async clients and engines are only kept on that loop and closed at its
+    lifespan shutdown. Other loops (``async_to_sync``, ``asyncio.run`` in
+    Celery or the CLI) live for one call, so code there uses the sync clients.
+    """
+    try:
+        return asyncio.get_running_loop() is _server_loop
+    except RuntimeError:
+        return False
+
+
+async def _resolve(value: Any) -> Any:
+    """Await coroutines returned by views, handlers and hooks"""
+    while inspect.isawaitable(value):
+        value = await value
+    return value
+
+
+class AsyncFlask(Flask):
+    """Flask subclass that handles both sync and async responses"""
+
+    def make_response(self, rv):
+        """Override to handle both coroutine and regular returns"""
+        if inspect.iscoroutine(rv):
+            # For async endpoints, return the coroutine directly
+            # It will be handled by the ASGI wrapper
+            return rv
+        # For sync endpoints, handle normally
+        return super().make_response(rv)
+
+    def ensure_sync(self, func):
+        """Leave async callables as they are while dispatching natively"""
+        if _native_dispatch.get():
+            return func
+        return super().ensure_sync(func)
+
+    def is_async_view(self, endpoint: str) -> bool:
+        """Whether the view behind ``endpoint`` is a coroutine function"""
+        view = self.view_functions.get(endpoint)
+        return view is not None and inspect.iscoroutinefunction(inspect.unwrap(view))
+
+    async def handle_request_async(self, environ: Dict[str, Any]) -> Response:
+        """``wsgi_app`` for the event loop: await every coroutine in place"""
+        ctx = self.request_context(environ)
+        token = _native_dispatch.set(True)
+        error = None
+        try:
+            try:
+                ctx.push()
+                response = await self.full_dispatch_request_async()
+            except Exception as e:
+                error = e
+                response = await _resolve(self.handle_exception(e))
+            return response
+        finally:
+            if error is not None and self.should_ignore_error(error):
+                error = None
+            ctx.pop(error)
+            _native_dispatch.reset(token)
+
+    async def full_dispatch_request_async(self) -> Response:
+        self._got_first_request = True
+        try:
+            request_started.send(self, _async_wrapper=self.ensure_sync)
+            rv = await self.preprocess_request_async()
+            if rv is None:
+                rv = await _resolve(self.dispatch_request())
+        except Exception as e:
+            rv = await _resolve(self.handle_user_exception(e))
+
+        response = self.make_response(rv)
+        response = await self.process_response_async(response)
+        request_finished.send(self, _async_wrapper=self.ensure_sync, response=response)
+        return response
+
+    async def preprocess_request_async(self):
+        names = (None, *reversed(request.blueprints))
+        for name in names:
+            for url_func in self.url_value_preprocessors.get(name, ()):
+                url_func(request.endpoint, request.view_args)
+
+        for name in names:
+            for before_func in self.before_request_funcs.get(name, ()):
+                rv = await _resolve(before_func())
+                if rv is not None:
+                    return rv
+        return None
+
+    async def process_response_async(self, response: Response) -> Response:
+        ctx = request_ctx._get_current_object()
+        for func in ctx._after_request_functions:
+            response = await _resolve(func(response))
+
+        for name in chain(request.blueprints, (None,)):
+            for func in reversed(self.after_request_funcs.get(name, ())):
+                response = await _resolve(func(response))
+
+        if not self.session_interface.is_null_session(ctx.session):
+            self.session_interface.save_session(self, ctx.session, response)
+        return response
+
+
+class AsyncCompatibleWsgiToAsgi(WsgiToAsgi):
+    """Custom ASGI wrapper that handles both sync and async responses"""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            async def modified_send(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers = [h for h in headers if h[0].lower() != b"content-length"]
+                    headers.append((b"transfer-encoding", b"chunked"))
+                    message["headers"] = headers
+                await send(message)
+
+            response = await super().__call__(scope, receive, modified_send)
+
+            # If response is a coroutine, await it
+            if inspect.iscoroutine(response):
+                response = await response
+
+            return response
+        return await super().__call__(scope, receive, send)
+
+
+class NativeASGIApp:
+    """
+    ASGI application serving an AsyncFlask app without the WSGI bridge.
+
+    Async views run as coroutines on the server's event loop, so concurrent
+    I/O-bound requests (LLM calls) share one thread instead of holding one
+    each. Sync views still go through asgiref's thread executor so they can't
+    block the loop.
+    """
+
+    def __init__(self, flask_app: AsyncFlask):
+        self.flask_app = flask_app
+        self.wsgi_fallback = WsgiToAsgi(flask_app)
+        self._async_endpoints: Dict[str, bool] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            raise ValueError("Unsupported ASGI scope type: {}".format(scope["type"]))
+
+        environ = self.build_environ(scope)
+        if not self._is_async_route(environ):
+            await self.wsgi_fallback(scope, receive, send)
+            return
+
+        body = await self._read_body(receive)
+        if body is None:
+            return  # Client disconnected
+        environ["wsgi.input"] = BytesIO(body)
+
+        response = await self.flask_app.handle_request_async(environ)
+        await self._send_response(response, environ, send)
+
+    def _is_async_route(self, environ: Dict[str, Any]) -> bool:
+        adapter = self.flask_app.url_map.bind_to_environ(
+            environ, server_name=self.flask_app.config["SERVER_NAME"]
+        )
+        try:
+            rule, _ = adapter.match(return_rule=True)
+        except (HTTPException, RequestRedirect):
+            return False  # Let Flask produce the error or redirect
+
+        endpoint = rule.endpoint
+        if endpoint not in self._async_endpoints:
+            self._async_endpoints[endpoint] = self.flask_app.is_async_view(endpoint)
+        return self._async_endpoints[endpoint]
+
+    @staticmethod
+    def build_environ(scope) -> Dict[str, Any]:
+        """WSGI environ for an ASGI HTTP scope, as asgiref builds it"""
+        environ = {
+            "REQUEST_METHOD": scope["method"],
+            "SCRIPT_NAME": scope.get("root_path", "").encode("utf8").decode("latin1"),
+            "PATH_INFO": scope["path"].encode("utf8").decode("latin1"),
+            "QUERY_STRING": scope["query_string"].decode("ascii"),
+            "SERVER_PROTOCOL": "HTTP/{}".format(scope["http_version"]),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": scope.get("scheme", "http"),
+            "wsgi.input": BytesIO(),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": True,
+            "wsgi.run_once": False,
+        }
+        server = scope.get("server") or ("localhost", 80)
+        environ["SERVER_NAME"] = server[0]
+        environ["SERVER_PORT"] = str(server[1])
+        if scope.get("client"):
+            environ["REMOTE_ADDR"] = scope["client"][0]
+
+        for name, value in scope.get("headers", []):
+            name = name.decode("latin1")
+            if name == "content-length":
+                key = "CONTENT_LENGTH"
+            elif name == "content-type":
+                key = "CONTENT_TYPE"
+            else:
+                key = "HTTP_{}".format(name.upper().replace("-", "_"))
+            value = value.decode("latin1")
+            if key in environ:
+                value = "{},{}".format(environ[key], value)
+            environ[key] = value
+        return environ
+
+    @staticmethod
+    async def _read_body(receive):
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return None
+            body.extend(message.get("body", b""))
+            if not message.get("more_body", False):
+                return bytes(body)
+
+    @staticmethod
+    async def _send_response(response: Response, environ, send) -> None:
+        app_iter, status, headers = response.get_wsgi_response(environ)
+        try:
+            await send({
+                "type": "http.response.start",
+                "status": int(status.split(" ", 1)[0]),
+                "headers": [
+                    (name.lower().encode("latin1"), value.encode("latin1"))
+                    for name, value in headers
+                ],
+            })
+            if response.is_streamed:
+                for chunk in app_iter:
+                    if chunk:
+                        await send({
+                            "type": "http.response.body",
+                            "body": chunk,
+                            "more_body": True,
+                        })
+                await send({"type": "http.response.body", "body": b""})
+            else:
+                await send({"type": "http.response.body", "body": b"".join(app_iter)})
+        finally:
+            if hasattr(app_iter, "close"):
+                app_iter.close()
+
+    @staticmethod
+    async def _lifespan(receive, send) -> None:
+        global _server_loop
+        from flask_structured_api.core.cache import close_async_redis
+        from flask_structured_api.core.db.engine import dispose_async_engine
+
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                _server_loop = asyncio.get_running_loop()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                _server_loop = None
+                await close_async_redis()
+                await dispose_async_engine()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
@@ -9,7 +9,7 @@ from flask import g, request, current_app, jsonify
 from werkzeug.security import check_password_hash, generate_password_hash
 
 from flask_structured_api.core.config import settings
-from flask_structured_api.core.db import get_session
+from flask_structured_api.core.db import get_request_session
 from flask_structured_api.core.enums import UserRole, ErrorCode
 from flask_structured_api.core.exceptions import APIError
 from flask_structured_api.core.models.responses import TokenResponse, ErrorResponse
@@ -20,10 +20,13 @@ logger = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
     # Import User model for type checking only
+    from flask_structured_api.core.cache.auth import AuthPrincipal
     from flask_structured_api.core.models.domain import User
 
 
-def has_required_roles(user: "User", required_roles: Union[List[str], str]) -> bool:
+def has_required_roles(
+    user: Union["User", "AuthPrincipal"], required_roles: Union[List[str], str]
+) -> bool:
     """Check if user has any of the required roles"""
     if not required_roles:
         return True
@@ -74,7 +77,7 @@ def require_auth(f):
                     token_type, token = auth_header.split(" ", 1)
                     token_type = token_type.lower()
 
-                    db = next(get_session())
+                    db = get_request_session()
                     auth_service = AuthService(db)
 
                     if token_type == "bearer":
@@ -110,7 +113,7 @@ def require_auth(f):
             # Fallback to X-API-Key header
             api_key = request.headers.get("X-API-Key")
             if api_key:
-                db = next(get_session())
+                db = get_request_session()
                 auth_service = AuthService(db)
                 user = auth_service.validate_api_key(api_key)
                 g.user = user
@@ -155,7 +158,7 @@ def optional_auth(f):
                 token_type, token = auth_header.split()
                 token_type = token_type.lower()
 
-                db = next(get_session())
+                db = get_request_session()
                 auth_service = AuthService(db)
 
                 if token_type == "bearer":
@@ -170,7 +173,7 @@ def optional_auth(f):
                 else:
                     return f(*args, **kwargs)
             elif api_key_header:
-                db = next(get_session())
+                db = get_request_session()
                 auth_service = AuthService(db)
                 user = auth_service.validate_api_key(api_key_header)
                 g.user = user
@@ -1,5 +1,12 @@
+import threading
+from time import monotonic
+from typing import Optional
+
 from redis import ConnectionPool, Redis, RedisError
+from redis.asyncio import ConnectionPool as AsyncConnectionPool
+from redis.asyncio import Redis as AsyncRedis
 
+from flask_structured_api.core.asgi import on_server_loop
 from flask_structured_api.core.config import settings
 from flask_structured_api.core.exceptions import APIError
 from flask_structured_api.core.utils.logger import get_standalone_logger
@@ -7,18 +14,27 @@ from flask_structured_api.core.utils.logger import get_standalone_logger
 # Create standalone logger for Redis
 redis_logger = get_standalone_logger("redis")
 
+POOL_OPTIONS = {
+    "max_connections": settings.REDIS_MAX_CONNECTIONS,
+    "decode_responses": True,
+    "socket_connect_timeout": 2,
+    "socket_keepalive": True,
+    "retry_on_timeout": True,
+}
+
+
+def _unavailable() -> APIError:
+    return APIError(
+        message="Redis service unavailable",
+        code="REDIS_UNAVAILABLE",
+        status_code=503,
+    )
+
 
 def create_redis_client() -> Redis:
     """Create Redis client with error handling"""
     try:
-        pool = ConnectionPool.from_url(
-            settings.REDIS_URL,
-            max_connections=settings.REDIS_MAX_CONNECTIONS,
-            decode_responses=True,
-            socket_connect_timeout=2,
-            socket_keepalive=True,
-            retry_on_timeout=True,
-        )
+        pool = ConnectionPool.from_url(settings.REDIS_URL, **POOL_OPTIONS)
         client = Redis(connection_pool=pool)
         client.ping()
         redis_logger.info("Redis connection established")
@@ -36,16 +52,67 @@ def create_redis_client() -> Redis:
         )
 
 
-# Global redis client
-redis_client = create_redis_client()
+# Global redis client, connected on first use
+redis_client: Optional[Redis] = None
+_redis_lock = threading.Lock()
+_redis_retry_at = 0.0
+
+# Async client of the ASGI server's event loop, connections can't cross loops
+async_redis_client: Optional[AsyncRedis] = None
 
 
 def get_redis() -> Redis:
-    """Get Redis client"""
-    if redis_client is None:
-        raise APIError(
-            message="Redis service unavailable",
-            code="REDIS_UNAVAILABLE",
-            status_code=503,
-        )
+    """
+    Get Redis client, connecting on first use.
+
+    After a failed connection attempt, calls raise APIError without retrying
+    for REDIS_RECONNECT_SECONDS so an outage doesn't stall every request.
+    """
+    global redis_client, _redis_retry_at
+    if redis_client is not None:
+        return redis_client
+
+    with _redis_lock:
+        if redis_client is None:
+            if monotonic() < _redis_retry_at:
+                raise _unavailable()
+            try:
+                redis_client = create_redis_client()
+            except APIError:
+                _redis_retry_at = monotonic() + settings.REDIS_RECONNECT_SECONDS
+                raise
     return redis_client
+
+
+def async_redis_enabled() -> bool:
+    """Whether async code should use the asyncio client instead of ``get_redis``"""
+    return on_server_loop()
+
+
+def get_async_redis() -> AsyncRedis:
+    """
+    Get the asyncio Redis client of the ASGI server's event loop.
+
+    The client is created lazily with its own connection pool and connects on
+    its first command, errors surface there as RedisError. It is closed by
+    ``close_async_redis`` at lifespan shutdown; on any other loop check
+    ``async_redis_enabled`` first and use ``get_redis``.
+    """
+    global async_redis_client
+    if not on_server_loop():
+        raise RuntimeError("The async Redis client needs the server's event loop")
+    if redis_client is None and monotonic() < _redis_retry_at:
+        raise _unavailable()
+
+    if async_redis_client is None:
+        pool = AsyncConnectionPool.from_url(settings.REDIS_URL, **POOL_OPTIONS)
+        async_redis_client = AsyncRedis(connection_pool=pool)
+    return async_redis_client
+
+
+async def close_async_redis() -> None:
+    """Close the asyncio client and its connection pool"""
+    global async_redis_client
+    client, async_redis_client = async_redis_client, None
+    if client is not None:
+        await client.aclose(close_connection_pool=True)
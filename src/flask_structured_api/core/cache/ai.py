@@ -0,0 +1,188 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from time import monotonic, time
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from flask import has_request_context, request
+from prometheus_client import Counter
+from redis import RedisError
+
+from flask_structured_api.core.cache import (
+    async_redis_enabled,
+    get_async_redis,
+    get_redis,
+)
+from flask_structured_api.core.config import settings
+from flask_structured_api.core.exceptions import APIError
+from flask_structured_api.core.utils.logger import get_standalone_logger
+from flask_structured_api.core.utils.serialization import dumps, loads
+
+if TYPE_CHECKING:
+    from flask_structured_api.core.models.requests.ai import AICompletionRequest
+    from flask_structured_api.core.models.responses.ai import AICompletionResponse
+
+ai_cache_logger = get_standalone_logger("ai.cache")
+
+RESPONSE_KEY = "ai:response:{}"
+# "X-AI-Cache: bypass" skips the lookup, the fresh response is still stored
+BYPASS_HEADER = "X-AI-Cache"
+
+# Fields of AICompletionResponse worth replaying, warnings are per request
+CACHED_FIELDS = {
+    "content", "success", "confidence", "role", "finish_reason", "usage",
+    "response_schema",
+}
+
+AI_CACHE_LOOKUPS = Counter(
+    "api_ai_response_cache_lookups_total",
+    "AI response cache lookups",
+    ["outcome"],  # hit_local | hit_redis | miss | bypass
+)
+
+
+def completion_key(
+    provider: str,
+    model: Optional[str],
+    request: "AICompletionRequest",
+    response_schema: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Content address of a completion: a sha256 over everything that shapes it.
+
+    Hashes canonical stdlib JSON so every process derives the same key whether
+    or not orjson is installed.
+    """
+    payload = {
+        "provider": provider,
+        "model": model,
+        "messages": [message.model_dump() for message in request.messages],
+        "temperature": request.temperature,
+        "max_tokens": request.max_tokens,
+        "response_schema": response_schema,
+    }
+    canonical = json.dumps(
+        payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def bypass_requested() -> bool:
+    """Whether the current request asked to skip cached AI responses"""
+    if not has_request_context():
+        return False
+    return request.headers.get(BYPASS_HEADER, "").strip().lower() == "bypass"
+
+
+class AIResponseCache:
+    """
+    Content-addressed cache of AI completions in Redis.
+
+    An optional in-process LRU tier (``local_size`` > 0) sits in front of
+    Redis. Only requests at or below ``max_temperature`` are cached, so
+    sampling-heavy generations keep their variety. Entries are stored
+    serialized and decoded on every hit, callers can't mutate a shared copy.
+    Redis errors are logged and treated as misses.
+    """
+
+    def __init__(
+        self,
+        ttl: int = 86400,
+        local_size: int = 0,
+        local_ttl: int = 300,
+        max_temperature: float = 0.3,
+    ):
+        self.ttl = ttl
+        self.local_size = local_size
+        self.local_ttl = local_ttl
+        self.max_temperature = max_temperature
+        self._local: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def cacheable(self, request: "AICompletionRequest") -> bool:
+        return settings.AI_CACHE_ENABLED and request.temperature <= self.max_temperature
+
+    async def lookup(
+        self, key: str, bypass: bool = False
+    ) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        """Cached entry for ``key`` (or None) and the cache metadata to report"""
+        if bypass:
+            AI_CACHE_LOOKUPS.labels(outcome="bypass").inc()
+            return None, {"status": "bypass", "key": key}
+
+        tier = "local"
+        raw = self._get_local(key)
+        if raw is None:
+            tier = "redis"
+            raw = await self._get_redis(key)
+            if raw is not None:
+                self._set_local(key, raw)
+
+        if raw is None:
+            AI_CACHE_LOOKUPS.labels(outcome="miss").inc()
+            return None, {"status": "miss", "key": key}
+
+        AI_CACHE_LOOKUPS.labels(outcome="hit_{}".format(tier)).inc()
+        entry = loads(raw)
+        return entry, {
+            "status": "hit",
+            "tier": tier,
+            "key": key,
+            "age": round(time() - entry.get("cached_at", time()), 3),
+        }
+
+    async def set(self, key: str, response: "AICompletionResponse") -> None:
+        """Store a completion in both tiers"""
+        entry = response.model_dump(include=CACHED_FIELDS)
+        entry["cached_at"] = time()
+        raw = dumps(entry)
+
+        self._set_local(key, raw)
+        try:
+            if async_redis_enabled():
+                await get_async_redis().set(RESPONSE_KEY.format(key), raw, ex=self.ttl)
+            else:
+                get_redis().set(RESPONSE_KEY.format(key), raw, ex=self.ttl)
+        except (APIError, RedisError) as e:
+            ai_cache_logger.warning(f"AI response cache write failed: {str(e)}")
+
+    async def _get_redis(self, key: str) -> Optional[bytes]:
+        try:
+            if async_redis_enabled():
+                raw = await get_async_redis().get(RESPONSE_KEY.format(key))
+            else:
+                raw = get_redis().get(RESPONSE_KEY.format(key))
+        except (APIError, RedisError) as e:
+            ai_cache_logger.warning(f"AI response cache read failed: {str(e)}")
+            return None
+        return raw.encode() if isinstance(raw, str) else raw
+
+    def _get_local(self, key: str) -> Optional[bytes]:
+        if not self.local_size:
+            return None
+        with self._lock:
+            entry = self._local.get(key)
+            if entry and entry[0] > monotonic():
+                self._local.move_to_end(key)
+                return entry[1]
+            self._local.pop(key, None)
+        return None
+
+    def _set_local(self, key: str, raw: bytes) -> None:
+        if not self.local_size:
+            return
+        with self._lock:
+            self._local[key] = (monotonic() + self.local_ttl, raw)
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+
+# Global AI response cache
+ai_response_cache = AIResponseCache(
+    ttl=settings.AI_CACHE_TTL_SECONDS,
+    local_size=settings.AI_CACHE_LOCAL_SIZE,
+    local_ttl=settings.AI_CACHE_LOCAL_TTL_SECONDS,
+    max_temperature=settings.AI_CACHE_MAX_TEMPERATURE,
+)
@@ -0,0 +1,176 @@
+import atexit
+import os
+import threading
+from datetime import datetime
+from time import monotonic, time
+from typing import Dict, List, Optional, Tuple
+
+from redis import RedisError
+from sqlalchemy import DateTime, Integer, column, or_, update, values
+from sqlmodel import Session
+
+from flask_structured_api.core.cache import get_redis
+from flask_structured_api.core.config import settings
+from flask_structured_api.core.db import engine
+from flask_structured_api.core.exceptions import APIError
+from flask_structured_api.core.models.domain.api_key import APIKey
+from flask_structured_api.core.utils.logger import get_standalone_logger
+
+usage_logger = get_standalone_logger("auth.key_usage")
+
+USAGE_KEY = "auth:key_last_used"
+FLUSH_LOCK_KEY = "auth:key_last_used:lock"
+
+
+class APIKeyUsageTracker:
+    """
+    Debounced ``api_keys.last_used_at`` tracking.
+
+    Each process records a key at most once per ``resolution`` seconds into a
+    Redis sorted set (key id -> last use timestamp); requests never touch the
+    database. Every ``flush_interval`` seconds a background thread per process
+    (and the ``auth.flush_api_key_usage`` beat task, where Celery runs) tries
+    to flush: the one holding a short Redis lock moves the set aside and
+    writes it to Postgres with a single bulk UPDATE. Without Redis the pending
+    timestamps are kept in memory and flushed by the same process.
+    """
+
+    def __init__(self, resolution: int = 60, flush_interval: int = 60):
+        self.resolution = resolution
+        self.flush_interval = flush_interval
+        self._recorded: Dict[int, float] = {}
+        self._pending: Dict[int, float] = {}  # used when Redis is unavailable
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def record(self, api_key_id: int) -> None:
+        """Note that a key was used now, cheap enough for every request"""
+        now = monotonic()
+        with self._lock:
+            if now - self._recorded.get(api_key_id, float("-inf")) < self.resolution:
+                return
+            self._recorded[api_key_id] = now
+
+        self._ensure_started()
+        timestamp = time()
+        try:
+            get_redis().zadd(USAGE_KEY, {str(api_key_id): timestamp}, gt=True)
+        except (APIError, RedisError):
+            with self._lock:
+                self._pending[api_key_id] = timestamp
+
+    def stop(self) -> None:
+        """Stop the background thread and flush what this process holds"""
+        self._stop.set()
+        self.flush(lock=True)
+
+    def _ensure_started(self) -> None:
+        """Start the flush thread lazily, once per process (forked workers included)"""
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="api-key-usage", daemon=True
+            )
+            self._thread.start()
+            atexit.register(self.stop)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush(lock=True)
+
+    def flush(self, lock: bool = False) -> int:
+        """Write recorded timestamps to api_keys, returns the number of keys"""
+        usage = self._take_pending()
+        try:
+            usage += self._take_redis(lock)
+        except (APIError, RedisError) as e:
+            usage_logger.warning(f"Could not read API key usage: {str(e)}")
+
+        if not usage:
+            return 0
+
+        try:
+            self._write(usage)
+        except Exception as e:
+            usage_logger.error(f"Failed to flush API key usage: {str(e)}")
+            self._restore(usage)
+            return 0
+        return len({api_key_id for api_key_id, _ in usage})
+
+    def _take_pending(self) -> List[Tuple[int, float]]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return list(pending.items())
+
+    def _take_redis(self, lock: bool) -> List[Tuple[int, float]]:
+        redis = get_redis()
+        if lock and not redis.set(
+            FLUSH_LOCK_KEY, "1", nx=True, ex=max(self.flush_interval // 2, 1)
+        ):
+            return []  # Another worker is flushing
+
+        # Move the set aside so uses recorded meanwhile start a fresh one
+        flushing = "{}:flushing".format(USAGE_KEY)
+        try:
+            redis.rename(USAGE_KEY, flushing)
+        except RedisError:
+            return []  # Nothing recorded
+        entries = redis.zrange(flushing, 0, -1, withscores=True)
+        redis.delete(flushing)
+        return [(int(member), score) for member, score in entries]
+
+    def _write(self, usage: List[Tuple[int, float]]) -> None:
+        latest: Dict[int, float] = {}
+        for api_key_id, timestamp in usage:
+            latest[api_key_id] = max(timestamp, latest.get(api_key_id, timestamp))
+
+        last_used = values(
+            column("id", Integer), column("last_used_at", DateTime), name="last_used"
+        ).data([
+            (api_key_id, datetime.utcfromtimestamp(timestamp))
+            for api_key_id, timestamp in latest.items()
+        ])
+        api_keys = APIKey.__table__
+        query = (
+            update(api_keys)
+            .where(
+                api_keys.c.id == last_used.c.id,
+                or_(
+                    api_keys.c.last_used_at.is_(None),
+                    api_keys.c.last_used_at < last_used.c.last_used_at,
+                ),
+            )
+            .values(last_used_at=last_used.c.last_used_at)
+        )
+        with Session(engine) as session:
+            session.execute(query)
+            session.commit()
+
+    def _restore(self, usage: List[Tuple[int, float]]) -> None:
+        """Put timestamps back after a failed write so the next flush retries"""
+        try:
+            get_redis().zadd(
+                USAGE_KEY,
+                {str(api_key_id): timestamp for api_key_id, timestamp in usage},
+                gt=True,
+            )
+        except (APIError, RedisError):
+            with self._lock:
+                for api_key_id, timestamp in usage:
+                    self._pending[api_key_id] = max(
+                        timestamp, self._pending.get(api_key_id, timestamp)
+                    )
+
+
+# Global API key usage tracker
+api_key_usage = APIKeyUsageTracker(
+    resolution=settings.API_KEY_USAGE_RESOLUTION_SECONDS,
+    flush_interval=settings.API_KEY_USAGE_FLUSH_SECONDS,
+)
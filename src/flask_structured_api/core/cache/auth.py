@@ -0,0 +1,210 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from time import monotonic
+from typing import Any, Dict, List, Optional, Tuple
+
+from redis import RedisError
+
+from flask_structured_api.core.cache import get_redis
+from flask_structured_api.core.config import settings
+from flask_structured_api.core.enums import UserRole
+from flask_structured_api.core.exceptions import APIError
+from flask_structured_api.core.utils.logger import get_standalone_logger
+
+auth_cache_logger = get_standalone_logger("auth.cache")
+
+INVALIDATION_CHANNEL = "auth:invalidate"
+# Stateless JWT revocation: per-user token version and per-token deny-list
+TOKEN_VERSION_KEY = "auth:token_version:{}"
+DENIED_TOKEN_KEY = "auth:denied_token:{}"
+
+
+@dataclass(frozen=True)
+class AuthPrincipal:
+    """Compact view of an authenticated user, cheap to cache and share"""
+
+    id: int
+    role: UserRole
+    is_active: bool
+    full_name: str = ""
+    email: str = ""
+    scopes: List[str] = field(default_factory=list)
+    api_key_id: Optional[int] = None
+    expires_at: Optional[datetime] = None  # API key expiry
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["role"] = self.role.value
+        data["expires_at"] = self.expires_at.isoformat() if self.expires_at else None
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AuthPrincipal":
+        data = dict(data)
+        data["role"] = UserRole(data["role"])
+        if data.get("expires_at"):
+            data["expires_at"] = datetime.fromisoformat(data["expires_at"])
+        return cls(**data)
+
+
+class AuthCache:
+    """
+    Two-tier cache of auth principals: an in-process LRU in front of Redis.
+
+    Entries are keyed by API key hash or JWT subject. Local entries live for
+    AUTH_CACHE_LOCAL_TTL_SECONDS, Redis entries for AUTH_CACHE_TTL_SECONDS.
+    ``invalidate`` removes a key from both tiers and publishes it on
+    ``auth:invalidate`` so other processes drop their local copy. Redis errors
+    are logged and treated as cache misses.
+    """
+
+    def __init__(self, max_size: int = 1024, local_ttl: int = 10, ttl: int = 60):
+        self.max_size = max_size
+        self.local_ttl = local_ttl
+        self.ttl = ttl
+        self._local: "OrderedDict[str, Tuple[float, AuthPrincipal]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._listener_pid: Optional[int] = None
+
+    @staticmethod
+    def api_key_key(key_hash: str) -> str:
+        return f"auth:key:{key_hash}"
+
+    @staticmethod
+    def user_key(user_id: int) -> str:
+        return f"auth:user:{user_id}"
+
+    def get(self, key: str) -> Optional[AuthPrincipal]:
+        """Get a cached principal, from memory first and Redis second"""
+        if not settings.AUTH_CACHE_ENABLED:
+            return None
+
+        with self._lock:
+            entry = self._local.get(key)
+            if entry and entry[0] > monotonic():
+                self._local.move_to_end(key)
+                return entry[1]
+            self._local.pop(key, None)
+
+        redis = self._redis()
+        if redis is None:
+            return None
+        try:
+            cached = redis.get(key)
+        except RedisError as e:
+            auth_cache_logger.warning(f"Auth cache read failed: {str(e)}")
+            return None
+        if not cached:
+            return None
+
+        principal = AuthPrincipal.from_dict(json.loads(cached))
+        self._set_local(key, principal)
+        return principal
+
+    def set(self, key: str, principal: AuthPrincipal) -> None:
+        """Cache a principal in both tiers"""
+        if not settings.AUTH_CACHE_ENABLED:
+            return
+
+        self._set_local(key, principal)
+        redis = self._redis()
+        if redis is None:
+            return
+        try:
+            redis.set(key, json.dumps(principal.to_dict()), ex=self.ttl)
+        except RedisError as e:
+            auth_cache_logger.warning(f"Auth cache write failed: {str(e)}")
+
+    def invalidate(self, key: str) -> None:
+        """Drop a key everywhere and tell other processes to do the same"""
+        self._drop_local(key)
+        redis = self._redis()
+        if redis is None:
+            return
+        try:
+            redis.delete(key)
+            redis.publish(INVALIDATION_CHANNEL, key)
+        except RedisError as e:
+            auth_cache_logger.warning(f"Auth cache invalidation failed: {str(e)}")
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+    def _set_local(self, key: str, principal: AuthPrincipal) -> None:
+        with self._lock:
+            self._local[key] = (monotonic() + self.local_ttl, principal)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_size:
+                self._local.popitem(last=False)
+
+    def _drop_local(self, key: str) -> None:
+        with self._lock:
+            self._local.pop(key, None)
+
+    def _redis(self):
+        """Redis client with the invalidation listener running, None if unavailable"""
+        try:
+            redis = get_redis()
+        except APIError:
+            return None
+
+        if self._listener_pid != os.getpid():
+            with self._lock:
+                if self._listener_pid != os.getpid():
+                    self._listener_pid = os.getpid()
+                    self._start_listener(redis)
+        return redis
+
+    def _start_listener(self, redis) -> None:
+        try:
+            pubsub = redis.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{
+                INVALIDATION_CHANNEL: lambda message: self._drop_local(message["data"])
+            })
+            pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+        except RedisError as e:
+            # Local entries still expire after local_ttl without the listener
+            auth_cache_logger.warning(
+                f"Auth cache invalidation listener failed: {str(e)}"
+            )
+
+
+def get_token_state(user_id: int, jti: Optional[str] = None) -> Tuple[int, bool]:
+    """
+    Current token version of a user and whether token ``jti`` is denied.
+
+    Raises RedisError or APIError when Redis is unavailable, callers fall back
+    to database validation.
+    """
+    keys = [TOKEN_VERSION_KEY.format(user_id)]
+    if jti:
+        keys.append(DENIED_TOKEN_KEY.format(jti))
+    found = get_redis().mget(keys)
+    return int(found[0] or 0), len(found) > 1 and found[1] is not None
+
+
+def revoke_user_tokens(user_id: int) -> int:
+    """Invalidate every token issued to a user so far, returns the new version"""
+    version = get_redis().incr(TOKEN_VERSION_KEY.format(user_id))
+    auth_cache.invalidate(auth_cache.user_key(user_id))
+    return version
+
+
+def deny_token(jti: str, expires_at: datetime) -> None:
+    """Deny a single token until it would have expired anyway"""
+    ttl = int((expires_at - datetime.utcnow()).total_seconds())
+    if ttl > 0:
+        get_redis().set(DENIED_TOKEN_KEY.format(jti), "1", ex=ttl)
+
+
+# Global auth cache
+auth_cache = AuthCache(
+    max_size=settings.AUTH_CACHE_LOCAL_SIZE,
+    local_ttl=settings.AUTH_CACHE_LOCAL_TTL_SECONDS,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS,
+)
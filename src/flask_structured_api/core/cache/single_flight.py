@@ -0,0 +1,201 @@
+import asyncio
+from time import monotonic
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from uuid import uuid4
+from weakref import WeakKeyDictionary
+
+from prometheus_client import Counter
+from redis import RedisError
+
+from flask_structured_api.core.cache import async_redis_enabled, get_async_redis
+from flask_structured_api.core.cache.ai import CACHED_FIELDS
+from flask_structured_api.core.config import settings
+from flask_structured_api.core.exceptions import APIError
+from flask_structured_api.core.models.responses.ai import AICompletionResponse
+from flask_structured_api.core.utils.logger import get_standalone_logger
+from flask_structured_api.core.utils.serialization import dumps, loads
+
+single_flight_logger = get_standalone_logger("ai.single_flight")
+
+# Held by the process making the upstream call for a key
+INFLIGHT_KEY = "ai:inflight:{}"
+# The leader's result, kept briefly for followers that subscribe late
+RESULT_KEY = "ai:inflight:{}:result"
+# Notifies followers that the leader finished ("ok") or gave up ("failed")
+RESULT_CHANNEL = "ai:inflight:{}:done"
+
+# Delete the lock only if this leader still holds it
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+SINGLE_FLIGHT_CALLS = Counter(
+    "api_ai_single_flight_calls_total",
+    "AI completions by single-flight role",
+    ["role"],  # leader | local | remote
+)
+
+
+class _LeaderGone(Exception):
+    """The local leader was cancelled, its followers try again"""
+
+
+class SingleFlight:
+    """
+    Deduplicates identical in-flight AI completions.
+
+    Within a process, concurrent callers of a key share one ``asyncio.Future``
+    (per event loop, futures can't cross loops). Across processes, the first
+    caller takes a Redis lock and makes the upstream call, the others subscribe
+    to the key's result channel and read the result the leader stored. Without
+    Redis, or off the ASGI server's event loop, only the in-process layer
+    applies; when a remote leader fails or doesn't answer within
+    ``wait_timeout``, followers make their own call.
+    """
+
+    def __init__(self, lock_ttl: int = 120, wait_timeout: int = 120):
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        # Event loop -> key -> Future of the local leader
+        self._calls: "WeakKeyDictionary[asyncio.AbstractEventLoop, Dict]" = (
+            WeakKeyDictionary()
+        )
+
+    async def run(
+        self, key: str, work: Callable[[], Awaitable[AICompletionResponse]]
+    ) -> Tuple[AICompletionResponse, Optional[str]]:
+        """
+        Result of ``work`` for ``key``, computed once for all concurrent callers.
+
+        Returns the response and how it was obtained: None for the caller that
+        made the upstream call, "local" or "remote" for followers.
+        """
+        loop = asyncio.get_running_loop()
+        calls = self._calls.setdefault(loop, {})
+
+        while key in calls:
+            try:
+                response = await asyncio.shield(calls[key])
+            except _LeaderGone:
+                continue
+            SINGLE_FLIGHT_CALLS.labels(role="local").inc()
+            return response.model_copy(deep=True), "local"
+
+        future = loop.create_future()
+        calls[key] = future
+        try:
+            response, shared = await self._run_remote(key, work)
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderGone())
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(response)
+            return response, shared
+        finally:
+            calls.pop(key, None)
+            if future.done() and not future.cancelled():
+                future.exception()  # Retrieved, even when nobody waited
+
+    async def _run_remote(
+        self, key: str, work: Callable[[], Awaitable[AICompletionResponse]]
+    ) -> Tuple[AICompletionResponse, Optional[str]]:
+        if not async_redis_enabled():
+            # Off the server loop, only the in-process layer applies
+            SINGLE_FLIGHT_CALLS.labels(role="leader").inc()
+            return await work(), None
+
+        token = uuid4().hex
+        try:
+            redis = get_async_redis()
+            acquired = await redis.set(
+                INFLIGHT_KEY.format(key), token, nx=True, ex=self.lock_ttl
+            )
+        except (APIError, RedisError) as e:
+            single_flight_logger.warning(f"Single-flight lock failed: {str(e)}")
+            SINGLE_FLIGHT_CALLS.labels(role="leader").inc()
+            return await work(), None
+
+        if not acquired:
+            response = await self._wait_for_leader(redis, key)
+            if response is not None:
+                SINGLE_FLIGHT_CALLS.labels(role="remote").inc()
+                return response, "remote"
+            SINGLE_FLIGHT_CALLS.labels(role="leader").inc()
+            return await work(), None
+
+        SINGLE_FLIGHT_CALLS.labels(role="leader").inc()
+        outcome = "failed"
+        try:
+            response = await work()
+            await self._store_result(redis, key, response)
+            outcome = "ok"
+            return response, None
+        finally:
+            await self._release(redis, key, token, outcome)
+
+    async def _store_result(self, redis, key: str, response: AICompletionResponse):
+        try:
+            await redis.set(
+                RESULT_KEY.format(key),
+                dumps(response.model_dump(include=CACHED_FIELDS)),
+                ex=self.wait_timeout,
+            )
+        except RedisError as e:
+            single_flight_logger.warning(f"Single-flight result write failed: {str(e)}")
+
+    async def _release(self, redis, key: str, token: str, outcome: str) -> None:
+        try:
+            await redis.publish(RESULT_CHANNEL.format(key), outcome)
+            await redis.eval(RELEASE_SCRIPT, 1, INFLIGHT_KEY.format(key), token)
+        except RedisError as e:
+            # The lock expires on its own after lock_ttl
+            single_flight_logger.warning(f"Single-flight release failed: {str(e)}")
+
+    async def _wait_for_leader(self, redis, key: str) -> Optional[AICompletionResponse]:
+        """The remote leader's response, None when it failed or timed out"""
+        deadline = monotonic() + self.wait_timeout
+        pubsub = redis.pubsub()
+        try:
+            await pubsub.subscribe(RESULT_CHANNEL.format(key))
+            while True:
+                # Check after subscribing so a result published meanwhile isn't missed
+                raw, holder = await redis.mget(
+                    RESULT_KEY.format(key), INFLIGHT_KEY.format(key)
+                )
+                if raw is not None:
+                    return AICompletionResponse(**loads(raw))
+                if holder is None:
+                    return None  # Leader finished without a result
+
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    single_flight_logger.warning(
+                        f"Single-flight leader timed out for {key[:16]}"
+                    )
+                    return None
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=min(remaining, 1.0)
+                )
+                if message is not None and message["data"] == "failed":
+                    return None
+        except RedisError as e:
+            single_flight_logger.warning(f"Single-flight wait failed: {str(e)}")
+            return None
+        finally:
+            try:
+                await pubsub.aclose()
+            except RedisError:
+                pass
+
+
+# Global single-flight registry for AI completions
+single_flight = SingleFlight(
+    lock_ttl=settings.AI_SINGLE_FLIGHT_LOCK_SECONDS,
+    wait_timeout=settings.AI_SINGLE_FLIGHT_WAIT_SECONDS,
+)
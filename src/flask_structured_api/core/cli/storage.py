@@ -0,0 +1,132 @@
+import click
+from flask.cli import AppGroup
+from sqlalchemy import func, or_
+from sqlmodel import Session, select
+
+from flask_structured_api.core.db import engine
+from flask_structured_api.core.models.domain.storage import APIStorage
+from flask_structured_api.core.storage.codecs import (
+    CODECS,
+    LEGACY_CODEC,
+    available_codecs,
+    get_codec,
+    select_codec,
+)
+
+storage_cli = AppGroup("storage", help="API storage maintenance commands")
+
+
+@storage_cli.command("codecs")
+def list_codecs():
+    """List the compression codecs and whether they are installed"""
+    installed = available_codecs()
+    for name in CODECS:
+        click.echo("{} {}".format("✅" if name in installed else "❌", name))
+
+
+@storage_cli.command("recompress")
+@click.option("--codec", "codec_name", default=None,
+              help="Target codec (defaults to STORAGE_COMPRESSION_CODEC)")
+@click.option("--level", type=int, default=None, help="Codec compression level")
+@click.option("--batch-size", default=500, help="Rows per transaction")
+@click.option("--force", is_flag=True,
+              help="Compress every row, not only those above the size threshold")
+@click.option("--dry-run", is_flag=True, help="Report savings without writing")
+def recompress(codec_name: str, level: int, batch_size: int, force: bool,
+               dry_run: bool):
+    """Re-compress stored payloads with the target codec, in batches"""
+    from flask_structured_api.core.config import settings
+
+    try:
+        codec = get_codec(codec_name or settings.STORAGE_COMPRESSION_CODEC,
+                          level if level is not None
+                          else settings.STORAGE_COMPRESSION_LEVEL)
+    except ValueError as e:
+        click.echo(f"❌ {str(e)}")
+        return
+
+    # Rows not already stored with the target codec
+    pending = or_(
+        APIStorage.compressed.is_(False),
+        func.coalesce(APIStorage.codec, LEGACY_CODEC) != codec.name,
+    )
+
+    last_id, rows, bytes_before, bytes_after = 0, 0, 0, 0
+    with Session(engine) as session:
+        while True:
+            batch = session.exec(
+                select(APIStorage)
+                .where(APIStorage.id > last_id, pending)
+                .order_by(APIStorage.id)
+                .limit(batch_size)
+            ).all()
+            if not batch:
+                break
+
+            for storage in batch:
+                source = get_codec(storage.codec) if storage.compressed else None
+                raw = {
+                    column: _raw_payload(getattr(storage, column), source)
+                    for column in ("request_data", "response_data")
+                }
+                sizes = [len(value) for value in raw.values() if value is not None]
+                target = select_codec(
+                    max(sizes, default=0), True if force else None, codec
+                )
+                if target is None and not storage.compressed:
+                    continue  # Below the threshold and already stored raw
+
+                for column, value in raw.items():
+                    if value is None:
+                        continue
+                    encoded = target.compress(value) if target else value
+                    bytes_before += len(getattr(storage, column))
+                    bytes_after += len(encoded)
+                    setattr(storage, column, encoded)
+
+                storage.compressed = target is not None
+                storage.codec = target.name if target else None
+                rows += 1
+
+            last_id = batch[-1].id
+            if dry_run:
+                session.rollback()
+            else:
+                session.commit()
+            click.echo("Re-compressed {} rows (up to id {})".format(rows, last_id))
+
+    click.echo("{} {} rows with {}: {:.2f} MB -> {:.2f} MB".format(
+        "Would re-compress" if dry_run else "✅ Re-compressed",
+        rows,
+        codec.name,
+        bytes_before / (1024 * 1024),
+        bytes_after / (1024 * 1024),
+    ))
+
+
+@storage_cli.command("sweep")
+@click.option("--batch-size", default=None, type=int,
+              help="Rows per delete (defaults to STORAGE_SWEEP_BATCH_SIZE)")
+@click.option("--max-batches", default=None, type=int,
+              help="Stop after this many batches")
+def sweep(batch_size: int, max_batches: int):
+    """Delete storage entries whose TTL has expired"""
+    from flask_structured_api.core.config import settings
+    from flask_structured_api.core.services.storage import StorageService
+
+    with Session(engine) as session:
+        result = StorageService(session).purge_expired(
+            batch_size=batch_size or settings.STORAGE_SWEEP_BATCH_SIZE,
+            max_batches=max_batches,
+        )
+
+    click.echo("✅ Deleted {} expired rows in {} batches, reclaimed {:.2f} MB".format(
+        result["rows"], result["batches"], result["bytes"] / (1024 * 1024)
+    ))
+
+
+def _raw_payload(data, codec):
+    """Uncompressed bytes of a stored payload"""
+    if data is None:
+        return None
+    return codec.decompress(data) if codec else data
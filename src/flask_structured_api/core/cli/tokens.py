@@ -26,3 +26,19 @@ def create_token(email: str, expires: int):
     click.echo(tokens.access_token)
     click.echo("\nRefresh Token:")
     click.echo(tokens.refresh_token)
+
+
+@tokens_cli.command("revoke")
+@click.option("--email", prompt=True, help="User email")
+def revoke_tokens(email: str):
+    """Revoke every token issued to a user so far"""
+    db = next(get_session())
+    auth_service = AuthService(db)
+
+    user = auth_service.get_user_by_email(email)
+    if not user:
+        click.echo(f"Error: User {email} not found")
+        return
+
+    version = auth_service.revoke_tokens(user.id)
+    click.echo("Revoked all tokens for {} (token version {})".format(email, version))
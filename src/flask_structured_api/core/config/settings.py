@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -15,6 +15,9 @@ class Settings(BaseSettings):
     ENVIRONMENT: str = Field("development", env="ENVIRONMENT")
     FLASK_APP: str = Field("app.main:create_flask_app", env="FLASK_APP")
     FLASK_ENV: str = Field("development", env="FLASK_ENV")
+    # Await async views on the ASGI server's event loop instead of bridging
+    # every request through WSGI worker threads
+    ASGI_NATIVE: bool = Field(True, env="ASGI_NATIVE")
 
     # PostgreSQL Settings
     POSTGRES_HOST: str = Field("localhost", env="POSTGRES_HOST")
@@ -28,12 +31,20 @@ class Settings(BaseSettings):
     def DATABASE_URL(self) -> str:
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return self.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+
     # Database
     DB_POOL_SIZE: int = Field(20, env="DB_POOL_SIZE")
+    # Async views use an asyncpg engine for storage and auth queries
+    DB_ASYNC_ENABLED: bool = Field(False, env="DB_ASYNC_ENABLED")
 
     # Redis
     REDIS_URL: str = Field(..., env="REDIS_URL")
     REDIS_MAX_CONNECTIONS: int = 100
+    # Redis connects on first use, a failed attempt is retried after this delay
+    REDIS_RECONNECT_SECONDS: int = 5
 
     # Security
     SECRET_KEY: str = Field(..., env="SECRET_KEY")
@@ -49,11 +60,28 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_MINUTES: int = Field(
         default=10080, env="REFRESH_TOKEN_EXPIRE_MINUTES"
     )  # 7 days
+    # Embed role and token version in JWTs and trust them without a user lookup;
+    # revocation goes through a Redis token-version counter and jti deny-list
+    JWT_STATELESS: bool = Field(False, env="JWT_STATELESS")
+
+    # Auth cache: validated API keys and JWT users, in-process LRU + Redis
+    AUTH_CACHE_ENABLED: bool = Field(True, env="AUTH_CACHE_ENABLED")
+    AUTH_CACHE_TTL_SECONDS: int = 60  # Redis tier
+    AUTH_CACHE_LOCAL_TTL_SECONDS: int = 10  # in-process tier
+    AUTH_CACHE_LOCAL_SIZE: int = 1024  # principals per process
+    # api_keys.last_used_at precision: at most one record per key per resolution,
+    # written to the database in one bulk UPDATE per flush interval
+    API_KEY_USAGE_RESOLUTION_SECONDS: int = 60
+    API_KEY_USAGE_FLUSH_SECONDS: int = 60
 
     # Rate Limiting
     RATE_LIMIT_ENABLED: bool = True
     RATE_LIMIT_DEFAULT: int = 60  # requests per minute
-    RATE_LIMIT_WINDOW: int = 3600  # time window in seconds
+    RATE_LIMIT_WINDOW: int = 60  # time window in seconds
+    # Share of a limit each process leases from Redis per call (GCRA batches)
+    RATE_LIMIT_LOCAL_FRACTION: float = 0.05
+    RATE_LIMIT_LOCAL_SIZE: int = 10000  # leased identities per process (LRU)
+    RATE_LIMIT_STIP_PROCESS: int = 10  # STIP processing requests per minute
 
     # AI Service
     AI_PROVIDER: Optional[str] = Field("openai", env="AI_PROVIDER")
@@ -61,6 +89,38 @@ class Settings(BaseSettings):
     AI_MODEL: str = Field("gpt-4o", env="AI_MODEL")
     AI_MAX_TOKENS: int = Field(3000, env="AI_MAX_TOKENS")
     AI_TEMPERATURE: float = Field(0.1, env="AI_TEMPERATURE")
+    # Prompts of one multi-prompt request sent to the provider at the same time
+    AI_PROMPT_CONCURRENCY: int = Field(9, env="AI_PROMPT_CONCURRENCY")
+    # On a failed prompt: "fail_fast" cancels the rest and returns the error,
+    # "partial" returns the successful prompts with a warning per failure
+    AI_PROMPT_FAILURE_POLICY: Literal["fail_fast", "partial"] = Field(
+        "fail_fast", env="AI_PROMPT_FAILURE_POLICY"
+    )
+    # Response cache: completions keyed by a hash of provider, model and request,
+    # in Redis with an optional in-process LRU tier
+    AI_CACHE_ENABLED: bool = Field(True, env="AI_CACHE_ENABLED")
+    AI_CACHE_TTL_SECONDS: int = Field(86400, env="AI_CACHE_TTL_SECONDS")
+    AI_CACHE_LOCAL_SIZE: int = 0  # in-process entries, 0 disables the tier
+    AI_CACHE_LOCAL_TTL_SECONDS: int = 300
+    AI_CACHE_MAX_TEMPERATURE: float = 0.3  # hotter requests are never cached
+    # Single-flight: identical concurrent completions (same key as the cache)
+    # make one upstream call, shared in-process and across processes via Redis
+    AI_SINGLE_FLIGHT_ENABLED: bool = Field(True, env="AI_SINGLE_FLIGHT_ENABLED")
+    AI_SINGLE_FLIGHT_LOCK_SECONDS: int = 120  # upper bound of one provider call
+    AI_SINGLE_FLIGHT_WAIT_SECONDS: int = 120  # then followers call themselves
+
+    # STIP processing: documents longer than one chunk are split into
+    # overlapping token windows, each prompt runs per chunk and the results
+    # are merged per dimension; text beyond the last chunk is not analyzed
+    STIP_CHUNK_TOKENS: int = Field(8000, env="STIP_CHUNK_TOKENS")
+    STIP_CHUNK_OVERLAP_TOKENS: int = 200
+    STIP_MAX_CHUNKS: int = Field(8, env="STIP_MAX_CHUNKS")
+    # Relevance filter: documents longer than STIP_RETRIEVAL_TOKENS are split
+    # into passages and each prompt only gets its top-ranked ones (BM25)
+    STIP_RETRIEVAL_ENABLED: bool = Field(True, env="STIP_RETRIEVAL_ENABLED")
+    STIP_RETRIEVAL_TOKENS: int = Field(3000, env="STIP_RETRIEVAL_TOKENS")
+    STIP_RETRIEVAL_TOP_K: int = 16  # passages per prompt
+    STIP_RETRIEVAL_PASSAGE_WORDS: int = 120
 
     # Optional Provider-Specific Settings
 
@@ -111,6 +171,22 @@ class Settings(BaseSettings):
 
     # Storage settings
     STORAGE_SESSION_TIMEOUT: int = 30  # minutes
+    # Write-behind storage: queue entries and insert them in batches off the
+    # request path instead of committing each one
+    STORAGE_WRITE_BEHIND: bool = Field(False, env="STORAGE_WRITE_BEHIND")
+    STORAGE_WRITE_QUEUE_SIZE: int = 10000  # entries buffered before backpressure
+    STORAGE_WRITE_BATCH_SIZE: int = 100  # entries per INSERT
+    STORAGE_WRITE_FLUSH_INTERVAL_MS: int = 200
+    STORAGE_WRITE_ENQUEUE_TIMEOUT_MS: int = 50  # wait on a full buffer, then drop
+    # Payload compression: zlib, lzma, zstd or lz4 (zstd/lz4 need their packages)
+    STORAGE_COMPRESSION_CODEC: str = Field("zlib", env="STORAGE_COMPRESSION_CODEC")
+    STORAGE_COMPRESSION_LEVEL: Optional[int] = None  # codec default when unset
+    STORAGE_COMPRESSION_MIN_BYTES: int = 1024  # auto policy threshold
+    # Stored payload format: json, or msgpack when the package is installed
+    STORAGE_SERIALIZER: str = Field("json", env="STORAGE_SERIALIZER")
+    # Expired entry sweeper (CLI and Celery beat)
+    STORAGE_SWEEP_INTERVAL_MINUTES: int = 60
+    STORAGE_SWEEP_BATCH_SIZE: int = 1000
 
     # Admin User Settings
     ADMIN_EMAIL: str = Field("mail@julianfleck.net", env="ADMIN_EMAIL")
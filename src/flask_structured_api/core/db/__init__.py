@@ -1,17 +1,48 @@
 from sqlmodel import SQLModel
 
-from .engine import check_database_connection, engine, get_session, init_db
-from .migrations import create_migration, init_migrations, upgrade_database
+from .engine import (
+    async_engine_enabled,
+    check_database_connection,
+    close_request_session,
+    engine,
+    get_async_engine,
+    get_async_session,
+    get_pool_status,
+    get_request_session,
+    get_session,
+    init_db,
+)
 from .shared import db  # Import shared instance
 
+# Loaded on first use, Flask-Migrate pulls in alembic
+_MIGRATION_HELPERS = (
+    "create_migration",
+    "create_storage_metadata_migration",
+    "create_storage_payload_migration",
+    "init_migrations",
+    "needs_storage_metadata_migration",
+    "needs_storage_payload_migration",
+    "upgrade_database",
+)
+
 __all__ = [
     "SQLModel",
     "engine",
     "get_session",
+    "get_request_session",
+    "close_request_session",
+    "get_pool_status",
+    "async_engine_enabled",
+    "get_async_engine",
+    "get_async_session",
     "check_database_connection",
     "init_db",
     "init_migrations",
     "create_migration",
+    "create_storage_metadata_migration",
+    "needs_storage_metadata_migration",
+    "create_storage_payload_migration",
+    "needs_storage_payload_migration",
     "upgrade_database",
 ]
 
@@ -29,3 +60,11 @@ def init_db(app):
                 app.db = db
             else:
                 raise
+
+
+def __getattr__(name: str):
+    if name in _MIGRATION_HELPERS:
+        from . import migrations
+
+        return getattr(migrations, name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
@@ -1,10 +1,25 @@
-from typing import Generator
-from flask import Flask
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Generator, Optional
+
+from flask import Flask, g
+from prometheus_client import REGISTRY
+from prometheus_client.core import GaugeMetricFamily
 from sqlalchemy import text
 from sqlmodel import Session, create_engine
 
+from flask_structured_api.core.asgi import on_server_loop
 from flask_structured_api.core.config import settings
 
+if TYPE_CHECKING:
+    # SQLAlchemy's asyncio extension needs greenlet, only loaded when enabled
+    from sqlalchemy.ext.asyncio import AsyncEngine
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+
 # Create database engine with connection pooling
 engine = create_engine(
     settings.DATABASE_URL,
@@ -24,6 +39,122 @@ def get_session() -> Generator[Session, None, None]:
         session.close()
 
 
+# Async engine of the ASGI server's event loop, asyncpg connections can't cross loops
+async_engine: Optional["AsyncEngine"] = None
+
+
+def async_engine_enabled() -> bool:
+    """
+    Whether async views should use the asyncpg engine.
+
+    Only on the ASGI server's event loop; elsewhere they use the sync session.
+    """
+    return settings.DB_ASYNC_ENABLED and asyncpg is not None and on_server_loop()
+
+
+def get_async_engine() -> "AsyncEngine":
+    """Get the asyncpg engine of the server's event loop, created on first use"""
+    global async_engine
+    if asyncpg is None:
+        raise RuntimeError("The async database engine requires asyncpg")
+    if not on_server_loop():
+        raise RuntimeError("The async database engine needs the server's event loop")
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    if async_engine is None:
+        async_engine = create_async_engine(
+            settings.ASYNC_DATABASE_URL,
+            pool_pre_ping=True,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=10,
+            pool_recycle=3600,
+        )
+    return async_engine
+
+
+async def dispose_async_engine() -> None:
+    """Close the asyncpg engine's pooled connections"""
+    global async_engine
+    closing, async_engine = async_engine, None
+    if closing is not None:
+        await closing.dispose()
+
+
+@asynccontextmanager
+async def get_async_session() -> AsyncIterator["AsyncSession"]:
+    """
+    Async database session for a unit of work.
+
+    Keep it short: the connection is held until the block exits, so don't
+    wrap slow non-database awaits (like LLM calls) in it.
+    """
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    session = AsyncSession(get_async_engine(), expire_on_commit=False)
+    try:
+        yield session
+    except BaseException:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+
+def get_request_session() -> Session:
+    """
+    Get the database session of the current request.
+
+    Everything handling a request (auth, storage decorators, endpoints) shares
+    one session, and so at most one pooled connection. It is closed by
+    ``close_request_session`` on request teardown.
+    """
+    if "db_session" not in g:
+        g.db_session = Session(engine)
+    return g.db_session
+
+
+def close_request_session(exc: Optional[BaseException] = None) -> None:
+    """Teardown handler: roll back on errors and return the connection"""
+    session = g.pop("db_session", None)
+    if session is None:
+        return
+    try:
+        if exc is not None:
+            session.rollback()
+    finally:
+        session.close()
+
+
+def get_pool_status() -> Dict[str, int]:
+    """Connection pool utilisation"""
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+    }
+
+
+class PoolCollector:
+    """Prometheus collector exposing the engine's pool utilisation as gauges"""
+
+    def collect(self):
+        status = get_pool_status()
+        for name, description in (
+            ("size", "Configured pool size"),
+            ("checked_out", "Connections currently checked out"),
+            ("checked_in", "Idle connections in the pool"),
+            ("overflow", "Connections above pool_size (negative: unopened slots)"),
+        ):
+            yield GaugeMetricFamily(
+                "db_pool_{}".format(name), description, value=status[name]
+            )
+
+
+REGISTRY.register(PoolCollector())
+
+
 def check_database_connection() -> bool:
     """Test database connection for health checks"""
     try:
@@ -6,8 +6,12 @@ from flask_migrate import init as migrate_init
 from flask_migrate import stamp as migrate_stamp
 from flask_migrate import revision as migrate_revision
 from flask_migrate import upgrade as migrate_upgrade
+from alembic import command as alembic_command
+from alembic.operations import ops
 from alembic.util.exc import CommandError
-from sqlalchemy import text
+from flask import current_app
+from sqlalchemy import Column, String, inspect, text
+from sqlalchemy.dialects.postgresql import JSONB
 
 from .engine import engine
 from .shared import db
@@ -157,3 +161,189 @@ def upgrade_database(app: Flask, has_data: bool = False) -> None:
     except Exception as e:
         print(f"❌ Failed to upgrade database: {str(e)}")
         raise
+
+
+STORAGE_METADATA_INDEXES = (
+    "ix_api_storage_metadata",
+    "ix_api_storage_session_id",
+    "ix_api_storage_user_type_created",
+)
+
+
+def _storage_metadata_index_op(name: str) -> ops.CreateIndexOp:
+    """The CreateIndexOp of one of STORAGE_METADATA_INDEXES"""
+    if name == "ix_api_storage_metadata":
+        return ops.CreateIndexOp(
+            name,
+            "api_storage",
+            ["storage_metadata"],
+            postgresql_using="gin",
+            postgresql_ops={"storage_metadata": "jsonb_path_ops"},
+        )
+    if name == "ix_api_storage_session_id":
+        return ops.CreateIndexOp(
+            name, "api_storage", [text("(storage_metadata ->> 'session_id')")]
+        )
+    return ops.CreateIndexOp(
+        name, "api_storage", ["user_id", "storage_type", text("created_at DESC")]
+    )
+
+
+def _pending_storage_metadata_changes() -> tuple:
+    """
+    Whether api_storage.storage_metadata still needs the JSONB conversion, and
+    which of STORAGE_METADATA_INDEXES are missing.
+
+    Each is checked separately, so a partially applied migration only gets the
+    remaining operations.
+    """
+    inspector = inspect(engine)
+    if "api_storage" not in inspector.get_table_names():
+        return False, []
+    column_types = {
+        column["name"]: column["type"]
+        for column in inspector.get_columns("api_storage")
+    }
+    convert = not isinstance(column_types.get("storage_metadata"), JSONB)
+    existing = {index["name"] for index in inspector.get_indexes("api_storage")}
+    missing = [name for name in STORAGE_METADATA_INDEXES if name not in existing]
+    return convert, missing
+
+
+def _storage_metadata_type_op(type_name: str) -> ops.ExecuteSQLOp:
+    """Change api_storage.storage_metadata to ``type_name`` with an explicit cast"""
+    # Alembic's alter_column renderer drops postgresql_using, so the USING
+    # clause is written as plain SQL
+    return ops.ExecuteSQLOp(
+        "ALTER TABLE api_storage ALTER COLUMN storage_metadata "
+        "TYPE {0} USING storage_metadata::{0}".format(type_name)
+    )
+
+
+def _storage_metadata_upgrade_ops(convert: bool, indexes: list) -> ops.UpgradeOps:
+    """Convert api_storage.storage_metadata to JSONB and create ``indexes``"""
+    operations = []
+    if convert:
+        operations.append(_storage_metadata_type_op("jsonb"))
+    operations.extend(_storage_metadata_index_op(name) for name in indexes)
+    return ops.UpgradeOps(ops=operations)
+
+
+def _storage_metadata_downgrade_ops(convert: bool, indexes: list) -> ops.DowngradeOps:
+    """Drop ``indexes`` and revert api_storage.storage_metadata to JSON"""
+    operations = [
+        ops.DropIndexOp(name, table_name="api_storage") for name in reversed(indexes)
+    ]
+    if convert:
+        operations.append(_storage_metadata_type_op("json"))
+    return ops.DowngradeOps(ops=operations)
+
+
+def needs_storage_metadata_migration() -> bool:
+    """Check whether api_storage lacks the JSONB metadata column or any index"""
+    convert, missing = _pending_storage_metadata_changes()
+    return convert or bool(missing)
+
+
+def create_storage_metadata_migration(app: Flask, directory: str = None) -> None:
+    """
+    Create the migration that moves api_storage metadata to indexed JSONB.
+
+    Autogenerate can't express the ``USING`` cast or the expression index, so the
+    revision is written with explicit operations instead; the type change is
+    emitted as raw ``ALTER ... USING storage_metadata::jsonb`` SQL. Apply it with
+    ``upgrade_database`` (or ``flask db upgrade``) like any other migration.
+    """
+    convert, missing = _pending_storage_metadata_changes()
+    _create_explicit_migration(
+        app,
+        message="Index api_storage metadata as JSONB",
+        upgrade_ops=_storage_metadata_upgrade_ops(convert, missing),
+        downgrade_ops=_storage_metadata_downgrade_ops(convert, missing),
+        directory=directory,
+    )
+    print("✅ Storage metadata migration created successfully")
+    return True
+
+
+# Payload columns added after api_storage was first created
+STORAGE_PAYLOAD_COLUMNS = (
+    ("codec", 16),  # compression codec
+    ("payload_format", 16),  # serialization format
+)
+
+
+def _missing_storage_payload_columns() -> list:
+    inspector = inspect(engine)
+    if "api_storage" not in inspector.get_table_names():
+        return []
+    columns = {column["name"] for column in inspector.get_columns("api_storage")}
+    return [
+        (name, length) for name, length in STORAGE_PAYLOAD_COLUMNS
+        if name not in columns
+    ]
+
+
+def needs_storage_payload_migration() -> bool:
+    """Check whether api_storage lacks any of the payload codec/format columns"""
+    return bool(_missing_storage_payload_columns())
+
+
+def create_storage_payload_migration(app: Flask, directory: str = None) -> None:
+    """Create the migration that adds the missing api_storage payload columns"""
+    missing = _missing_storage_payload_columns()
+    _create_explicit_migration(
+        app,
+        message="Add api_storage payload {}".format(
+            ", ".join(name for name, _ in missing)),
+        upgrade_ops=ops.UpgradeOps(ops=[
+            ops.AddColumnOp(
+                "api_storage", Column(name, String(length), nullable=True)
+            )
+            for name, length in missing
+        ]),
+        downgrade_ops=ops.DowngradeOps(ops=[
+            ops.DropColumnOp("api_storage", name)
+            for name, _ in reversed(missing)
+        ]),
+        directory=directory,
+    )
+    print("✅ Storage payload migration created successfully")
+    return True
+
+
+def _create_explicit_migration(
+    app: Flask,
+    message: str,
+    upgrade_ops: ops.UpgradeOps,
+    downgrade_ops: ops.DowngradeOps,
+    directory: str = None,
+) -> None:
+    """Write a revision with the given operations instead of autogenerating it"""
+    migrations_dir = directory or os.environ.get(
+        'FLASK_MIGRATIONS_DIR', '/app/migrations')
+
+    db.Model = SQLModel
+    if not hasattr(app, 'db'):
+        db.init_app(app)
+        app.db = db
+
+    Migrate(app, db, directory=migrations_dir)
+
+    def process_revision_directives(context, revision, directives):
+        script = directives[0]
+        script.upgrade_ops = upgrade_ops
+        script.downgrade_ops = downgrade_ops
+
+    try:
+        with app.app_context():
+            config = current_app.extensions['migrate'].migrate.get_config(
+                migrations_dir)
+            alembic_command.revision(
+                config,
+                message=message,
+                process_revision_directives=process_revision_directives,
+            )
+    except Exception as e:
+        print(f"❌ Failed to create migration '{message}': {str(e)}")
+        raise
@@ -86,6 +86,7 @@ class ErrorCode(str, Enum):
     AUTH_INSUFFICIENT_PERMISSIONS = "AUTH_INSUFFICIENT_PERMISSIONS"
     AUTH_INVALID_TOKEN_TYPE = "AUTH_INVALID_TOKEN_TYPE"
     AUTH_ERROR = "AUTH_ERROR"
+    RATE_LIMIT_EXCEEDED = "RATE_LIMIT_EXCEEDED"
 
     # File related errors
     FILE_UPLOAD_ERROR = "FILE_UPLOAD_ERROR"
@@ -1,6 +1,5 @@
 from typing import Any, Dict, TYPE_CHECKING
 from flask_structured_api.core.enums import ErrorCode, WarningCode, WarningSeverity
-from flask_structured_api.core.models.errors import ErrorDetail
 from flask_structured_api.core.warnings import WarningCollector
 
 if TYPE_CHECKING:
@@ -36,6 +35,7 @@ class APIError(Exception):
 
     def to_response(self) -> 'ErrorResponse':
         """Convert to proper API error response"""
+        from flask_structured_api.core.models.errors import ErrorDetail
         from flask_structured_api.core.models.responses.base import ErrorResponse
         return ErrorResponse(
             success=False,
@@ -2,6 +2,8 @@ from .context import setup_request_context
 from .decorators import log_function_call
 from .logging import log_request, log_response
 from .cors import setup_cors
+from .rate_limit import rate_limit, setup_rate_limiting
 
 __all__ = ["setup_request_context", "log_request",
-           "log_response", "log_function_call", "setup_cors"]
+           "log_response", "log_function_call", "setup_cors",
+           "setup_rate_limiting", "rate_limit"]
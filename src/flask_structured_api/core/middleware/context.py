@@ -5,6 +5,8 @@ import asyncio
 from flask import g, request, Response
 from functools import wraps
 
+from flask_structured_api.core.db import close_request_session
+
 
 def setup_request_context(app):
     """Setup request context with unique ID and other request-scoped data"""
@@ -22,6 +24,9 @@ def setup_request_context(app):
         g.api_logger = app.api_logger
         g.system_logger = app.system_logger
 
+    # Close the request's shared database session and return its connection
+    app.teardown_request(close_request_session)
+
     @app.after_request
     async def after_request(response):
         """Add request ID to response headers"""
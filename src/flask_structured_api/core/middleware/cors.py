@@ -25,6 +25,7 @@ class CORSMiddleware:
             'X-Request-ID',
             'X-API-Key',
             'x-api-key',
+            'X-AI-Cache',
             'Origin',
             'Accept',
             'Access-Control-Request-Method',
@@ -35,7 +36,12 @@ class CORSMiddleware:
             'Content-Type',
             'X-API-Version',
             'X-Response-Time',
-            'X-Request-ID'
+            'X-Request-ID',
+            'RateLimit-Limit',
+            'RateLimit-Remaining',
+            'RateLimit-Reset',
+            'RateLimit-Policy',
+            'Retry-After'
         ]
 
     async def handle_cors(self, response=None):
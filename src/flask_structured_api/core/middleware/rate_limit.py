@@ -0,0 +1,338 @@
+import hashlib
+import inspect
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import wraps
+from math import ceil
+from time import monotonic
+from typing import Dict, Optional
+
+import jwt
+from flask import g, request
+from redis import RedisError
+
+from flask_structured_api.core.cache import (
+    async_redis_enabled,
+    get_async_redis,
+    get_redis,
+)
+from flask_structured_api.core.config import settings
+from flask_structured_api.core.enums import ErrorCode
+from flask_structured_api.core.exceptions import APIError
+from flask_structured_api.core.models.errors import ErrorDetail
+from flask_structured_api.core.utils.logger import get_standalone_logger
+from flask_structured_api.core.utils.serialization import json_response
+
+rate_limit_logger = get_standalone_logger("rate_limit")
+
+# Endpoints the global limit never applies to
+EXEMPT_ENDPOINTS = {"health.health_check", "health.metrics", "static"}
+
+# GCRA: KEYS[1] holds the theoretical arrival time (ms). Grants ``cost`` requests
+# if the bucket allows it, otherwise a single one, otherwise none.
+# Returns {granted, remaining, retry_after_ms, reset_ms}.
+GCRA_SCRIPT = """
+local emission = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = time[1] * 1000 + math.floor(time[2] / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+
+local granted = cost
+if tat + emission * granted - tolerance > now then
+    granted = 1
+end
+if tat + emission * granted - tolerance > now then
+    return {0, 0, math.ceil(tat + emission - tolerance - now), math.ceil(tat - now)}
+end
+
+local new_tat = tat + emission * granted
+redis.call('SET', KEYS[1], string.format('%d', math.ceil(new_tat)),
+           'PX', math.ceil(new_tat - now))
+return {granted, math.floor((tolerance - (new_tat - now)) / emission), 0,
+        math.ceil(new_tat - now)}
+"""
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of a rate limit check, rendered as RateLimit-* headers"""
+
+    allowed: bool
+    limit: int
+    window: int
+    remaining: int
+    reset: int  # seconds until the full limit is available again
+    retry_after: int = 0  # seconds, set when not allowed
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(max(self.remaining, 0)),
+            "RateLimit-Reset": str(self.reset),
+            "RateLimit-Policy": "{};w={}".format(self.limit, self.window),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(self.retry_after)
+        return headers
+
+
+@dataclass
+class _Lease:
+    tokens: int
+    expires_at: float
+    remaining: int
+    reset_at: float
+    denied_until: float = 0.0
+
+
+class RateLimiter:
+    """
+    GCRA rate limiter in Redis with a per-process lease in front of it.
+
+    Instead of one Redis call per request, a process leases a small batch of
+    requests (RATE_LIMIT_LOCAL_FRACTION of the limit) in one atomic script call
+    and spends them locally until the lease expires. Denials are cached locally
+    until their retry time, so rejected clients don't reach Redis either. If
+    Redis is unavailable requests are allowed. At most ``max_leases`` identities
+    are kept, least recently used first out.
+    """
+
+    def __init__(self, local_fraction: float = 0.05, max_leases: int = 10000):
+        self.local_fraction = local_fraction
+        self.max_leases = max_leases
+        self._leases: "OrderedDict[str, _Lease]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._script = None
+
+    def hit(self, key: str, limit: int, window: int) -> Optional[RateLimitResult]:
+        """Count one request against ``limit`` per ``window`` seconds"""
+        result = self._hit_local(key, limit, window)
+        if result is not None:
+            return result
+
+        keys, args = self._script_params(key, limit, window)
+        try:
+            if self._script is None:
+                self._script = get_redis().register_script(GCRA_SCRIPT)
+            reply = self._script(keys=keys, args=args)
+        except (APIError, RedisError) as e:
+            rate_limit_logger.warning(f"Rate limiter unavailable: {str(e)}")
+            return None
+        return self._lease(key, limit, window, reply)
+
+    async def hit_async(
+        self, key: str, limit: int, window: int
+    ) -> Optional[RateLimitResult]:
+        """Async variant of ``hit`` using the server loop's Redis client"""
+        if not async_redis_enabled():
+            return self.hit(key, limit, window)
+        result = self._hit_local(key, limit, window)
+        if result is not None:
+            return result
+
+        keys, args = self._script_params(key, limit, window)
+        try:
+            script = get_async_redis().register_script(GCRA_SCRIPT)
+            reply = await script(keys=keys, args=args)
+        except (APIError, RedisError) as e:
+            rate_limit_logger.warning(f"Rate limiter unavailable: {str(e)}")
+            return None
+        return self._lease(key, limit, window, reply)
+
+    def _hit_local(
+        self, key: str, limit: int, window: int
+    ) -> Optional[RateLimitResult]:
+        """Answer from the local lease or cached denial, None if Redis is needed"""
+        now = monotonic()
+        with self._lock:
+            lease = self._leases.get(key)
+            if lease and lease.denied_until > now:
+                return RateLimitResult(
+                    allowed=False,
+                    limit=limit,
+                    window=window,
+                    remaining=0,
+                    reset=ceil(lease.reset_at - now),
+                    retry_after=ceil(lease.denied_until - now),
+                )
+            if lease and lease.tokens > 0 and lease.expires_at > now:
+                lease.tokens -= 1
+                self._leases.move_to_end(key)
+                return RateLimitResult(
+                    allowed=True,
+                    limit=limit,
+                    window=window,
+                    remaining=lease.remaining + lease.tokens,
+                    reset=ceil(lease.reset_at - now),
+                )
+        return None
+
+    def _script_params(self, key: str, limit: int, window: int):
+        emission = window * 1000 / limit
+        batch = max(1, int(limit * self.local_fraction))
+        return ["ratelimit:{}".format(key)], [emission, window * 1000, batch]
+
+    def _lease(self, key: str, limit: int, window: int, reply) -> RateLimitResult:
+        """Store the lease granted by the script and report the result"""
+        granted, remaining, retry_after_ms, reset_ms = [int(value) for value in reply]
+        emission = window * 1000 / limit
+        now = monotonic()
+        lease = _Lease(
+            tokens=max(granted - 1, 0),
+            # Leased requests are only valid for the time they represent
+            expires_at=now + emission * granted / 1000,
+            remaining=remaining,
+            reset_at=now + reset_ms / 1000,
+            denied_until=0.0 if granted else now + retry_after_ms / 1000,
+        )
+        with self._lock:
+            self._leases[key] = lease
+            self._leases.move_to_end(key)
+            while len(self._leases) > self.max_leases:
+                self._leases.popitem(last=False)
+
+        return RateLimitResult(
+            allowed=bool(granted),
+            limit=limit,
+            window=window,
+            remaining=remaining + lease.tokens,
+            reset=ceil(reset_ms / 1000),
+            retry_after=ceil(retry_after_ms / 1000),
+        )
+
+
+# Global rate limiter
+rate_limiter = RateLimiter(
+    local_fraction=settings.RATE_LIMIT_LOCAL_FRACTION,
+    max_leases=settings.RATE_LIMIT_LOCAL_SIZE,
+)
+
+
+def client_identity() -> str:
+    """Rate limit identity: user id, API key hash, bearer subject or client IP"""
+    if getattr(g, "user_id", None):
+        return "user:{}".format(g.user_id)
+
+    api_key = request.headers.get("X-API-Key")
+    auth_header = request.headers.get("Authorization", "")
+    token_type, _, token = auth_header.partition(" ")
+    if not api_key and token_type.lower() == "apikey":
+        api_key = token
+    if api_key:
+        return "key:{}".format(hashlib.sha256(api_key.encode()).hexdigest())
+
+    if token_type.lower() == "bearer" and token:
+        try:
+            payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=["HS256"])
+            return "user:{}".format(payload["sub"])
+        except (jwt.InvalidTokenError, KeyError):
+            pass
+
+    return "ip:{}".format(request.remote_addr)
+
+
+def _rate_limited_response(result: RateLimitResult):
+    response = json_response(
+        {
+            "success": False,
+            "message": "Rate limit exceeded, retry in {} seconds".format(
+                result.retry_after
+            ),
+            "error": ErrorDetail(
+                code=ErrorCode.RATE_LIMIT_EXCEEDED,
+                details={"limit": result.limit, "window": result.window},
+            ).model_dump(),
+        },
+        status_code=429,
+    )
+    response.headers.update(result.headers())
+    return response
+
+
+def _remember(result: Optional[RateLimitResult]) -> None:
+    """Keep the most restrictive result of this request for the response headers"""
+    current = getattr(g, "rate_limit", None)
+    if result and (current is None or result.remaining < current.remaining):
+        g.rate_limit = result
+
+
+def rate_limit(limit: int, window: int = 60, scope: Optional[str] = None):
+    """
+    Decorator applying a route-specific limit on top of the global one.
+
+    Place it below ``require_auth`` so requests are counted per user.
+    """
+
+    def decorator(f):
+        bucket = scope or f.__name__
+
+        if inspect.iscoroutinefunction(inspect.unwrap(f)):
+
+            @wraps(f)
+            async def decorated_async(*args, **kwargs):
+                if settings.RATE_LIMIT_ENABLED and request.method != "OPTIONS":
+                    result = await rate_limiter.hit_async(
+                        "{}:{}".format(bucket, client_identity()), limit, window
+                    )
+                    _remember(result)
+                    if result and not result.allowed:
+                        return _rate_limited_response(result)
+                response = f(*args, **kwargs)
+                if inspect.iscoroutine(response):
+                    response = await response
+                return response
+
+            return decorated_async
+
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            if settings.RATE_LIMIT_ENABLED and request.method != "OPTIONS":
+                result = rate_limiter.hit(
+                    "{}:{}".format(bucket, client_identity()), limit, window
+                )
+                _remember(result)
+                if result and not result.allowed:
+                    return _rate_limited_response(result)
+            return f(*args, **kwargs)
+
+        return decorated
+
+    return decorator
+
+
+def setup_rate_limiting(app):
+    """Apply RATE_LIMIT_DEFAULT per RATE_LIMIT_WINDOW to every request"""
+
+    @app.before_request
+    def check_rate_limit():
+        if (
+            not settings.RATE_LIMIT_ENABLED
+            or request.method == "OPTIONS"
+            or request.endpoint in EXEMPT_ENDPOINTS
+        ):
+            return None
+
+        result = rate_limiter.hit(
+            "global:{}".format(client_identity()),
+            settings.RATE_LIMIT_DEFAULT,
+            settings.RATE_LIMIT_WINDOW,
+        )
+        _remember(result)
+        if result and not result.allowed:
+            return _rate_limited_response(result)
+        return None
+
+    @app.after_request
+    def add_rate_limit_headers(response):
+        result = getattr(g, "rate_limit", None)
+        if result is not None and hasattr(response, "headers"):
+            response.headers.update(result.headers())
+        return response
+
+    return app
@@ -1,14 +1,27 @@
 import json
+import warnings
 import zlib
 from datetime import datetime
 from typing import Any, Dict, Optional
 
-from sqlalchemy import JSON, ForeignKey, Enum as SQLAEnum
+from sqlalchemy import Index, text, Enum as SQLAEnum
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Field, Relationship, SQLModel
 
 from flask_structured_api.core.enums import StorageType
 from flask_structured_api.core.models.domain.base import CoreModel
 from flask_structured_api.core.models.domain.user import User
+from flask_structured_api.core.storage.codecs import (
+    LEGACY_CODEC,
+    get_codec,
+    select_codec,
+)
+from flask_structured_api.core.utils.serialization import (
+    JSON,
+    pack,
+    storage_format,
+    unpack,
+)
 
 
 class StorageBase(CoreModel):
@@ -19,27 +32,94 @@ class StorageBase(CoreModel):
     endpoint: str = Field(index=True)
     ttl: Optional[datetime] = Field(default=None, index=True)
     compressed: bool = Field(default=False)
-    storage_metadata: Dict[str, Any] = Field(sa_type=JSON)
+    # Compression codec of the payload, NULL on compressed rows means legacy zlib
+    codec: Optional[str] = Field(default=None, max_length=16)
+    # Serialization format of the payload, NULL means JSON
+    payload_format: Optional[str] = Field(default=None, max_length=16)
+    storage_metadata: Dict[str, Any] = Field(sa_type=JSONB)
 
     model_config = {"json_schema_extra": {"storage_metadata": {}}}
 
+    def encode_data(self, data: Any, compress: Optional[bool] = None) -> bytes:
+        """
+        Serialize data and compress it following the storage compression policy.
+
+        Uses the STORAGE_SERIALIZER format and sets ``payload_format``,
+        ``compressed`` and ``codec`` to match the returned bytes. ``compress``
+        forces compression on (True) or off (False), None compresses only payloads
+        above STORAGE_COMPRESSION_MIN_BYTES.
+        """
+        payload_format = storage_format()
+        raw = pack(data, payload_format)
+        self.payload_format = None if payload_format == JSON else payload_format
+        codec = select_codec(len(raw), compress)
+        self.compressed = codec is not None
+        self.codec = codec.name if codec else None
+        return codec.compress(raw) if codec else raw
+
+    def decode_data(self, data: Optional[bytes]) -> Any:
+        """Decompress (if needed) and parse a stored payload"""
+        if not data:
+            return None
+        if self.compressed:
+            data = get_codec(self.codec or LEGACY_CODEC).decompress(data)
+        return unpack(data, self.payload_format) if data else None
+
     def compress_data(self, data: Dict) -> bytes:
-        """Compress JSON data"""
+        """
+        Compress JSON data (zlib when ``compressed`` is set).
+
+        Deprecated: use ``encode_data``, which follows the configured serializer,
+        codec and compression policy and records them on the entry.
+        """
+        warnings.warn(
+            "StorageBase.compress_data is deprecated, use encode_data",
+            DeprecationWarning,
+            stacklevel=2,
+        )
         if not self.compressed:
             return json.dumps(data).encode()
         return zlib.compress(json.dumps(data).encode())
 
     def decompress_data(self, data: bytes) -> Dict:
-        """Decompress stored data"""
-        if not self.compressed:
-            return json.loads(data.decode())
-        return json.loads(zlib.decompress(data).decode())
+        """
+        Decompress stored data.
+
+        Deprecated: use ``decode_data``, which this calls.
+        """
+        warnings.warn(
+            "StorageBase.decompress_data is deprecated, use decode_data",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return self.decode_data(data)
 
 
 class APIStorage(StorageBase, table=True):
     """Storage model for API requests/responses"""
 
     __tablename__ = "api_storage"
+    __table_args__ = (
+        # Metadata containment filters (storage_metadata @> {...})
+        Index(
+            "ix_api_storage_metadata",
+            "storage_metadata",
+            postgresql_using="gin",
+            postgresql_ops={"storage_metadata": "jsonb_path_ops"},
+        ),
+        # Session lookups and grouping (storage_metadata ->> 'session_id')
+        Index(
+            "ix_api_storage_session_id",
+            text("(storage_metadata ->> 'session_id')"),
+        ),
+        # Per-user listings, newest first
+        Index(
+            "ix_api_storage_user_type_created",
+            "user_id",
+            "storage_type",
+            text("created_at DESC"),
+        ),
+    )
 
     model_config = {
         "arbitrary_types_allowed": True,
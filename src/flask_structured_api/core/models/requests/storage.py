@@ -18,6 +18,10 @@ class StorageQueryRequest(BaseRequestModel):
     session_id: Optional[str] = Field(default=None)  # Add this field
     page: int = Field(default=1, ge=1)
     page_size: int = Field(default=20, ge=1, le=100)
+    # Keyset cursor from the previous page, skips the OFFSET scan when set
+    after_id: Optional[int] = Field(default=None, ge=1)
+    # Set to False to list metadata only, without loading stored payloads
+    include_data: bool = Field(default=True)
 
 
 class SessionQueryRequest(BaseRequestModel):
@@ -32,6 +36,7 @@ class SessionQueryRequest(BaseRequestModel):
     page: int = Field(default=1, ge=1)
     page_size: int = Field(default=20, ge=1, le=100)
     entries_per_session: Optional[int] = Field(default=20, ge=1)
+    include_data: bool = Field(default=True)
 
 
 class StorageDeleteRequest(BaseRequestModel):
@@ -71,7 +76,15 @@ class StoreDataRequest(BaseRequestModel):
     """Request model for storing arbitrary data"""
     data: Any = Field(...)  # The actual data to store
     ttl_days: Optional[int] = Field(default=None)
-    compress: bool = Field(default=False)
+    compress: Optional[bool] = Field(default=None)  # None: compress large payloads
+    storage_metadata: Dict[str, Any] = Field(default_factory=dict, alias="metadata")
+
+
+class StoreDataBatchRequest(BaseRequestModel):
+    """Request model for storing several data payloads in one call"""
+    items: List[Any] = Field(..., min_length=1, max_length=1000)
+    ttl_days: Optional[int] = Field(default=None)
+    compress: Optional[bool] = Field(default=None)  # None: compress large payloads
     storage_metadata: Dict[str, Any] = Field(default_factory=dict, alias="metadata")
 
 
@@ -82,6 +95,8 @@ class DataQueryRequest(BaseRequestModel):
     metadata_filters: Dict[str, Any] = Field(default_factory=dict)
     page: int = Field(default=1, ge=1)
     page_size: int = Field(default=20, ge=1, le=100)
+    # Keyset cursor from the previous page, skips the OFFSET scan when set
+    after_id: Optional[int] = Field(default=None, ge=1)
 
 
 class DataQueryParamsRequest(BaseRequestModel):
@@ -90,6 +105,7 @@ class DataQueryParamsRequest(BaseRequestModel):
     end_date: Optional[datetime] = Field(default=None)
     page: int = Field(default=1, ge=1)
     page_size: int = Field(default=20, ge=1, le=100)
+    after_id: Optional[int] = Field(default=None, ge=1)
 
     def to_query_request(self) -> DataQueryRequest:
         """Convert to DataQueryRequest"""
@@ -98,4 +114,5 @@ class DataQueryParamsRequest(BaseRequestModel):
             end_date=self.end_date,
             page=self.page,
             page_size=self.page_size,
+            after_id=self.after_id,
         )
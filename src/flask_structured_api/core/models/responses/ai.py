@@ -15,6 +15,8 @@ class AICompletionResponse(BaseModel):
     schema_used: bool = Field(
         default=None, description="Whether a schema was used for validation")
     response_schema: Optional[Dict[str, Any]] = None
+    cache: Optional[Dict[str, Any]] = Field(
+        default=None, description="Response cache status (hit, miss or bypass)")
 
     def __init__(self, **data):
         super().__init__(**data)
@@ -37,5 +39,6 @@ class AICompletionResponse(BaseModel):
             "schema": {
                 "used": self.schema_used,
                 "definition": self.response_schema
-            }
+            },
+            "cache": self.cache
         }
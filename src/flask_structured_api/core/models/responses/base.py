@@ -1,11 +1,12 @@
 from typing import Any, Dict, List, Optional
-from flask import jsonify, current_app
+from flask import current_app
 from pydantic import BaseModel
 
 from flask_structured_api.core.models.errors import ErrorDetail
 from flask_structured_api.core.models.responses.warnings import ResponseWarning
 from flask_structured_api.core.warnings import WarningCollector
 from flask_structured_api.core.middleware.cors import CORSMiddleware
+from flask_structured_api.core.utils.serialization import json_response
 
 cors = CORSMiddleware()
 
@@ -52,9 +53,7 @@ class SuccessResponse(APIResponse):
             ).model_dump()
             for w in warning_collector.get_warnings()
         ]
-        response = jsonify(response_data)
-        response.status_code = status_code
-        return response
+        return json_response(response_data, status_code)
 
 
 class ErrorResponse(APIResponse):
@@ -65,6 +64,5 @@ class ErrorResponse(APIResponse):
 
     def to_response(self, status_code: int = 500):
         """Convert error to Flask response with CORS headers"""
-        response = jsonify(self.model_dump())
-        response.status_code = status_code
+        response = json_response(self.model_dump(), status_code)
         return cors.handle_cors(response)
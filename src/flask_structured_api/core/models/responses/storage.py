@@ -1,4 +1,3 @@
-import json
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
@@ -39,12 +38,14 @@ class StorageEntryResponse(BaseResponseModel):
             return "storage_type" if x == "type" else x
 
     @classmethod
-    def from_orm(cls, obj):
+    def from_orm(cls, obj, include_data: bool = True):
         """
         Custom ORM conversion that handles data decompression and JSON parsing.
 
         Args:
             obj: The ORM model instance
+            include_data: Whether to decode the stored payload. Pass False for
+                entries loaded without their payload columns.
 
         Returns:
             StorageEntryResponse: Converted response model
@@ -53,6 +54,9 @@ class StorageEntryResponse(BaseResponseModel):
         data.storage_info = obj.storage_metadata or {}
         data.type = obj.storage_type
 
+        if not include_data:
+            return data
+
         source_data = (
             obj.request_data
             if obj.storage_type == StorageType.REQUEST
@@ -60,12 +64,7 @@ class StorageEntryResponse(BaseResponseModel):
         )
         if source_data:
             try:
-                raw_data = (
-                    obj.decompress_data(source_data)
-                    if obj.compressed
-                    else source_data.decode("utf-8")
-                )
-                data.data = json.loads(raw_data) if raw_data else None
+                data.data = obj.decode_data(source_data)
             except Exception as e:
                 current_app.logger.warning(f"Failed to decode {data.type} data: {e}")
                 data.data = None
@@ -161,6 +160,7 @@ class StorageListResponse(BaseResponseModel):
         page: Current page number
         page_size: Number of entries per page
         has_more: Whether there are more pages available
+        next_after_id: Cursor ID to pass as after_id for the next page
     """
 
     items: List[StorageEntryResponse]
@@ -168,3 +168,4 @@ class StorageListResponse(BaseResponseModel):
     page: int
     page_size: int
     has_more: bool
+    next_after_id: Optional[int] = None
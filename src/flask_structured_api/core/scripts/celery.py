@@ -1,9 +1,18 @@
 import os
+from datetime import timedelta
 
 from celery import Celery
+from sqlmodel import Session
 
+from flask_structured_api.core.cache.api_key_usage import api_key_usage
+from flask_structured_api.core.config import settings
+from flask_structured_api.core.db import engine
+from flask_structured_api.core.services.storage import StorageService
+from flask_structured_api.core.utils.logger import get_standalone_logger
 from flask_structured_api.factory import create_flask_app
 
+celery_logger = get_standalone_logger("celery")
+
 
 def make_celery(app):
     """Create and configure Celery instance with Flask app context"""
@@ -35,6 +44,38 @@ def make_celery(app):
 flask_app = create_flask_app()  # Use WSGI app for Celery
 celery_app = make_celery(flask_app)
 
+celery_app.conf.beat_schedule = {
+    "sweep-expired-storage": {
+        "task": "storage.sweep_expired",
+        "schedule": timedelta(minutes=settings.STORAGE_SWEEP_INTERVAL_MINUTES),
+    },
+    "flush-api-key-usage": {
+        "task": "auth.flush_api_key_usage",
+        "schedule": timedelta(seconds=settings.API_KEY_USAGE_FLUSH_SECONDS),
+    },
+}
+
+
+@celery_app.task(name="storage.sweep_expired")
+def sweep_expired_storage():
+    """Delete expired api_storage rows in small SKIP LOCKED batches"""
+    with Session(engine) as session:
+        result = StorageService(session).purge_expired(
+            batch_size=settings.STORAGE_SWEEP_BATCH_SIZE
+        )
+    celery_logger.info(
+        "Swept {} expired storage rows ({} bytes) in {} batches".format(
+            result["rows"], result["bytes"], result["batches"]
+        )
+    )
+    return result
+
+
+@celery_app.task(name="auth.flush_api_key_usage")
+def flush_api_key_usage():
+    """Write debounced API key last-used timestamps to the database"""
+    return api_key_usage.flush(lock=True)
+
 
 def worker():
     """Run Celery worker"""
@@ -8,7 +8,13 @@ from flask_migrate import Migrate, upgrade as migrate_upgrade, stamp as migrate_
 
 from flask_structured_api.core.db import check_database_connection
 from flask_structured_api.core.db.shared import db  # Import shared instance
-from flask_structured_api.core.db.migrations import init_migrations
+from flask_structured_api.core.db.migrations import (
+    create_storage_metadata_migration,
+    create_storage_payload_migration,
+    init_migrations,
+    needs_storage_metadata_migration,
+    needs_storage_payload_migration,
+)
 from flask_structured_api.core.scripts.backup_db import (
     backup_database,
     check_tables_empty,
@@ -99,6 +105,28 @@ def init_db() -> bool:
                     print(f"❌ Error during stamping: {e}")
                     return False
 
+            # Move storage metadata to indexed JSONB on existing databases
+            if needs_storage_metadata_migration():
+                print("Storage metadata indexes missing, migrating...")
+                try:
+                    create_storage_metadata_migration(app, directory=migrations_dir)
+                    migrate_upgrade(directory=migrations_dir)
+                    print("✅ Storage metadata migrated to indexed JSONB")
+                except Exception as e:
+                    print(f"❌ Failed to migrate storage metadata: {e}")
+                    return False
+
+            # Record the payload codec and format on existing databases
+            if needs_storage_payload_migration():
+                print("Storage payload columns missing, migrating...")
+                try:
+                    create_storage_payload_migration(app, directory=migrations_dir)
+                    migrate_upgrade(directory=migrations_dir)
+                    print("✅ Storage payload columns added")
+                except Exception as e:
+                    print(f"❌ Failed to add storage payload columns: {e}")
+                    return False
+
             # Create admin user if needed
             print("Checking for admin user...")
             try:
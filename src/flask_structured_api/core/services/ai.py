@@ -1,26 +1,33 @@
 import json
 import re
-from typing import Optional, Dict, Any, Type, List, Union
+from typing import TYPE_CHECKING, Optional, Dict, Any, Type, Union
 from pydantic import BaseModel, ValidationError
 from time import time
 
 from flask import current_app
 from flask_structured_api.core.utils.logger import get_standalone_logger
 
-from flask_structured_api.core.ai.providers.base import BaseProvider
 from flask_structured_api.core.models.requests.ai import AICompletionRequest, AIMessage
 from flask_structured_api.core.models.responses.ai import AICompletionResponse
 from flask_structured_api.core.models.errors.ai import AIErrorDetail
 from flask_structured_api.core.exceptions.ai import AIServiceError, AIResponseValidationError
 from flask_structured_api.core.enums import WarningCode, WarningSeverity, AIErrorCode
 from flask_structured_api.core.config import settings
+from flask_structured_api.core.cache.ai import (
+    CACHED_FIELDS, ai_response_cache, bypass_requested, completion_key
+)
+from flask_structured_api.core.cache.single_flight import single_flight
+
+if TYPE_CHECKING:
+    # Providers pull in langchain, only import them for type checking
+    from flask_structured_api.core.ai.providers.base import BaseProvider
 
 # Create standalone logger for AI service
 logger = get_standalone_logger("ai.service")
 
 
 class AIService:
-    def __init__(self, provider: BaseProvider):
+    def __init__(self, provider: "BaseProvider"):
         self.provider = provider
         self._json_pattern = re.compile(r"```json\n(.*?)\n```", re.DOTALL)
 
@@ -76,16 +83,91 @@ class AIService:
                 details={"content": content}
             )
 
+    def cache_key(self, request: AICompletionRequest, response_schema: Optional[Dict] = None) -> str:
+        """Content address of a completion request for this provider and model"""
+        model = getattr(self.provider, "model", None)
+        model_name = next(
+            (
+                value for value in (
+                    getattr(model, attr, None)
+                    for attr in ("model_name", "model", "deployment_name")
+                )
+                if isinstance(value, str)
+            ),
+            None
+        )
+        return completion_key(
+            type(self.provider).__name__, model_name, request, response_schema
+        )
+
+    def _cached_response(self, cached: Dict[str, Any], cache_info: Dict[str, Any], start_time: float) -> AICompletionResponse:
+        """Replay a cached or shared completion; nothing was spent, the original usage is kept as saved_usage"""
+        cache_info["saved_usage"] = cached.pop("usage", {})
+        cached.pop("cached_at", None)
+        logger.debug("AI response cache hit", extra={"cache": cache_info})
+        return AICompletionResponse(
+            **cached,
+            usage={"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            duration=time() - start_time,
+            cache=cache_info
+        )
+
     async def complete(self, request: AICompletionRequest, response_schema: Optional[Dict] = None) -> AICompletionResponse:
-        """Handle simple text completion"""
+        """
+        Handle simple text completion.
+
+        Answers from the response cache when possible. Identical completions
+        already in flight, in this or another process, are awaited instead of
+        sent to the provider again (single-flight).
+        """
         start_time = time()
-        try:
-            # Apply default settings if not specified
-            if not request.temperature:
-                request.temperature = settings.AI_TEMPERATURE
-            if not request.max_tokens:
-                request.max_tokens = settings.AI_MAX_TOKENS
 
+        # Apply default settings if not specified
+        if not request.temperature:
+            request.temperature = settings.AI_TEMPERATURE
+        if not request.max_tokens:
+            request.max_tokens = settings.AI_MAX_TOKENS
+
+        cacheable = ai_response_cache.cacheable(request)
+        # A caller asking for a fresh completion doesn't share someone else's
+        bypass = bypass_requested()
+        deduplicate = (
+            settings.AI_SINGLE_FLIGHT_ENABLED
+            and not bypass
+            and request.temperature <= settings.AI_CACHE_MAX_TEMPERATURE
+        )
+        if not (cacheable or deduplicate):
+            return await self._generate(request, response_schema, start_time)
+
+        key = self.cache_key(request, response_schema)
+        cache_info = None
+        if cacheable:
+            cached, cache_info = await ai_response_cache.lookup(key, bypass=bypass)
+            if cached:
+                return self._cached_response(cached, cache_info, start_time)
+
+        if deduplicate:
+            response, shared = await single_flight.run(
+                key, lambda: self._generate(request, response_schema, start_time)
+            )
+            if shared:
+                logger.debug("Shared in-flight AI response", extra={"source": shared})
+                cached = response.model_dump(include=CACHED_FIELDS)
+                return self._cached_response(
+                    cached, {"status": "shared", "source": shared, "key": key}, start_time
+                )
+        else:
+            response = await self._generate(request, response_schema, start_time)
+
+        response.cache = cache_info
+        # Only keep confident, non-empty answers
+        if cacheable and response.content.get("success") and response.content.get("confidence", 1.0) >= 0.7:
+            await ai_response_cache.set(key, response)
+        return response
+
+    async def _generate(self, request: AICompletionRequest, response_schema: Optional[Dict], start_time: float) -> AICompletionResponse:
+        """Call the provider and normalize its response"""
+        try:
             # Get raw LangChain response
             if response_schema:
                 wrapped_schema = self._wrap_schema(response_schema)
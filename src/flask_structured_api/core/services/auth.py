@@ -2,11 +2,21 @@ import hashlib
 import secrets
 from datetime import datetime, timedelta
 from typing import List, Optional
+from uuid import uuid4
 
 import jwt
+from redis import RedisError
 from sqlmodel import Session, select
 from werkzeug.security import check_password_hash, generate_password_hash
 
+from flask_structured_api.core.cache.api_key_usage import api_key_usage
+from flask_structured_api.core.cache.auth import (
+    AuthPrincipal,
+    auth_cache,
+    deny_token,
+    get_token_state,
+    revoke_user_tokens,
+)
 from flask_structured_api.core.config import settings
 from flask_structured_api.core.enums import UserRole
 from flask_structured_api.core.exceptions import APIError
@@ -34,22 +44,48 @@ class Auth:
         return check_password_hash(hashed_password, password)
 
     @staticmethod
-    def create_tokens(user_id: int) -> TokenResponse:
+    def create_tokens(
+        user_id: int,
+        role: Optional[UserRole] = None,
+        expires_minutes: Optional[int] = None,
+    ) -> TokenResponse:
+        """
+        Create an access/refresh token pair.
+
+        With JWT_STATELESS and a ``role``, the tokens also carry the role, the
+        user's token version and a ``jti`` so they validate without a database
+        lookup (see ``AuthService.validate_token``).
+        """
+        expires_minutes = expires_minutes or settings.ACCESS_TOKEN_EXPIRE_MINUTES
+        claims = Auth.principal_claims(user_id, role)
         access_token = Auth._create_token(
-            user_id, settings.ACCESS_TOKEN_EXPIRE_MINUTES, settings.JWT_SECRET_KEY
+            user_id, expires_minutes, settings.JWT_SECRET_KEY, claims=claims
         )
         refresh_token = Auth._create_token(
             user_id,
             settings.REFRESH_TOKEN_EXPIRE_MINUTES,
             settings.JWT_REFRESH_SECRET_KEY,
             token_type="refresh",
+            claims=claims,
         )
         return TokenResponse(
             access_token=access_token,
             refresh_token=refresh_token,
-            expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            expires_in=expires_minutes * 60,
         )
 
+    @staticmethod
+    def principal_claims(user_id: int, role: Optional[UserRole]) -> dict:
+        """Role and token version claims for stateless validation, if enabled"""
+        if not settings.JWT_STATELESS or role is None:
+            return {}
+        try:
+            version, _ = get_token_state(user_id)
+        except (APIError, RedisError):
+            # Without the version store tokens fall back to database validation
+            return {}
+        return {"role": UserRole(role).value, "ver": version}
+
     @staticmethod
     def decode_token(token: str, refresh: bool = False) -> dict:
         try:
@@ -68,14 +104,17 @@ class Auth:
 
     @staticmethod
     def _create_token(
-        user_id: int, expire_minutes: int, secret: str, token_type: str = "access"
+        user_id: int,
+        expire_minutes: int,
+        secret: str,
+        token_type: str = "access",
+        claims: Optional[dict] = None,
     ) -> str:
         expire = datetime.utcnow() + timedelta(minutes=expire_minutes)
-        return jwt.encode(
-            {"sub": str(user_id), "exp": expire, "type": token_type},
-            secret,
-            algorithm="HS256",
-        )
+        payload = {"sub": str(user_id), "exp": expire, "type": token_type}
+        if claims:
+            payload.update(claims, jti=uuid4().hex)
+        return jwt.encode(payload, secret, algorithm="HS256")
 
 
 class AuthService:
@@ -124,7 +163,20 @@ class AuthService:
         user.login_count += 1
         self.db.commit()
 
-        return Auth.create_tokens(user.id)
+        return Auth.create_tokens(user.id, role=user.role)
+
+    def create_tokens_for_user(
+        self, user_id: int, expires_minutes: Optional[int] = None
+    ) -> TokenResponse:
+        """Create tokens for a user, e.g. from the CLI"""
+        user = self.get_user_by_id(user_id)
+        if not user:
+            raise APIError(
+                message="User not found", code="AUTH_USER_NOT_FOUND", status_code=404
+            )
+        return Auth.create_tokens(
+            user.id, role=user.role, expires_minutes=expires_minutes
+        )
 
     def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
@@ -149,6 +201,8 @@ class AuthService:
                 )
 
             user_id = int(payload["sub"])
+            if "ver" in payload:
+                self._check_token_revocation(payload, fail_open=True)
             user = self.get_user_by_id(user_id)
 
             if not user or not user.is_active:
@@ -160,7 +214,10 @@ class AuthService:
 
             # Create new access token
             access_token = Auth._create_token(
-                user_id, settings.ACCESS_TOKEN_EXPIRE_MINUTES, settings.JWT_SECRET_KEY
+                user_id,
+                settings.ACCESS_TOKEN_EXPIRE_MINUTES,
+                settings.JWT_SECRET_KEY,
+                claims=Auth.principal_claims(user.id, user.role),
             )
 
             return TokenResponse(
@@ -182,22 +239,24 @@ class AuthService:
                 status_code=401,
             )
 
-    def validate_token(self, token: str) -> User:
-        """Validate token and return user"""
-        try:
-            payload = Auth.decode_token(token)
-            user_id = int(payload["sub"])
-            user = self.get_user_by_id(user_id)
+    def validate_token(self, token: str) -> AuthPrincipal:
+        """
+        Validate token and return the user principal.
 
-            if not user or not user.is_active:
-                raise APIError(
-                    message="User not found or inactive",
-                    code="AUTH_USER_INVALID",
-                    status_code=401,
-                )
-
-            return user
+        Tokens carrying role/version claims (JWT_STATELESS) are trusted after a
+        single Redis revocation check; others, or any token while Redis is
+        unavailable, resolve the principal through the auth cache and database.
+        """
+        payload = self._decode_access_token(token)
+        principal = self._stateless_principal(payload)
+        if principal is None:
+            principal = self.get_user_principal(int(payload["sub"]))
+        return self._require_active(principal)
 
+    @staticmethod
+    def _decode_access_token(token: str) -> dict:
+        try:
+            return Auth.decode_token(token)
         except jwt.ExpiredSignatureError:
             raise APIError(
                 message="Token has expired", code="AUTH_TOKEN_EXPIRED", status_code=401
@@ -207,6 +266,93 @@ class AuthService:
                 message="Invalid token", code="AUTH_INVALID_TOKEN", status_code=401
             )
 
+    @classmethod
+    def _stateless_principal(cls, payload: dict) -> Optional[AuthPrincipal]:
+        """Principal straight from the token claims, None if the DB is needed"""
+        if settings.JWT_STATELESS and "role" in payload and "ver" in payload:
+            if cls._check_token_revocation(payload):
+                return AuthPrincipal(
+                    id=int(payload["sub"]),
+                    role=UserRole(payload["role"]),
+                    is_active=True,
+                )
+        return None
+
+    @staticmethod
+    def _require_active(principal: Optional[AuthPrincipal]) -> AuthPrincipal:
+        if not principal or not principal.is_active:
+            raise APIError(
+                message="User not found or inactive",
+                code="AUTH_USER_INVALID",
+                status_code=401,
+            )
+        return principal
+
+    @staticmethod
+    def _check_token_revocation(payload: dict, fail_open: bool = False) -> bool:
+        """
+        Check a token's version and jti against the revocation store.
+
+        Raises APIError for revoked tokens. Returns False when the store can't
+        be reached (True with ``fail_open``) so callers can validate otherwise.
+        """
+        try:
+            version, denied = get_token_state(int(payload["sub"]), payload.get("jti"))
+        except (APIError, RedisError):
+            return fail_open
+
+        if denied or payload["ver"] != version:
+            raise APIError(
+                message="Token has been revoked",
+                code="AUTH_TOKEN_REVOKED",
+                status_code=401,
+            )
+        return True
+
+    def revoke_tokens(self, user_id: int) -> int:
+        """Revoke every token issued to a user so far"""
+        return revoke_user_tokens(user_id)
+
+    def revoke_token(self, token: str, refresh: bool = False) -> bool:
+        """Revoke a single stateless token, returns False for tokens without jti"""
+        payload = Auth.decode_token(token, refresh=refresh)
+        if "jti" not in payload:
+            return False
+        deny_token(payload["jti"], datetime.utcfromtimestamp(payload["exp"]))
+        return True
+
+    def get_user_principal(self, user_id: int) -> Optional[AuthPrincipal]:
+        """Get the auth principal of a user, from the auth cache when possible"""
+        cache_key = auth_cache.user_key(user_id)
+        principal = auth_cache.get(cache_key)
+        if principal:
+            return principal
+
+        row = self.db.exec(self._user_principal_query(user_id)).first()
+        if not row:
+            return None
+
+        principal = self._user_principal(row)
+        auth_cache.set(cache_key, principal)
+        return principal
+
+    @staticmethod
+    def _user_principal_query(user_id: int):
+        # Select columns only, loading User would also load its relationships
+        return select(
+            User.id, User.role, User.is_active, User.full_name, User.email
+        ).where(User.id == user_id)
+
+    @staticmethod
+    def _user_principal(row) -> AuthPrincipal:
+        return AuthPrincipal(
+            id=row.id,
+            role=UserRole(row.role),
+            is_active=row.is_active,
+            full_name=row.full_name,
+            email=row.email,
+        )
+
     def get_user_api_keys(self, user_id: int) -> List[APIKey]:
         """Get all active API keys for a user"""
         return (
@@ -270,31 +416,79 @@ class AuthService:
         api_key.is_active = False
         self.db.commit()
 
-    def validate_api_key(self, raw_key: str) -> User:
-        """Validate API key and return associated user"""
+        # Drop the cached principal in this and every other worker
+        auth_cache.invalidate(auth_cache.api_key_key(api_key.key_hash))
+
+    def validate_api_key(self, raw_key: str) -> AuthPrincipal:
+        """Validate API key and return the principal of its user"""
         key_hash = hashlib.sha256(raw_key.encode()).hexdigest()
+        cache_key = auth_cache.api_key_key(key_hash)
 
-        api_key = (
-            self.db.query(APIKey)
-            .filter(APIKey.key_hash == key_hash, APIKey.is_active == True)
-            .first()
+        principal = auth_cache.get(cache_key)
+        if principal is None:
+            row = self.db.exec(self._api_key_principal_query(key_hash)).first()
+            principal = self._api_key_principal(row)
+            auth_cache.set(cache_key, principal)
+
+        return self._accept_api_key(principal)
+
+    @staticmethod
+    def _api_key_principal_query(key_hash: str):
+        # Key and user in one query, selecting only the principal columns
+        return (
+            select(
+                APIKey.id.label("api_key_id"),
+                APIKey.expires_at,
+                APIKey.scopes,
+                User.id,
+                User.role,
+                User.is_active,
+                User.full_name,
+                User.email,
+            )
+            .join(User, User.id == APIKey.user_id)
+            .where(APIKey.key_hash == key_hash, APIKey.is_active.is_(True))
         )
 
-        if not api_key:
+    @staticmethod
+    def _api_key_principal(row) -> AuthPrincipal:
+        if not row:
             raise APIError(
-                message="Invalid API key", code="AUTH_INVALID_API_KEY", status_code=401
+                message="Invalid API key",
+                code="AUTH_INVALID_API_KEY",
+                status_code=401,
             )
 
+        return AuthPrincipal(
+            id=row.id,
+            role=UserRole(row.role),
+            is_active=row.is_active,
+            full_name=row.full_name,
+            email=row.email,
+            scopes=list(row.scopes or []),
+            api_key_id=row.api_key_id,
+            expires_at=row.expires_at,
+        )
+
+    @staticmethod
+    def _accept_api_key(principal: AuthPrincipal) -> AuthPrincipal:
+        """Reject expired keys and inactive users, record the key's use"""
         # Check expiration if set
-        if api_key.expires_at and api_key.expires_at < datetime.utcnow():
+        if principal.expires_at and principal.expires_at < datetime.utcnow():
             raise APIError(
                 message="API key has expired",
                 code="AUTH_API_KEY_EXPIRED",
                 status_code=401,
             )
 
-        # Update last used timestamp
-        api_key.last_used_at = datetime.utcnow()
-        self.db.commit()
+        if not principal.is_active:
+            raise APIError(
+                message="User not found or inactive",
+                code="AUTH_USER_INVALID",
+                status_code=401,
+            )
+
+        # Debounced, flushed to api_keys.last_used_at in bulk
+        api_key_usage.record(principal.api_key_id)
 
-        return self.get_user_by_id(api_key.user_id)
+        return principal
@@ -1,11 +1,9 @@
-import json
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from flask import current_app
-from sqlalchemy import cast
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.types import String
+from sqlalchemy import ColumnElement, delete, distinct, insert, literal_column, tuple_
+from sqlalchemy.orm import defer
 from sqlmodel import Session, func, or_, select
 
 from flask_structured_api.core.enums import StorageType, WarningCode, WarningSeverity
@@ -19,9 +17,15 @@ from flask_structured_api.core.models.responses.storage import (
     StorageEntryResponse,
     StorageListResponse,
 )
-from flask_structured_api.core.session import get_or_create_session
+from flask_structured_api.core.session import (
+    get_or_create_session,
+    get_or_create_session_async,
+)
 from flask_structured_api.core.warnings import WarningCollector
 
+if TYPE_CHECKING:
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
 
 class StorageService:
     """Service for handling data storage operations"""
@@ -29,16 +33,22 @@ class StorageService:
     def __init__(self, db: Session):
         self.db = db
 
-    def store_request(
-        self,
+    @staticmethod
+    def build_entry(
         user_id: int,
         endpoint: str,
-        request_data: Dict[str, Any],
+        storage_type: StorageType,
+        data: Any,
         ttl_days: Optional[int] = None,
-        compress: bool = False,
+        compress: Optional[bool] = None,
         metadata: Optional[Dict] = None,
     ) -> APIStorage:
-        """Store request data"""
+        """
+        Build an unsaved storage entry with its payload encoded.
+
+        ``compress=None`` compresses only payloads above the configured size
+        threshold, True/False force it on or off.
+        """
         metadata = metadata or {}
         if "session_id" not in metadata:
             metadata["session_id"] = get_or_create_session(user_id)
@@ -46,26 +56,60 @@ class StorageService:
         storage = APIStorage(
             user_id=user_id,
             endpoint=endpoint,
-            storage_type=StorageType.REQUEST,
+            storage_type=storage_type,
             ttl=datetime.utcnow() + timedelta(days=ttl_days) if ttl_days else None,
-            compressed=compress,
             storage_metadata=metadata,
         )
 
-        storage.request_data = (
-            storage.compress_data(request_data)
-            if compress
-            else json.dumps(request_data).encode()
-        )
+        payload = storage.encode_data(data, compress)
+        if storage_type == StorageType.REQUEST:
+            storage.request_data = payload
+        else:
+            storage.response_data = payload
 
+        return storage
+
+    @staticmethod
+    def entry_rows(entries: List[APIStorage]) -> List[Dict[str, Any]]:
+        """Column values of unsaved entries, as parameters for a multi-row INSERT"""
+        columns = [
+            column.name
+            for column in APIStorage.__table__.columns
+            if column.name != "id"
+        ]
+        return [
+            {column: getattr(entry, column, None) for column in columns}
+            for entry in entries
+        ]
+
+    def store_entry(self, storage: APIStorage) -> APIStorage:
+        """Insert an entry built with ``build_entry``"""
         self.db.add(storage)
         self.db.commit()
+        return storage
+
+    def store_request(
+        self,
+        user_id: int,
+        endpoint: str,
+        request_data: Dict[str, Any],
+        ttl_days: Optional[int] = None,
+        compress: Optional[bool] = None,
+        metadata: Optional[Dict] = None,
+    ) -> APIStorage:
+        """Store request data"""
+        storage = self.build_entry(
+            user_id=user_id,
+            endpoint=endpoint,
+            storage_type=StorageType.REQUEST,
+            data=request_data,
+            ttl_days=ttl_days,
+            compress=compress,
+            metadata=metadata,
+        )
 
-        # current_app.logger.debug(
-        #     f"Stored request for user {user_id} at endpoint '{endpoint}' "
-        #     f"(compressed: {compress}, ttl: {storage.ttl}, "
-        #     f"metadata: {storage.storage_metadata})"
-        # )
+        self.db.add(storage)
+        self.db.commit()
         return storage
 
     def store_response(
@@ -74,37 +118,22 @@ class StorageService:
         endpoint: str,
         response_data: Dict[str, Any],
         ttl_days: Optional[int] = None,
-        compress: bool = False,
+        compress: Optional[bool] = None,
         metadata: Optional[Dict] = None,
     ) -> APIStorage:
         """Store response data"""
-        metadata = metadata or {}
-        if "session_id" not in metadata:
-            metadata["session_id"] = get_or_create_session(user_id)
-
-        storage = APIStorage(
+        storage = self.build_entry(
             user_id=user_id,
             endpoint=endpoint,
             storage_type=StorageType.RESPONSE,
-            ttl=datetime.utcnow() + timedelta(days=ttl_days) if ttl_days else None,
-            compressed=compress,
-            storage_metadata=metadata,
-        )
-
-        storage.response_data = (
-            storage.compress_data(response_data)
-            if compress
-            else json.dumps(response_data).encode()
+            data=response_data,
+            ttl_days=ttl_days,
+            compress=compress,
+            metadata=metadata,
         )
 
         self.db.add(storage)
         self.db.commit()
-
-        # current_app.logger.debug(
-        #     f"Stored response for user {user_id} at endpoint '{endpoint}' "
-        #     f"(compressed: {compress}, ttl: {storage.ttl}, "
-        #     f"metadata: {storage.storage_metadata})"
-        # )
         return storage
 
     def query_storage(
@@ -118,6 +147,8 @@ class StorageService:
         session_id: Optional[str] = None,  # Add this parameter
         page: int = 1,
         page_size: int = 20,
+        after_id: Optional[int] = None,
+        include_data: bool = True,
     ) -> StorageListResponse:
         """Query stored data with filters"""
         # Handle session_id by adding it to metadata_filters
@@ -134,28 +165,17 @@ class StorageService:
                 )
             metadata_filters["session_id"] = session_id
 
-        filtered_entries = self._filter_storage_entries(
+        return self._paginate_storage_entries(
             user_id=user_id,
             endpoint=endpoint,
             start_date=start_date,
             end_date=end_date,
             storage_type=storage_type,
             metadata_filters=metadata_filters,
-        )
-
-        # Calculate pagination
-        total = len(filtered_entries)
-        paginated_entries = filtered_entries[(page - 1) * page_size: page * page_size]
-
-        # Convert to response model
-        items = [StorageEntryResponse.from_orm(entry) for entry in paginated_entries]
-
-        return StorageListResponse(
-            items=items,
-            total=total,
             page=page,
             page_size=page_size,
-            has_more=total > page * page_size,
+            after_id=after_id,
+            include_data=include_data,
         )
 
     def delete_storage(
@@ -179,6 +199,57 @@ class StorageService:
         self.db.commit()
         return len(entries)
 
+    def purge_expired(
+        self,
+        batch_size: int = 1000,
+        max_batches: Optional[int] = None,
+        now: Optional[datetime] = None,
+    ) -> Dict[str, int]:
+        """
+        Delete entries whose TTL has passed, across all users.
+
+        Each batch picks at most ``batch_size`` expired rows in ``ttl`` order
+        (a range scan on the ttl index) with ``FOR UPDATE SKIP LOCKED`` and
+        deletes them in its own short transaction, so rows busy elsewhere are
+        left for the next run and no lock is held for long.
+
+        Returns:
+            Counts of deleted ``rows``, reclaimed ``bytes`` (stored row size)
+            and ``batches`` run
+        """
+        now = now or datetime.utcnow()
+        expired = (
+            select(APIStorage.id)
+            .where(APIStorage.ttl.is_not(None), APIStorage.ttl <= now)
+            .order_by(APIStorage.ttl)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .cte("expired")
+        )
+        query = (
+            delete(APIStorage)
+            .where(APIStorage.id.in_(select(expired.c.id)))
+            .returning(func.pg_column_size(literal_column("api_storage.*")))
+            .execution_options(synchronize_session=False)
+        )
+
+        result = {"rows": 0, "bytes": 0, "batches": 0}
+        while max_batches is None or result["batches"] < max_batches:
+            try:
+                sizes = self.db.execute(query).scalars().all()
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+
+            result["batches"] += 1
+            result["rows"] += len(sizes)
+            result["bytes"] += sum(size or 0 for size in sizes)
+            if len(sizes) < batch_size:
+                break
+
+        return result
+
     def get_user_sessions(
         self,
         user_id: int,
@@ -191,6 +262,7 @@ class StorageService:
         page: int = 1,
         page_size: int = 20,
         entries_per_session: Optional[int] = 20,
+        include_data: bool = True,
     ) -> Dict[str, Any]:
         """
         Get user sessions with their request/response pairs.
@@ -206,61 +278,50 @@ class StorageService:
             page: Page number for session pagination
             page_size: Number of sessions per page
             entries_per_session: Maximum number of entries to return per session
+            include_data: Whether to load and decode the stored payloads
         """
-        filtered_entries = self._filter_storage_entries(
+        filters = self._build_storage_filters(
             user_id=user_id,
             endpoint=endpoint,
             start_date=start_date,
             end_date=end_date,
             storage_type=storage_type,
+            session_id=session_id,
             metadata_filters=metadata_filters,
         )
-
-        # Group entries by session_id and remove duplicates
-        session_groups = {}
-        for entry in filtered_entries:
-            session_id = entry.storage_metadata.get("session_id")
-            if not session_id:
-                continue
-            if session_id not in session_groups:
-                # Use dict to prevent duplicates
-                session_groups[session_id] = {}
-            # Use ID as key to prevent duplicates
-            session_groups[session_id][entry.id] = entry
+        summaries, total_sessions = self._query_session_summaries(
+            filters, endpoint, page, page_size
+        )
+        entries_by_session = self._query_session_entries(
+            filters,
+            [summary.session_id for summary in summaries],
+            entries_per_session,
+            include_data,
+        )
 
         sessions = []
-        for session_id, entries_dict in session_groups.items():
-            entries = list(entries_dict.values())  # Convert back to list
-            entries.sort(key=lambda x: x.created_at, reverse=True)  # Sort by created_at
-
-            total_entries = len(entries)
-            shown_entries = (
-                entries[:entries_per_session] if entries_per_session else entries
-            )
-
+        for summary in summaries:
+            shown_entries = entries_by_session.get(summary.session_id, [])
             session = SessionWithEntriesResponse(
-                session_id=session_id,
+                session_id=summary.session_id,
                 user_id=user_id,
-                created_at=min(e.created_at for e in entries),
-                last_activity=max(e.created_at for e in entries),
-                endpoints=list({e.endpoint for e in entries}),
-                total_entries=total_entries,
+                created_at=summary.created_at,
+                last_activity=summary.last_activity,
+                endpoints=list(summary.endpoints),
+                total_entries=summary.total_entries,
                 entries_shown=len(shown_entries),
-                has_more_entries=entries_per_session
-                and total_entries > entries_per_session,
-                entries=[StorageEntryResponse.from_orm(e) for e in shown_entries],
+                has_more_entries=bool(
+                    entries_per_session and summary.total_entries > entries_per_session
+                ),
+                entries=[
+                    StorageEntryResponse.from_orm(e, include_data=include_data)
+                    for e in shown_entries
+                ],
             )
             sessions.append(session)
 
-        # Sort sessions by last activity
-        sessions.sort(key=lambda x: x.last_activity, reverse=True)
-
-        # Paginate sessions
-        total_sessions = len(sessions)
-        paginated_sessions = sessions[(page - 1) * page_size: page * page_size]
-
         response = DetailedSessionListResponse(
-            sessions=paginated_sessions,
+            sessions=sessions,
             total=total_sessions,
             page=page,
             page_size=page_size,
@@ -269,7 +330,127 @@ class StorageService:
 
         return response.model_dump()
 
-    def _filter_storage_entries(
+    @staticmethod
+    def _defer_payload() -> Tuple[Any, ...]:
+        """Loader options that leave the payload blobs out of the SELECT"""
+        return (defer(APIStorage.request_data), defer(APIStorage.response_data))
+
+    @staticmethod
+    def _session_id_column() -> ColumnElement:
+        """Session ID stored in the entry metadata, as text (matches its index)"""
+        return APIStorage.storage_metadata["session_id"].astext
+
+    def _query_session_summaries(
+        self,
+        filters: List[Tuple[str, Any, List[ColumnElement]]],
+        endpoint: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 20,
+    ) -> Tuple[List[Any], int]:
+        """
+        Aggregate filtered entries into one page of sessions.
+
+        Groups on the metadata session ID in SQL and returns rows with
+        ``session_id``, ``created_at``, ``last_activity``, ``endpoints`` and
+        ``total_entries``, newest activity first, along with the total number of
+        sessions (computed by a window count in the same query).
+        """
+        entries = (
+            select(
+                self._session_id_column().label("session_id"),
+                APIStorage.created_at,
+                APIStorage.endpoint,
+            )
+            .where(
+                *self._flatten_filters(filters),
+                self._session_id_column().isnot(None),
+            )
+            .subquery()
+        )
+
+        query = (
+            select(
+                entries.c.session_id,
+                func.min(entries.c.created_at).label("created_at"),
+                func.max(entries.c.created_at).label("last_activity"),
+                func.array_agg(distinct(entries.c.endpoint)).label("endpoints"),
+                func.count().label("total_entries"),
+                func.count().over().label("total_sessions"),
+            )
+            .group_by(entries.c.session_id)
+            .order_by(func.max(entries.c.created_at).desc(), entries.c.session_id)
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+        )
+        summaries = self.db.execute(query).all()
+
+        if summaries:
+            if endpoint:
+                self._warn_endpoint_normalized(
+                    endpoint,
+                    [value for summary in summaries for value in summary.endpoints],
+                )
+            return summaries, summaries[0].total_sessions
+
+        # Past the last page the window count has no row to ride on
+        total = 0
+        if page > 1:
+            total = self.db.execute(
+                select(func.count(distinct(entries.c.session_id)))
+            ).scalar_one()
+        if not total:
+            self._explain_empty_result(filters, endpoint)
+        return summaries, total
+
+    def _query_session_entries(
+        self,
+        filters: List[Tuple[str, Any, List[ColumnElement]]],
+        session_ids: List[str],
+        entries_per_session: Optional[int] = None,
+        include_data: bool = True,
+    ) -> Dict[str, List[APIStorage]]:
+        """
+        Fetch the newest entries of the given sessions in a single query.
+
+        Entries are ranked per session with ROW_NUMBER() so at most
+        ``entries_per_session`` rows per session are loaded.
+        """
+        if not session_ids:
+            return {}
+
+        session_id = self._session_id_column()
+        conditions = self._flatten_filters(filters) + [session_id.in_(session_ids)]
+        newest_first = (APIStorage.created_at.desc(), APIStorage.id.desc())
+
+        if entries_per_session:
+            ranked = (
+                select(
+                    APIStorage.id,
+                    func.row_number()
+                    .over(partition_by=session_id, order_by=newest_first)
+                    .label("row_number"),
+                )
+                .where(*conditions)
+                .subquery()
+            )
+            query = (
+                select(APIStorage)
+                .join(ranked, ranked.c.id == APIStorage.id)
+                .where(ranked.c.row_number <= entries_per_session)
+            )
+        else:
+            query = select(APIStorage).where(*conditions)
+        if not include_data:
+            query = query.options(*self._defer_payload())
+
+        entries_by_session: Dict[str, List[APIStorage]] = {}
+        for entry in self.db.execute(query.order_by(*newest_first)).scalars():
+            entries_by_session.setdefault(
+                str(entry.storage_metadata.get("session_id")), []
+            ).append(entry)
+        return entries_by_session
+
+    def _paginate_storage_entries(
         self,
         user_id: int,
         endpoint: Optional[str] = None,
@@ -278,8 +459,105 @@ class StorageService:
         storage_type: Optional[StorageType] = None,
         session_id: Optional[str] = None,
         metadata_filters: Dict[str, Any] = None,
-    ) -> List[APIStorage]:
-        """Base function for filtering storage entries with detailed warnings"""
+        page: int = 1,
+        page_size: int = 20,
+        after_id: Optional[int] = None,
+        include_data: bool = True,
+    ) -> StorageListResponse:
+        """
+        Fetch one page of filtered storage entries.
+
+        The total comes from a separate COUNT and the page from LIMIT/OFFSET, so
+        only ``page_size`` rows are loaded. When ``after_id`` is given, the page
+        starts right after that entry in (created_at, id) order instead of
+        skipping ``page`` pages with OFFSET.
+        With ``include_data=False`` the payload columns are never read.
+        """
+        filters = self._build_storage_filters(
+            user_id=user_id,
+            endpoint=endpoint,
+            start_date=start_date,
+            end_date=end_date,
+            storage_type=storage_type,
+            session_id=session_id,
+            metadata_filters=metadata_filters,
+        )
+        conditions = self._flatten_filters(filters)
+
+        total = self.db.execute(
+            select(func.count()).select_from(APIStorage).where(*conditions)
+        ).scalar_one()
+
+        query = (
+            select(APIStorage)
+            .where(*conditions)
+            .order_by(APIStorage.created_at.desc(), APIStorage.id.desc())
+        )
+        if not include_data:
+            query = query.options(*self._defer_payload())
+
+        if after_id is not None:
+            query = query.where(self._keyset_condition(after_id))
+        else:
+            query = query.offset((page - 1) * page_size)
+
+        # Fetch one extra row to know whether another page follows
+        entries = self.db.execute(query.limit(page_size + 1)).scalars().all()
+        has_more = len(entries) > page_size
+        entries = entries[:page_size]
+
+        if entries:
+            if endpoint:
+                self._warn_endpoint_normalized(
+                    endpoint, [entry.endpoint for entry in entries]
+                )
+        elif not total:
+            self._explain_empty_result(filters, endpoint)
+
+        last_entry = entries[-1] if has_more else None
+        return StorageListResponse(
+            items=[
+                StorageEntryResponse.from_orm(entry, include_data=include_data)
+                for entry in entries
+            ],
+            total=total,
+            page=page,
+            page_size=page_size,
+            has_more=has_more,
+            next_after_id=last_entry.id if last_entry else None,
+        )
+
+    @staticmethod
+    def _keyset_condition(after_id: int) -> ColumnElement:
+        """Condition selecting entries after a cursor in (created_at, id) desc order"""
+        # The cursor row's timestamp is looked up in the same statement, at full
+        # precision
+        after_created_at = (
+            select(APIStorage.created_at)
+            .where(APIStorage.id == after_id)
+            .scalar_subquery()
+        )
+        return tuple_(APIStorage.created_at, APIStorage.id) < tuple_(
+            after_created_at, after_id
+        )
+
+    def _build_storage_filters(
+        self,
+        user_id: int,
+        endpoint: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        storage_type: Optional[StorageType] = None,
+        session_id: Optional[str] = None,
+        metadata_filters: Dict[str, Any] = None,
+    ) -> List[Tuple[str, Any, List[ColumnElement]]]:
+        """
+        Translate storage filters into SQL conditions.
+
+        Returns an ordered list of ``(name, value, conditions)`` stages. The order
+        matches the order in which filters are explained when a query comes back
+        empty, so the first stage that drops the count to zero gets the blame.
+        """
         # Handle session_id precedence
         if session_id and metadata_filters and "session_id" in metadata_filters:
             WarningCollector.add_warning(
@@ -293,143 +571,176 @@ class StorageService:
 
         # If session_id parameter is provided, add it to metadata filters
         if session_id:
-            metadata_filters = metadata_filters or {}
+            metadata_filters = dict(metadata_filters or {})
             metadata_filters["session_id"] = session_id
 
-        # Build base query with only basic filters
-        query = select(APIStorage).where(APIStorage.user_id == user_id)
-        base_entries = self.db.execute(query).scalars().all()
-
-        if not base_entries:
-            WarningCollector.add_warning(
-                message="No storage entries found for this user",
-                code=WarningCode.NO_RESULTS_FOUND,
-                severity=WarningSeverity.MEDIUM,
-            )
-            return []
-
-        filtered_entries = base_entries
-        initial_count = len(filtered_entries)
-
-        # Track filter results
-        filter_results = {}
+        filters = [("user", user_id, [APIStorage.user_id == user_id])]
 
         if storage_type:
-            before_count = len(filtered_entries)
-            filtered_entries = [
-                e for e in filtered_entries if e.storage_type == storage_type
-            ]
-            if not filtered_entries and before_count > 0:
-                filter_results["storage_type"] = storage_type.value
+            filters.append(
+                (
+                    "storage_type",
+                    storage_type.value,
+                    [APIStorage.storage_type == storage_type],
+                )
+            )
 
         if endpoint:
-            before_count = len(filtered_entries)
-            endpoint_variations = self._normalize_endpoint(endpoint)
-
-            # Try each endpoint variation
-            matched_entries = []
-            matched_variation = None
-
-            for variation in endpoint_variations:
-                current_matches = [
-                    e
-                    for e in filtered_entries
-                    if e.endpoint.strip("/ ").lower() == variation.strip("/ ")
-                ]
-                if current_matches:
-                    matched_entries.extend(current_matches)
-                    if not matched_variation:  # Keep track of first matching variation
-                        matched_variation = variation
-
-            if matched_entries:
-                filtered_entries = matched_entries
-                if matched_variation != endpoint:
-                    WarningCollector.add_warning(
-                        message="Found entries using normalized endpoint: '{}' (original: '{}')".format(
-                            matched_variation, endpoint
-                        ),
-                        code=WarningCode.ENDPOINT_NORMALIZED,
-                        severity=WarningSeverity.LOW,
-                    )
-            elif before_count > 0:
-                filter_results["endpoint"] = endpoint
-                # Add more specific warning about tried variations
-                WarningCollector.add_warning(
-                    message="No entries found for endpoint '{}'. Tried variations: {}".format(
-                        endpoint, ", ".join(endpoint_variations)
-                    ),
-                    code=WarningCode.NO_RESULTS_FOUND,
-                    severity=WarningSeverity.LOW,
-                )
+            variations = self._endpoint_match_values(endpoint)
+            condition = self._normalized_endpoint_column().in_(variations)
+            filters.append(("endpoint", endpoint, [condition]))
 
         if start_date or end_date:
-            before_count = len(filtered_entries)
+            conditions = []
             if start_date:
-                filtered_entries = [
-                    e
-                    for e in filtered_entries
-                    if e.created_at.replace(tzinfo=timezone.utc) >= start_date
-                ]
+                conditions.append(
+                    APIStorage.created_at >= self._to_naive_utc(start_date)
+                )
             if end_date:
                 # Only adjust to end of day if time wasn't specified (hour, minute, second all 0)
                 if end_date.hour == 0 and end_date.minute == 0 and end_date.second == 0:
                     end_date = end_date.replace(
                         hour=23, minute=59, second=59, microsecond=999999
                     )
-                filtered_entries = [
-                    e
-                    for e in filtered_entries
-                    if e.created_at.replace(tzinfo=timezone.utc) <= end_date
-                ]
-            if not filtered_entries and before_count > 0:
-                if start_date and end_date:
-                    date_range = "{} to {}".format(start_date, end_date)
-                elif start_date:
-                    date_range = "after {}".format(start_date)
-                else:
-                    date_range = "before {}".format(end_date)
-                filter_results["date_range"] = date_range
+                conditions.append(
+                    APIStorage.created_at <= self._to_naive_utc(end_date)
+                )
+
+            if start_date and end_date:
+                date_range = "{} to {}".format(start_date, end_date)
+            elif start_date:
+                date_range = "after {}".format(start_date)
+            else:
+                date_range = "before {}".format(end_date)
+            filters.append(("date_range", date_range, conditions))
 
         if metadata_filters:
-            before_count = len(filtered_entries)
-            filtered_entries = [
-                entry
-                for entry in filtered_entries
-                if all(
-                    entry.storage_metadata.get(key) == value
-                    for key, value in metadata_filters.items()
+            # Session IDs go through their expression index, everything else
+            # through the GIN index via JSONB containment
+            contained = dict(metadata_filters)
+            conditions = []
+            if isinstance(contained.get("session_id"), str):
+                conditions.append(
+                    self._session_id_column() == contained.pop("session_id")
                 )
-            ]
-            if not filtered_entries and before_count > 0:
-                filter_results["metadata"] = metadata_filters
+            if contained:
+                conditions.append(APIStorage.storage_metadata.contains(contained))
+            filters.append(("metadata", metadata_filters, conditions))
 
-        # Generate appropriate warning based on what filtered out results
-        if not filtered_entries and filter_results:
-            messages = []
-            if "storage_type" in filter_results:
-                messages.append(
-                    "storage type '{}'".format(filter_results["storage_type"])
-                )
-            if "endpoint" in filter_results:
-                messages.append("endpoint '{}'".format(filter_results["endpoint"]))
-            if "date_range" in filter_results:
-                messages.append("date range {}".format(filter_results["date_range"]))
-            if "metadata" in filter_results:
-                metadata_str = ", ".join(
-                    "{}='{}'".format(k, v)
-                    for k, v in filter_results["metadata"].items()
+        return filters
+
+    @staticmethod
+    def _flatten_filters(
+        filters: List[Tuple[str, Any, List[ColumnElement]]]
+    ) -> List[ColumnElement]:
+        """Collect the SQL conditions of all filter stages"""
+        return [condition for _, _, conditions in filters for condition in conditions]
+
+    def _explain_empty_result(
+        self,
+        filters: List[Tuple[str, Any, List[ColumnElement]]],
+        endpoint: Optional[str] = None,
+    ) -> None:
+        """
+        Work out which filter emptied the result and add the matching warning.
+
+        Runs one cheap COUNT per filter stage, applying the stages cumulatively and
+        stopping at the first one that leaves no rows. Only called for empty results,
+        so successful queries never pay for it.
+        """
+        applied = []
+        filter_results = {}
+
+        for name, value, conditions in filters:
+            applied.extend(conditions)
+            count = self.db.execute(
+                select(func.count()).select_from(APIStorage).where(*applied)
+            ).scalar_one()
+            if count:
+                if name == "endpoint":
+                    matched = self.db.execute(
+                        select(APIStorage.endpoint).where(*applied).limit(1)
+                    ).scalars().all()
+                    self._warn_endpoint_normalized(endpoint, matched)
+                continue
+
+            if name == "user":
+                WarningCollector.add_warning(
+                    message="No storage entries found for this user",
+                    code=WarningCode.NO_RESULTS_FOUND,
+                    severity=WarningSeverity.MEDIUM,
                 )
-                messages.append("metadata filters {}".format(metadata_str))
+                return
 
-            warning_msg = "No entries found matching " + " and ".join(messages)
+            if name == "endpoint":
+                # Add more specific warning about tried variations
+                WarningCollector.add_warning(
+                    message="No entries found for endpoint '{}'. Tried variations: {}".format(
+                        endpoint, ", ".join(self._normalize_endpoint(endpoint))
+                    ),
+                    code=WarningCode.NO_RESULTS_FOUND,
+                    severity=WarningSeverity.LOW,
+                )
+            filter_results[name] = value
+            break
 
-            WarningCollector.add_warning(
-                message=warning_msg,
-                code=WarningCode.NO_RESULTS_FOUND,
-                severity=WarningSeverity.MEDIUM,
+        # Generate appropriate warning based on what filtered out results
+        if not filter_results:
+            return
+
+        messages = []
+        if "storage_type" in filter_results:
+            messages.append("storage type '{}'".format(filter_results["storage_type"]))
+        if "endpoint" in filter_results:
+            messages.append("endpoint '{}'".format(filter_results["endpoint"]))
+        if "date_range" in filter_results:
+            messages.append("date range {}".format(filter_results["date_range"]))
+        if "metadata" in filter_results:
+            metadata_str = ", ".join(
+                "{}='{}'".format(k, v) for k, v in filter_results["metadata"].items()
             )
+            messages.append("metadata filters {}".format(metadata_str))
+
+        warning_msg = "No entries found matching " + " and ".join(messages)
+
+        WarningCollector.add_warning(
+            message=warning_msg,
+            code=WarningCode.NO_RESULTS_FOUND,
+            severity=WarningSeverity.MEDIUM,
+        )
+
+    def _warn_endpoint_normalized(self, endpoint: str, matched: List[str]) -> None:
+        """Warn when entries only matched a normalized variation of the endpoint"""
+        requested = endpoint.strip("/ ").lower()
+        normalized = {value.strip("/ ").lower() for value in matched}
+        if not normalized or requested in normalized:
+            return
+
+        WarningCollector.add_warning(
+            message="Found entries using normalized endpoint: '{}' (original: '{}')".format(
+                sorted(normalized)[0], endpoint
+            ),
+            code=WarningCode.ENDPOINT_NORMALIZED,
+            severity=WarningSeverity.LOW,
+        )
 
-        return filtered_entries
+    @staticmethod
+    def _normalized_endpoint_column() -> ColumnElement:
+        """Endpoint column stripped of slashes/whitespace and lowercased"""
+        return func.lower(func.btrim(APIStorage.endpoint, "/ "))
+
+    def _endpoint_match_values(self, endpoint: str) -> List[str]:
+        """Endpoint variations in the form compared against the normalized column"""
+        return sorted(
+            {variation.strip("/ ") for variation in self._normalize_endpoint(endpoint)}
+        )
+
+    @staticmethod
+    def _to_naive_utc(value: datetime) -> datetime:
+        """Convert a datetime to naive UTC to compare against created_at"""
+        if value.tzinfo is None:
+            return value
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
 
     def list_user_sessions(
         self,
@@ -439,52 +750,46 @@ class StorageService:
         end_date: Optional[datetime] = None,
         session_id: Optional[str] = None,
         storage_type: Optional[StorageType] = None,
+        metadata_filters: Optional[Dict[str, Any]] = None,
         page: int = 1,
         page_size: int = 20,
         entries_per_session: Optional[int] = None,
     ) -> Dict[str, Any]:
-        """List user's storage sessions without entries."""
-        metadata_filters = {"session_id": session_id} if session_id else None
-        filtered_entries = self._filter_storage_entries(
+        """
+        List user's storage sessions without entries.
+
+        Only aggregates over metadata columns, so the payload blobs are never read.
+        """
+        filters = self._build_storage_filters(
             user_id=user_id,
             endpoint=endpoint,
             start_date=start_date,
             end_date=end_date,
+            storage_type=storage_type,
+            session_id=session_id,
             metadata_filters=metadata_filters,
         )
-
-        # Group entries by session_id
-        session_groups = {}
-        for entry in filtered_entries:
-            session_id = entry.storage_metadata.get("session_id")
-            if not session_id:
-                continue
-            if session_id not in session_groups:
-                session_groups[session_id] = []
-            session_groups[session_id].append(entry)
+        summaries, total = self._query_session_summaries(
+            filters, endpoint, page, page_size
+        )
 
         # Create session responses
-        sessions = []
-        for session_id, entries in session_groups.items():
-            session = SessionListItemResponse(
-                session_id=session_id,
+        sessions = [
+            SessionListItemResponse(
+                session_id=summary.session_id,
                 user_id=user_id,
-                created_at=min(e.created_at for e in entries),
-                last_activity=max(e.created_at for e in entries),
-                endpoints=list({e.endpoint for e in entries}),
-                total_entries=len(entries),
+                created_at=summary.created_at,
+                last_activity=summary.last_activity,
+                endpoints=list(summary.endpoints),
+                total_entries=summary.total_entries,
                 entries_shown=0,  # No entries in simple list
-                has_more_entries=True if entries else False,
+                has_more_entries=summary.total_entries > 0,
             )
-            sessions.append(session)
-
-        # Sort and paginate
-        sessions.sort(key=lambda x: x.last_activity, reverse=True)
-        total = len(sessions)
-        paginated_sessions = sessions[(page - 1) * page_size: page * page_size]
+            for summary in summaries
+        ]
 
         response = SimpleSessionListResponse(
-            sessions=paginated_sessions,
+            sessions=sessions,
             total=total,
             page=page,
             page_size=page_size,
@@ -536,45 +841,126 @@ class StorageService:
         user_id: int,
         data: Any,
         ttl_days: Optional[int] = None,
-        compress: bool = False,
+        compress: Optional[bool] = None,
         metadata: Optional[Dict] = None,
     ) -> APIStorage:
         """Store arbitrary data"""
-        metadata = metadata or {}
-        if "session_id" not in metadata:
-            metadata["session_id"] = get_or_create_session(user_id)
-
-        storage = APIStorage(
+        # Ensure only the data is stored, not headers
+        storage = self.build_entry(
             user_id=user_id,
             endpoint="data_storage",  # Fixed endpoint for data storage
-            storage_type=StorageType.DATA,  # New storage type needed in StorageType enum
-            ttl=datetime.utcnow() + timedelta(days=ttl_days) if ttl_days else None,
-            compressed=compress,
-            storage_metadata=metadata,
-        )
-
-        # Ensure only the data is stored, not headers
-        storage.response_data = (
-            storage.compress_data(data) if compress else json.dumps(data).encode()
+            storage_type=StorageType.DATA,
+            data=data,
+            ttl_days=ttl_days,
+            compress=compress,
+            metadata=metadata,
         )
 
         self.db.add(storage)
         self.db.commit()
         return storage
 
+    def store_many(
+        self,
+        user_id: int,
+        items: List[Any],
+        ttl_days: Optional[int] = None,
+        compress: Optional[bool] = None,
+        metadata: Optional[Dict] = None,
+        item_metadata: Optional[List[Dict]] = None,
+    ) -> List[int]:
+        """
+        Store several data payloads with one INSERT and a single commit.
+
+        ``metadata`` is shared by every entry, ``item_metadata`` (same length as
+        ``items``) is merged on top of it per entry. Returns the new IDs in the
+        order of ``items``.
+        """
+        if not items:
+            return []
+        if item_metadata is not None and len(item_metadata) != len(items):
+            raise ValueError("item_metadata must have one entry per item")
+
+        # Resolve the session once instead of hitting Redis for every entry
+        shared_metadata = dict(metadata or {})
+        if "session_id" not in shared_metadata:
+            shared_metadata["session_id"] = get_or_create_session(user_id)
+
+        entries = self.build_data_entries(
+            user_id, items, ttl_days, compress, shared_metadata, item_metadata
+        )
+        storage_ids = list(
+            self.db.execute(self.insert_returning_ids(), self.entry_rows(entries))
+            .scalars()
+        )
+        self.db.commit()
+        return storage_ids
+
+    @classmethod
+    def build_data_entries(
+        cls,
+        user_id: int,
+        items: List[Any],
+        ttl_days: Optional[int],
+        compress: Optional[bool],
+        shared_metadata: Dict,
+        item_metadata: Optional[List[Dict]] = None,
+    ) -> List[APIStorage]:
+        """Build the data entries of a ``store_many`` batch"""
+        return [
+            cls.build_entry(
+                user_id=user_id,
+                endpoint="data_storage",
+                storage_type=StorageType.DATA,
+                data=data,
+                ttl_days=ttl_days,
+                compress=compress,
+                metadata={
+                    **shared_metadata,
+                    **(item_metadata[index] if item_metadata else {}),
+                },
+            )
+            for index, data in enumerate(items)
+        ]
+
+    @staticmethod
+    def insert_returning_ids():
+        """
+        Bulk INSERT returning ids in parameter order.
+
+        Executed with a list of rows it becomes an executemany that SQLAlchemy
+        batches into multi-row VALUES.
+        """
+        return insert(APIStorage.__table__).returning(
+            APIStorage.__table__.c.id, sort_by_parameter_order=True
+        )
+
     def get_data(self, user_id: int, storage_id: int) -> Optional[Any]:
         """Get stored data by ID"""
         storage = self.db.get(APIStorage, storage_id)
         if not storage or storage.user_id != user_id:
             return None
 
+        return self._decode_data(storage)
+
+    def get_data_many(self, user_id: int, storage_ids: List[int]) -> Dict[int, Any]:
+        """Get stored data for several IDs in one query, keyed by storage ID"""
+        if not storage_ids:
+            return {}
+
+        query = select(APIStorage).where(
+            APIStorage.user_id == user_id, APIStorage.id.in_(storage_ids)
+        )
+        return {
+            storage.id: self._decode_data(storage)
+            for storage in self.db.execute(query).scalars()
+        }
+
+    @staticmethod
+    def _decode_data(storage: APIStorage) -> Optional[Any]:
+        """Decode the data payload of a storage entry"""
         try:
-            raw_data = (
-                storage.decompress_data(storage.response_data)
-                if storage.compressed
-                else storage.response_data.decode("utf-8")
-            )
-            return json.loads(raw_data) if raw_data else None
+            return storage.decode_data(storage.response_data)
         except Exception as e:
             current_app.logger.warning(f"Failed to decode data: {e}")
             return None
@@ -587,39 +973,21 @@ class StorageService:
         metadata_filters: Optional[Dict[str, Any]] = None,
         page: int = 1,
         page_size: int = 20,
+        after_id: Optional[int] = None,
+        include_data: bool = True,
     ) -> StorageListResponse:
         """List stored data with filters"""
-        filtered_entries = self._filter_storage_entries(
+        return self._paginate_storage_entries(
             user_id=user_id,
             storage_type=StorageType.DATA,
             endpoint="data_storage",
             start_date=start_date,
             end_date=end_date,
             metadata_filters=metadata_filters,
-        )
-
-        # Deduplicate entries by ID while preserving order
-        seen_ids = set()
-        unique_entries = []
-        for entry in filtered_entries:
-            if entry.id not in seen_ids:
-                seen_ids.add(entry.id)
-                unique_entries.append(entry)
-
-        # Sort by created_at in descending order (newest first)
-        unique_entries.sort(key=lambda x: x.created_at, reverse=True)
-
-        # Calculate pagination
-        total = len(unique_entries)
-        paginated_entries = unique_entries[(page - 1) * page_size: page * page_size]
-        items = [StorageEntryResponse.from_orm(entry) for entry in paginated_entries]
-
-        return StorageListResponse(
-            items=items,
-            total=total,
             page=page,
             page_size=page_size,
-            has_more=total > page * page_size,
+            after_id=after_id,
+            include_data=include_data,
         )
 
     async def delete_data_by_id(self, user_id: int, storage_id: int) -> bool:
@@ -639,19 +1007,175 @@ class StorageService:
     async def delete_data_by_session_id(self, user_id: int, session_id: str) -> bool:
         """Delete data by session ID"""
         try:
-            # Convert SQLAlchemy query to SQLModel for async compatibility
-            query = select(APIStorage).where(
+            # Bulk delete through the session_id expression index
+            query = delete(APIStorage).where(
                 APIStorage.user_id == user_id,
-                cast(APIStorage.storage_metadata['session_id'], String) == session_id
+                self._session_id_column() == session_id,
             )
-            data = self.db.execute(query).scalars().all()
-
-            if data:
-                for item in data:
-                    self.db.delete(item)
-                self.db.commit()
-                return True
-            return False
+            deleted = self.db.execute(query).rowcount
+            self.db.commit()
+            return deleted > 0
         except Exception as e:
             self.db.rollback()
             raise e
+
+
+class AsyncStorageService:
+    """
+    Async variants of the StorageService write and lookup methods.
+
+    Used by async views with DB_ASYNC_ENABLED so database I/O doesn't block the
+    event loop. Entries are built exactly like StorageService builds them.
+    """
+
+    def __init__(self, db: "AsyncSession"):
+        self.db = db
+
+    async def store_entry(self, storage: APIStorage) -> APIStorage:
+        """Insert an entry built with ``StorageService.build_entry``"""
+        self.db.add(storage)
+        await self.db.commit()
+        return storage
+
+    async def store_request(
+        self,
+        user_id: int,
+        endpoint: str,
+        request_data: Dict[str, Any],
+        ttl_days: Optional[int] = None,
+        compress: Optional[bool] = None,
+        metadata: Optional[Dict] = None,
+    ) -> APIStorage:
+        """Store request data"""
+        return await self.store_entry(StorageService.build_entry(
+            user_id=user_id,
+            endpoint=endpoint,
+            storage_type=StorageType.REQUEST,
+            data=request_data,
+            ttl_days=ttl_days,
+            compress=compress,
+            metadata=await self._with_session(user_id, metadata),
+        ))
+
+    async def store_response(
+        self,
+        user_id: int,
+        endpoint: str,
+        response_data: Dict[str, Any],
+        ttl_days: Optional[int] = None,
+        compress: Optional[bool] = None,
+        metadata: Optional[Dict] = None,
+    ) -> APIStorage:
+        """Store response data"""
+        return await self.store_entry(StorageService.build_entry(
+            user_id=user_id,
+            endpoint=endpoint,
+            storage_type=StorageType.RESPONSE,
+            data=response_data,
+            ttl_days=ttl_days,
+            compress=compress,
+            metadata=await self._with_session(user_id, metadata),
+        ))
+
+    async def store_data(
+        self,
+        user_id: int,
+        data: Any,
+        ttl_days: Optional[int] = None,
+        compress: Optional[bool] = None,
+        metadata: Optional[Dict] = None,
+    ) -> APIStorage:
+        """Store arbitrary data"""
+        return await self.store_entry(StorageService.build_entry(
+            user_id=user_id,
+            endpoint="data_storage",
+            storage_type=StorageType.DATA,
+            data=data,
+            ttl_days=ttl_days,
+            compress=compress,
+            metadata=await self._with_session(user_id, metadata),
+        ))
+
+    async def store_many(
+        self,
+        user_id: int,
+        items: List[Any],
+        ttl_days: Optional[int] = None,
+        compress: Optional[bool] = None,
+        metadata: Optional[Dict] = None,
+        item_metadata: Optional[List[Dict]] = None,
+    ) -> List[int]:
+        """Store several data payloads with one INSERT, see StorageService"""
+        if not items:
+            return []
+        if item_metadata is not None and len(item_metadata) != len(items):
+            raise ValueError("item_metadata must have one entry per item")
+
+        entries = StorageService.build_data_entries(
+            user_id,
+            items,
+            ttl_days,
+            compress,
+            await self._with_session(user_id, metadata),
+            item_metadata,
+        )
+        result = await self.db.execute(
+            StorageService.insert_returning_ids(), StorageService.entry_rows(entries)
+        )
+        storage_ids = list(result.scalars())
+        await self.db.commit()
+        return storage_ids
+
+    async def get_data(self, user_id: int, storage_id: int) -> Optional[Any]:
+        """Get stored data by ID"""
+        storage = await self.db.get(APIStorage, storage_id)
+        if not storage or storage.user_id != user_id:
+            return None
+
+        return StorageService._decode_data(storage)
+
+    async def get_data_many(
+        self, user_id: int, storage_ids: List[int]
+    ) -> Dict[int, Any]:
+        """Get stored data for several IDs in one query, keyed by storage ID"""
+        if not storage_ids:
+            return {}
+
+        result = await self.db.execute(
+            select(APIStorage).where(
+                APIStorage.user_id == user_id, APIStorage.id.in_(storage_ids)
+            )
+        )
+        return {
+            storage.id: StorageService._decode_data(storage)
+            for storage in result.scalars()
+        }
+
+    async def delete_data_by_id(self, user_id: int, storage_id: int) -> bool:
+        """Delete data by storage ID"""
+        result = await self.db.execute(
+            delete(APIStorage).where(
+                APIStorage.id == storage_id, APIStorage.user_id == user_id
+            )
+        )
+        await self.db.commit()
+        return result.rowcount > 0
+
+    async def delete_data_by_session_id(self, user_id: int, session_id: str) -> bool:
+        """Delete data by session ID"""
+        result = await self.db.execute(
+            delete(APIStorage).where(
+                APIStorage.user_id == user_id,
+                StorageService._session_id_column() == session_id,
+            )
+        )
+        await self.db.commit()
+        return result.rowcount > 0
+
+    @staticmethod
+    async def _with_session(user_id: int, metadata: Optional[Dict]) -> Dict:
+        """Copy of ``metadata`` with the user's storage session id filled in"""
+        metadata = dict(metadata or {})
+        if "session_id" not in metadata:
+            metadata["session_id"] = await get_or_create_session_async(user_id)
+        return metadata
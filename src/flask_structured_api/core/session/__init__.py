@@ -1,34 +1,99 @@
+from typing import Optional
 from uuid import uuid4
 
-from flask_structured_api.core.cache import get_redis
+from flask import g, has_request_context
+from redis import RedisError
+
+from flask_structured_api.core.cache import (
+    async_redis_enabled,
+    get_async_redis,
+    get_redis,
+)
 from flask_structured_api.core.exceptions import APIError
 
+# Return the live session and extend it, or start the candidate one. Runs
+# atomically, so concurrent requests of a user always agree on the session.
+GET_OR_CREATE_SCRIPT = """
+local session_id = redis.call('GET', KEYS[1])
+if session_id then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+    return session_id
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return ARGV[1]
+"""
+
+_get_or_create_script = None
+
+
+def _session_key(user_id: int) -> str:
+    return f"storage_session:{user_id}"
+
 
 def get_or_create_session(user_id: int, timeout_minutes: int = 30) -> str:
-    """Get existing session or create new one if expired/none exists"""
+    """
+    Get existing session or create new one if expired/none exists.
+
+    One Redis round trip; the result is memoised on ``g`` for the rest of the
+    request.
+    """
+    session_id = _memoised_session(user_id)
+    if session_id:
+        return session_id
+
+    global _get_or_create_script
     try:
-        redis = get_redis()
-        session_key = f"storage_session:{user_id}"
-        session_id = redis.get(session_key)
+        if _get_or_create_script is None:
+            _get_or_create_script = get_redis().register_script(GET_OR_CREATE_SCRIPT)
+        session_id = _get_or_create_script(
+            keys=[_session_key(user_id)], args=[str(uuid4()), timeout_minutes * 60]
+        )
+    except (APIError, RedisError):
+        # Fallback: generate new session ID if Redis is unavailable
+        session_id = str(uuid4())
 
-        if not session_id:
-            session_id = str(uuid4())
-            redis.set(session_key, session_id, ex=timeout_minutes * 60)
-        else:
-            # Extend session timeout
-            redis.expire(session_key, timeout_minutes * 60)
+    return _memoise_session(user_id, session_id)
 
+
+async def get_or_create_session_async(user_id: int, timeout_minutes: int = 30) -> str:
+    """Async variant of ``get_or_create_session`` for async views"""
+    if not async_redis_enabled():
+        return get_or_create_session(user_id, timeout_minutes)
+    session_id = _memoised_session(user_id)
+    if session_id:
         return session_id
-    except APIError:
-        # Fallback: generate new session ID if Redis is unavailable
-        return str(uuid4())
+
+    try:
+        script = get_async_redis().register_script(GET_OR_CREATE_SCRIPT)
+        session_id = await script(
+            keys=[_session_key(user_id)], args=[str(uuid4()), timeout_minutes * 60]
+        )
+    except (APIError, RedisError):
+        session_id = str(uuid4())
+
+    return _memoise_session(user_id, session_id)
+
+
+def _memoised_session(user_id: int) -> Optional[str]:
+    if has_request_context():
+        cached = getattr(g, "storage_session", None)
+        if cached and cached[0] == user_id:
+            return cached[1]
+    return None
+
+
+def _memoise_session(user_id: int, session_id: str) -> str:
+    if has_request_context():
+        g.storage_session = (user_id, session_id)
+    return session_id
 
 
 def clear_session(user_id: int) -> bool:
     """Clear user's session data"""
+    if has_request_context():
+        g.pop("storage_session", None)
     try:
         redis = get_redis()
-        session_key = f"storage_session:{user_id}"
-        return bool(redis.delete(session_key))
-    except APIError:
+        return bool(redis.delete(_session_key(user_id)))
+    except (APIError, RedisError):
         return False
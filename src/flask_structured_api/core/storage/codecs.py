@@ -0,0 +1,154 @@
+import lzma
+import zlib
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Type
+
+from flask_structured_api.core.config import settings
+from flask_structured_api.core.utils.logger import get_standalone_logger
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+codec_logger = get_standalone_logger("storage.codecs")
+
+# Rows written before the codec column existed were compressed with zlib
+LEGACY_CODEC = "zlib"
+
+
+class Codec(ABC):
+    """Byte-level compression codec for stored payloads"""
+
+    name: str = ""
+    default_level: Optional[int] = None
+
+    def __init__(self, level: Optional[int] = None):
+        self.level = self.default_level if level is None else level
+
+    @classmethod
+    def available(cls) -> bool:
+        return True
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """Compress ``data`` at the codec's level"""
+
+    @abstractmethod
+    def decompress(self, data: bytes) -> bytes:
+        """Restore bytes produced by ``compress``"""
+
+
+class ZlibCodec(Codec):
+    name = "zlib"
+    default_level = 6
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zlib.decompress(data)
+
+
+class LzmaCodec(Codec):
+    name = "lzma"
+    default_level = 6
+
+    def compress(self, data: bytes) -> bytes:
+        return lzma.compress(data, preset=self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return lzma.decompress(data)
+
+
+class ZstdCodec(Codec):
+    name = "zstd"
+    default_level = 3
+
+    @classmethod
+    def available(cls) -> bool:
+        return zstandard is not None
+
+    def compress(self, data: bytes) -> bytes:
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zstandard.ZstdDecompressor().decompress(data)
+
+
+class Lz4Codec(Codec):
+    name = "lz4"
+    default_level = 0
+
+    @classmethod
+    def available(cls) -> bool:
+        return lz4_frame is not None
+
+    def compress(self, data: bytes) -> bytes:
+        return lz4_frame.compress(data, compression_level=self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return lz4_frame.decompress(data)
+
+
+CODECS: Dict[str, Type[Codec]] = {
+    codec.name: codec for codec in (ZlibCodec, LzmaCodec, ZstdCodec, Lz4Codec)
+}
+
+
+def available_codecs() -> List[str]:
+    """Names of the codecs usable in this environment"""
+    return [name for name, codec in CODECS.items() if codec.available()]
+
+
+def get_codec(name: Optional[str] = None, level: Optional[int] = None) -> Codec:
+    """
+    Get a codec instance by name.
+
+    Raises:
+        ValueError: If the codec is unknown or its library isn't installed
+    """
+    name = name or LEGACY_CODEC
+    codec = CODECS.get(name)
+    if codec is None:
+        raise ValueError(
+            "Unknown compression codec '{}', expected one of: {}".format(
+                name, ", ".join(CODECS)
+            )
+        )
+    if not codec.available():
+        raise ValueError("Compression codec '{}' is not installed".format(name))
+    return codec(level)
+
+
+def default_codec() -> Codec:
+    """The configured storage codec, falling back to zlib if it isn't installed"""
+    try:
+        return get_codec(
+            settings.STORAGE_COMPRESSION_CODEC, settings.STORAGE_COMPRESSION_LEVEL
+        )
+    except ValueError as e:
+        codec_logger.warning("{}, falling back to {}".format(str(e), LEGACY_CODEC))
+        return get_codec(LEGACY_CODEC)
+
+
+def select_codec(
+    size: int, compress: Optional[bool] = None, codec: Optional[Codec] = None
+) -> Optional[Codec]:
+    """
+    Pick the codec for a serialized payload of ``size`` bytes.
+
+    ``compress=True`` always compresses and ``False`` never does. ``None`` applies
+    the auto policy: compress only payloads of at least
+    STORAGE_COMPRESSION_MIN_BYTES. ``codec`` overrides the configured codec.
+    """
+    if compress is False:
+        return None
+    if compress is None and size < settings.STORAGE_COMPRESSION_MIN_BYTES:
+        return None
+    return codec or default_codec()
@@ -7,32 +7,72 @@ import inspect
 from flask import Response, g, request, current_app
 
 from flask_structured_api.core.config import settings
-from flask_structured_api.core.db import get_session
+from flask_structured_api.core.db import (
+    async_engine_enabled,
+    get_async_session,
+    get_request_session,
+)
 from flask_structured_api.core.enums import StorageType
-from flask_structured_api.core.services.storage import StorageService
-from flask_structured_api.core.session import get_or_create_session
+from flask_structured_api.core.services.storage import (
+    AsyncStorageService,
+    StorageService,
+)
+from flask_structured_api.core.session import get_or_create_session_async
+from flask_structured_api.core.storage.writer import storage_writer
 
 
 def store_api_data(
     ttl_days: Optional[int] = None,
-    compress: bool = False,
+    compress: Optional[bool] = None,
     metadata: Optional[Dict[str, Any]] = None,
     storage_type: StorageType = StorageType.BOTH,
     session_timeout_minutes: int = 30,
+    write_behind: Optional[bool] = None,
 ) -> Callable:
-    """Decorator to store API request/response data"""
+    """
+    Decorator to store API request/response data
+
+    compress=None (the default) compresses payloads above
+    STORAGE_COMPRESSION_MIN_BYTES with the configured codec.
+
+    With write_behind (defaults to STORAGE_WRITE_BEHIND) entries are queued on
+    the storage writer and inserted in batches instead of being committed
+    before the response is returned. Otherwise, with DB_ASYNC_ENABLED entries
+    are written through the async engine without blocking the event loop.
+    """
+    use_write_behind = (
+        settings.STORAGE_WRITE_BEHIND if write_behind is None else write_behind
+    )
 
     def decorator(f):
         @wraps(f)
         async def wrapper(*args, **kwargs):
-            # Get storage service instance with a new session
-            db = next(get_session())
-            # Create new service instance with session
-            storage_service = StorageService(db)
             endpoint = request.path.strip("/")
 
+            async def save(entry_type: StorageType, data: Any) -> None:
+                entry = StorageService.build_entry(
+                    user_id=g.user_id,
+                    endpoint=endpoint,
+                    storage_type=entry_type,
+                    data=data,
+                    ttl_days=ttl_days,
+                    compress=compress,
+                    metadata=request_metadata,
+                )
+                if use_write_behind:
+                    storage_writer.enqueue(entry)
+                elif async_engine_enabled():
+                    # Short-lived async session, no connection held across f()
+                    async with get_async_session() as db:
+                        await AsyncStorageService(db).store_entry(entry)
+                else:
+                    # Storage service on the request's shared session
+                    StorageService(get_request_session()).store_entry(entry)
+
             # Get or create session with custom timeout
-            session_id = get_or_create_session(g.user_id, session_timeout_minutes)
+            session_id = await get_or_create_session_async(
+                g.user_id, session_timeout_minutes
+            )
 
             # Merge session_id into metadata
             request_metadata = metadata.copy() if metadata else {}
@@ -40,20 +80,13 @@ def store_api_data(
 
             # Store request data if needed
             if storage_type in [StorageType.REQUEST, StorageType.BOTH]:
-                storage_service.store_request(
-                    user_id=g.user_id,
-                    endpoint=endpoint,
-                    request_data={
-                        "method": request.method,
-                        "path": request.path,
-                        "args": dict(request.args),
-                        "headers": dict(request.headers),
-                        "data": request.get_json() if request.is_json else None,
-                    },
-                    ttl_days=ttl_days,
-                    compress=compress,
-                    metadata=request_metadata
-                )
+                await save(StorageType.REQUEST, {
+                    "method": request.method,
+                    "path": request.path,
+                    "args": dict(request.args),
+                    "headers": dict(request.headers),
+                    "data": request.get_json() if request.is_json else None,
+                })
 
             # Execute the function and get response
             response = await f(*args, **kwargs)
@@ -74,14 +107,7 @@ def store_api_data(
                     response_data = response if isinstance(
                         response, dict) else str(response)
 
-                storage_service.store_response(
-                    user_id=g.user_id,
-                    endpoint=endpoint,
-                    response_data=response_data,
-                    ttl_days=ttl_days,
-                    compress=compress,
-                    metadata=request_metadata
-                )
+                await save(StorageType.RESPONSE, response_data)
 
             return response
         return wrapper
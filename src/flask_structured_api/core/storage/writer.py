@@ -0,0 +1,167 @@
+import atexit
+import os
+import queue
+import threading
+from time import monotonic
+from typing import Any, Dict, List, Optional
+
+from prometheus_client import Counter
+from sqlalchemy import insert
+from sqlmodel import Session
+
+from flask_structured_api.core.config import settings
+from flask_structured_api.core.db import engine
+from flask_structured_api.core.models.domain.storage import APIStorage
+from flask_structured_api.core.services.storage import StorageService
+from flask_structured_api.core.utils.logger import get_standalone_logger
+
+writer_logger = get_standalone_logger("storage.writer")
+
+STORAGE_WRITER_RECORDS = Counter(
+    "api_storage_write_behind_records_total",
+    "Storage records handled by the write-behind writer",
+    ["outcome"],  # written | dropped | failed
+)
+
+
+class StorageWriter:
+    """
+    Write-behind buffer for API storage entries.
+
+    Entries are queued in a bounded in-process buffer and written by a background
+    thread with one multi-row INSERT per batch. A batch is flushed once it holds
+    ``batch_size`` entries or ``flush_interval_ms`` has passed since its first
+    entry. When the buffer is full, ``enqueue`` blocks for up to
+    ``enqueue_timeout_ms`` before dropping the entry. Whatever is still buffered
+    is flushed on interpreter shutdown.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = 10000,
+        batch_size: int = 100,
+        flush_interval_ms: int = 200,
+        enqueue_timeout_ms: int = 50,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.enqueue_timeout = enqueue_timeout_ms / 1000
+
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(
+            maxsize=max_queue_size
+        )
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._stats = {"written": 0, "dropped": 0, "failed": 0}
+
+    def enqueue(self, storage: APIStorage) -> bool:
+        """Queue an unsaved storage entry, returns False if it was dropped"""
+        self._ensure_started()
+        row = StorageService.entry_rows([storage])[0]
+        try:
+            self._queue.put(row, timeout=self.enqueue_timeout)
+            return True
+        except queue.Full:
+            self._record("dropped", 1)
+            writer_logger.warning(
+                "Storage write buffer full, dropping {} entry for {}".format(
+                    row.get("storage_type"), row.get("endpoint")
+                )
+            )
+            return False
+
+    def flush(self) -> None:
+        """Write everything currently buffered from the calling thread"""
+        while True:
+            batch = self._drain(block=False)
+            if not batch:
+                return
+            self._write(batch)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the background thread and flush the remaining entries"""
+        self._stop.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout)
+        self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        """Counts of written, dropped and failed entries plus the current backlog"""
+        with self._lock:
+            return {**self._stats, "queued": self._queue.qsize()}
+
+    def _ensure_started(self) -> None:
+        """Start the flush thread lazily, once per process (forked workers included)"""
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="storage-writer", daemon=True
+            )
+            self._thread.start()
+            atexit.register(self.stop)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            batch = self._drain(block=True)
+            if batch:
+                self._write(batch)
+
+    def _drain(self, block: bool) -> List[Dict[str, Any]]:
+        """
+        Collect up to one batch.
+
+        When blocking, waits up to one flush interval for a first entry, then
+        at most one flush interval from that entry for the rest of the batch.
+        """
+        try:
+            if block:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            else:
+                batch = [self._queue.get_nowait()]
+        except queue.Empty:
+            return []
+
+        deadline = monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - monotonic()
+            try:
+                if block and remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            with Session(engine) as session:
+                session.execute(insert(APIStorage.__table__), batch)
+                session.commit()
+            self._record("written", len(batch))
+        except Exception as e:
+            self._record("failed", len(batch))
+            writer_logger.error(
+                "Failed to write {} storage entries: {}".format(len(batch), str(e))
+            )
+
+    def _record(self, outcome: str, count: int) -> None:
+        with self._lock:
+            self._stats[outcome] += count
+        STORAGE_WRITER_RECORDS.labels(outcome=outcome).inc(count)
+
+
+# Global storage writer, its thread starts on first use
+storage_writer = StorageWriter(
+    max_queue_size=settings.STORAGE_WRITE_QUEUE_SIZE,
+    batch_size=settings.STORAGE_WRITE_BATCH_SIZE,
+    flush_interval_ms=settings.STORAGE_WRITE_FLUSH_INTERVAL_MS,
+    enqueue_timeout_ms=settings.STORAGE_WRITE_ENQUEUE_TIMEOUT_MS,
+)
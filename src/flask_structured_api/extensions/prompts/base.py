@@ -1,7 +1,5 @@
 from typing import Dict, Any, Optional, Type
 from pydantic import BaseModel, Field, create_model
-from langchain.prompts import PromptTemplate
-from langchain.output_parsers import PydanticOutputParser
 import json
 
 import logging
@@ -44,7 +42,9 @@ class STIPPrompt(BaseModel):
         """Convert prompt to AICompletionRequest format"""
         response_model = self.create_response_model()
 
-        # Create Langchain parser
+        # Create Langchain parser (imported here, langchain is slow to import)
+        from langchain.output_parsers import PydanticOutputParser
+
         parser = PydanticOutputParser(pydantic_object=response_model)
         format_instructions = parser.get_format_instructions()
 
@@ -1,5 +1,4 @@
 from typing import Dict, Type, List
-import pandas as pd
 from pathlib import Path
 from ..base import STIPPrompt
 
@@ -9,6 +8,8 @@ class PromptExcelManager:
 
     def export_to_excel(self, prompts: Dict[str, STIPPrompt], path: str) -> None:
         """Export prompts to Excel format"""
+        import pandas as pd  # Only needed here, slow to import
+
         data = []
         for name, prompt in prompts.items():
             data.append(prompt.to_excel_format())
@@ -18,6 +19,8 @@ class PromptExcelManager:
 
     def import_from_excel(self, path: str) -> Dict[str, STIPPrompt]:
         """Import prompts while preserving schemas"""
+        import pandas as pd
+
         df = pd.read_excel(path)
         prompts = {}
 
@@ -0,0 +1,104 @@
+import logging
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from flask_structured_api.core.config import settings
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+ai_logger = logging.getLogger("ai")
+
+# Rough ratio used when tiktoken isn't installed
+CHARS_PER_TOKEN = 4
+# No tokenizer produces longer tokens on average, so reading this many
+# characters per token of budget never cuts text that would fit
+MAX_CHARS_PER_TOKEN = 16
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    """tiktoken encoding of ``model``, None to fall back to estimates"""
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # Encodings are downloaded on first use, which fails offline
+        ai_logger.warning("No tiktoken encoding for {}: {}".format(model, e))
+        return None
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Number of tokens of ``text`` for ``model`` (estimated without tiktoken)"""
+    encoding = _encoding(model or settings.AI_MODEL)
+    if encoding is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def split_text(
+    text: str,
+    chunk_tokens: Optional[int] = None,
+    overlap_tokens: Optional[int] = None,
+    max_chunks: Optional[int] = None,
+    model: Optional[str] = None,
+) -> Tuple[List[str], bool]:
+    """
+    Split ``text`` into windows of at most ``chunk_tokens`` tokens.
+
+    Consecutive chunks share ``overlap_tokens`` so facts on a boundary appear
+    whole in one of them. At most ``max_chunks`` are returned; only the text
+    those can hold is tokenized, so memory stays bounded for any input.
+    Returns the chunks and whether text was left out.
+    """
+    chunk_tokens = chunk_tokens or settings.STIP_CHUNK_TOKENS
+    if overlap_tokens is None:
+        overlap_tokens = settings.STIP_CHUNK_OVERLAP_TOKENS
+    overlap_tokens = min(overlap_tokens, chunk_tokens // 2)
+    max_chunks = max_chunks or settings.STIP_MAX_CHUNKS
+    stride = chunk_tokens - overlap_tokens
+    budget = stride * (max_chunks - 1) + chunk_tokens
+
+    encoding = _encoding(model or settings.AI_MODEL)
+    if encoding is None:
+        return _split_chars(
+            text,
+            chunk_tokens * CHARS_PER_TOKEN,
+            overlap_tokens * CHARS_PER_TOKEN,
+            max_chunks,
+        )
+
+    window = text[: budget * MAX_CHARS_PER_TOKEN]
+    tokens = encoding.encode(window, disallowed_special=())
+    truncated = len(tokens) > budget or len(window) < len(text)
+    if len(tokens) <= chunk_tokens:
+        return [window], truncated
+
+    chunks = []
+    for start in range(0, min(len(tokens), budget), stride):
+        chunks.append(encoding.decode(tokens[start:start + chunk_tokens]))
+        if start + chunk_tokens >= len(tokens) or len(chunks) == max_chunks:
+            break
+    return chunks, truncated
+
+
+def _split_chars(
+    text: str, size: int, overlap: int, max_chunks: int
+) -> Tuple[List[str], bool]:
+    if len(text) <= size:
+        return [text], False
+
+    chunks = []
+    for start in range(0, len(text), size - overlap):
+        chunks.append(text[start:start + size])
+        if start + size >= len(text):
+            break
+        if len(chunks) == max_chunks:
+            return chunks, True
+    return chunks, False
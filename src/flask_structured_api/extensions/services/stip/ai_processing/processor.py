@@ -6,7 +6,14 @@ from flask_structured_api.core.models.errors.ai import AIResponseValidationError
 from flask_structured_api.core.enums import AIErrorCode, WarningCode, WarningSeverity
 from flask_structured_api.core.models.responses import ErrorResponse, SuccessResponse
 from flask_structured_api.core.models.errors.base import ErrorDetail
+from flask_structured_api.core.config import settings
+from flask_structured_api.core.warnings import WarningCollector
+from flask_structured_api.extensions.services.stip.ai_processing.chunking import MAX_CHARS_PER_TOKEN, count_tokens, split_text
+from flask_structured_api.extensions.services.stip.ai_processing.retrieval import PassageIndex, prompt_query, with_initiative
+from flask_structured_api.extensions.services.stip.ai_processing.reducers import reduce_results
+import asyncio
 import logging
+from time import perf_counter
 from flask import current_app
 import json
 from pydantic import BaseModel
@@ -15,11 +22,26 @@ from pydantic.fields import FieldInfo
 ai_logger = logging.getLogger("ai")
 
 
+class _PromptFailed(Exception):
+    """Carries the ErrorResponse of a failed prompt out of asyncio.gather"""
+
+    def __init__(self, response: ErrorResponse):
+        super().__init__(response.message)
+        self.response = response
+
+
+def _failure_message(failure: Union[ErrorResponse, BaseException]) -> str:
+    if isinstance(failure, ErrorResponse):
+        return failure.message or str(failure.error.code)
+    return "{}: {}".format(type(failure).__name__, failure)
+
+
 class AIProcessor:
     """Handles all AI-related processing tasks"""
 
     def __init__(self, prompt_path: Optional[str] = None):
         self.prompts = self._initialize_prompts(prompt_path)
+        self._queries: Dict[str, Dict[str, float]] = {}  # retrieval query per prompt
 
     def _initialize_prompts(self, prompt_path: Optional[str] = None) -> Dict:
         """Initialize prompts from Excel if available, otherwise use defaults"""
@@ -29,15 +51,130 @@ class AIProcessor:
                 "Excel prompt loading not yet implemented, using defaults")
         return STIP_PROMPTS
 
-    async def process_prompt(self, prompt_type: str, text: str, initiative_name: str) -> Union[ErrorResponse, SuccessResponse]:
-        """Process a single prompt and return the AI response with metadata"""
+    async def process_prompt(self, prompt_type: str, text: str, initiative_name: str, chunks: Optional[List[str]] = None, semaphore: Optional[asyncio.Semaphore] = None) -> Union[ErrorResponse, SuccessResponse]:
+        """
+        Process a single prompt and return the AI response with metadata.
+
+        Text longer than STIP_RETRIEVAL_TOKENS is first reduced to the
+        passages most relevant to the dimension. Text longer than
+        STIP_CHUNK_TOKENS is split into overlapping chunks (pass ``chunks`` to
+        skip both steps), the prompt runs on every chunk concurrently and the
+        chunk results are merged by the dimension's reducer. ``semaphore``
+        bounds concurrent provider calls.
+        """
         if prompt_type not in self.prompts:
             raise ValueError("Unknown prompt type: {}".format(prompt_type))
+        if chunks is None:
+            index = self.passage_index(text)
+            if index is not None:
+                text = self.relevant_text(prompt_type, index, initiative_name)
+            chunks = self.split_text(text)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(max(1, settings.AI_PROMPT_CONCURRENCY))
+
+        if len(chunks) == 1:
+            return await self._process_chunk(prompt_type, chunks[0], initiative_name, semaphore)
+
+        tasks = [
+            asyncio.ensure_future(
+                self._process_chunk(prompt_type, chunk, initiative_name, semaphore))
+            for chunk in chunks
+        ]
+        try:
+            responses = await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        return self._merge_chunks(prompt_type, responses)
+
+    def passage_index(self, text: str) -> Optional[PassageIndex]:
+        """BM25 index of ``text`` if it is long enough to be filtered per prompt"""
+        if not settings.STIP_RETRIEVAL_ENABLED:
+            return None
+        budget = settings.STIP_RETRIEVAL_TOKENS
+        # Counting a prefix is enough to tell, and bounded for any input
+        if count_tokens(text[:(budget + 1) * MAX_CHARS_PER_TOKEN]) <= budget:
+            return None
+        return PassageIndex(text, settings.STIP_RETRIEVAL_PASSAGE_WORDS)
+
+    def relevant_text(self, prompt_type: str, index: PassageIndex, initiative_name: str) -> str:
+        """Passages of an indexed document most relevant to one prompt"""
+        if prompt_type not in self._queries:
+            self._queries[prompt_type] = prompt_query(self.prompts[prompt_type])
+        text = index.select(
+            with_initiative(self._queries[prompt_type], initiative_name),
+            max_tokens=settings.STIP_RETRIEVAL_TOKENS,
+            top_k=settings.STIP_RETRIEVAL_TOP_K
+        )
+        ai_logger.debug("Selected {} of {} characters for {}".format(
+            len(text), sum(len(p) for p in index.passages), prompt_type))
+        return text
+
+    def split_text(self, text: str) -> List[str]:
+        """Token-bounded chunks of ``text``, warns when the document was cut"""
+        chunks, truncated = split_text(text)
+        if truncated:
+            ai_logger.warning(
+                "Text truncated to {} chunks for processing".format(len(chunks)))
+            WarningCollector.add_warning(
+                message="Document exceeds {} chunks of {} tokens, the rest was not analyzed".format(
+                    settings.STIP_MAX_CHUNKS, settings.STIP_CHUNK_TOKENS),
+                code=WarningCode.CONTENT_TRUNCATED,
+                severity=WarningSeverity.MEDIUM
+            )
+        return chunks
+
+    def _merge_chunks(self, prompt_type: str, responses: List[Union[ErrorResponse, SuccessResponse]]) -> Union[ErrorResponse, SuccessResponse]:
+        """Reduce the chunk responses of one prompt into a single response"""
+        succeeded = [r for r in responses if isinstance(r, SuccessResponse)]
+        if not succeeded:
+            return responses[0]
+
+        failed = len(responses) - len(succeeded)
+        if failed:
+            WarningCollector.add_warning(
+                message="Prompt {} failed on {} of {} text chunks".format(
+                    prompt_type, failed, len(responses)),
+                code=WarningCode.PROMPT_PROCESSING_ERROR,
+                severity=WarningSeverity.MEDIUM
+            )
 
+        usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        duration = 0
+        confidences = []
+        for response in succeeded:
+            chunk_usage = response.metadata.get("usage") or {}
+            for key in usage:
+                usage[key] += chunk_usage.get(key, 0)
+            duration += (response.metadata.get("performance") or {}).get("total_duration", 0)
+            if response.metadata.get("confidence") is not None:
+                confidences.append(response.metadata["confidence"])
+
+        metadata = {
+            # A merged answer is only as sure as its least sure part
+            "confidence": min(confidences) if confidences else None,
+            "performance": {
+                "total_duration": duration,
+                "tokens_per_second": usage["total_tokens"] / duration if duration > 0 else 0
+            },
+            "usage": usage,
+            "chunks": {"total": len(responses), "failed": failed}
+        }
+        return SuccessResponse(
+            data={
+                "data": reduce_results(prompt_type, [r.data["data"] for r in succeeded]),
+                "metadata": metadata
+            },
+            message="Successfully processed {} prompt over {} chunks".format(
+                prompt_type, len(responses)),
+            metadata=metadata
+        )
+
+    async def _process_chunk(self, prompt_type: str, text: str, initiative_name: str, semaphore: asyncio.Semaphore) -> Union[ErrorResponse, SuccessResponse]:
+        """Run one prompt on one piece of text"""
         prompt = self.prompts[prompt_type]
         completion_request = prompt.to_completion_request(
             initiative_name=initiative_name,
-            # TODO: Remove this once we have a better way to handle long text
             text=text
         )
 
@@ -48,10 +185,11 @@ class AIProcessor:
             response_schema=completion_request["response_schema"]
         )
 
-        response = await current_app.ai_service.complete(
-            request=ai_request,
-            response_schema=ai_request.response_schema
-        )
+        async with semaphore:
+            response = await current_app.ai_service.complete(
+                request=ai_request,
+                response_schema=ai_request.response_schema
+            )
 
         if isinstance(response.content["data"], dict) and "$schema" in response.content["data"]:
             ai_logger.warning(
@@ -108,9 +246,52 @@ class AIProcessor:
         """Process text with selected prompts"""
         return await self._process_multiple_prompts(prompt_types, text, initiative_name)
 
-    async def _process_multiple_prompts(self, prompt_types: List[str], text: str, initiative_name: str) -> Union[ErrorResponse, SuccessResponse]:
-        """Internal method to process multiple prompts and aggregate results"""
+    async def _process_multiple_prompts(self, prompt_types: List[str], text: str, initiative_name: str, fail_fast: Optional[bool] = None) -> Union[ErrorResponse, SuccessResponse]:
+        """
+        Process multiple prompts concurrently and aggregate results.
+
+        The text is indexed or split once; up to AI_PROMPT_CONCURRENCY provider calls
+        (prompts x chunks) run at once and results are merged in the order of
+        ``prompt_types``. With ``fail_fast`` (default from
+        AI_PROMPT_FAILURE_POLICY) the first failure cancels the remaining
+        prompts and is returned; otherwise failed prompts become warnings and
+        only fail the request when none succeeded.
+        """
+        prompt_types = list(prompt_types)
+        for prompt_type in prompt_types:
+            if prompt_type not in self.prompts:
+                raise ValueError("Unknown prompt type: {}".format(prompt_type))
+        if fail_fast is None:
+            fail_fast = settings.AI_PROMPT_FAILURE_POLICY == "fail_fast"
+
+        # Long texts are filtered per prompt, otherwise all prompts share a split
+        index = self.passage_index(text)
+        chunks = self.split_text(text) if index is None else None
+        semaphore = asyncio.Semaphore(max(1, settings.AI_PROMPT_CONCURRENCY))
+
+        async def run(prompt_type: str) -> Union[ErrorResponse, SuccessResponse]:
+            prompt_chunks = chunks or self.split_text(
+                self.relevant_text(prompt_type, index, initiative_name))
+            response = await self.process_prompt(
+                prompt_type, text, initiative_name, chunks=prompt_chunks, semaphore=semaphore)
+            if fail_fast and isinstance(response, ErrorResponse):
+                raise _PromptFailed(response)
+            return response
+
+        started = perf_counter()
+        tasks = [asyncio.ensure_future(run(prompt_type)) for prompt_type in prompt_types]
+        try:
+            responses = await asyncio.gather(*tasks, return_exceptions=not fail_fast)
+        except _PromptFailed as e:
+            return e.response
+        finally:
+            # gather doesn't cancel siblings when one fails
+            for task in tasks:
+                task.cancel()
+        wall_duration = perf_counter() - started
+
         results = {}
+        failures = {}
         total_usage = {
             "prompt_tokens": 0,
             "completion_tokens": 0,
@@ -118,13 +299,14 @@ class AIProcessor:
         }
         total_performance = {
             "total_duration": 0,
+            "wall_duration": wall_duration,
             "tokens_per_second": 0
         }
 
-        for prompt_type in prompt_types:
-            response = await self.process_prompt(prompt_type, text, initiative_name)
-            if isinstance(response, ErrorResponse):
-                return response
+        for prompt_type, response in zip(prompt_types, responses):
+            if not isinstance(response, SuccessResponse):
+                failures[prompt_type] = response
+                continue
 
             results[prompt_type] = response.data
 
@@ -138,6 +320,22 @@ class AIProcessor:
             total_performance["total_duration"] += performance.get("total_duration", 0)
             # We'll calculate the average tokens/sec at the end
 
+        if failures and not results:
+            failure = next(iter(failures.values()))
+            if isinstance(failure, BaseException):
+                raise failure
+            return failure
+
+        for prompt_type, failure in failures.items():
+            ai_logger.warning(
+                "Prompt {} failed: {}".format(prompt_type, _failure_message(failure)))
+            WarningCollector.add_warning(
+                message="Prompt {} failed: {}".format(
+                    prompt_type, _failure_message(failure)),
+                code=WarningCode.PROMPT_PROCESSING_ERROR,
+                severity=WarningSeverity.HIGH
+            )
+
         # Calculate final values
         total_usage["total_tokens"] = total_usage["prompt_tokens"] + \
             total_usage["completion_tokens"]
@@ -150,14 +348,19 @@ class AIProcessor:
             (total_usage["completion_tokens"] * 0.002 / 1000)
         )
 
+        metadata = {
+            "total_cost": total_cost,
+            "total_usage": total_usage,
+            "total_performance": total_performance
+        }
+        if failures:
+            metadata["failed_prompts"] = list(failures)
+
         return SuccessResponse(
             data=results,
-            message="Successfully processed prompts",
-            metadata={
-                "total_cost": total_cost,
-                "total_usage": total_usage,
-                "total_performance": total_performance
-            }
+            message="Successfully processed prompts" if not failures
+            else "Processed {} of {} prompts".format(len(results), len(prompt_types)),
+            metadata=metadata
         )
 
     async def process_one_shot(self, prompt_types: List[str], text: str, initiative_name: str) -> Union[ErrorResponse, SuccessResponse]:
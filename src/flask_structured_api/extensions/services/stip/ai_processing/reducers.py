@@ -0,0 +1,109 @@
+"""
+Merge per-chunk results of a STIP prompt into one result.
+
+Each reducer receives the ``data`` of every successful chunk, in document
+order, and returns the merged ``data``. Keys a reducer doesn't handle are
+taken from the first chunk.
+"""
+import json
+import re
+from typing import Any, Callable, Dict, List
+
+Reducer = Callable[[List[Dict[str, Any]]], Dict[str, Any]]
+
+YEAR = re.compile(r"\b(\d{4})\b")
+
+
+def _normalize(value: Any) -> str:
+    if isinstance(value, str):
+        return " ".join(value.lower().split())
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def union(field: str, *keys: str) -> Reducer:
+    """Concatenate the ``field`` lists, dropping items already seen by ``keys``"""
+
+    def reduce(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        merged = dict(results[0])
+        seen = set()
+        items = []
+        for result in results:
+            for item in result.get(field) or []:
+                if isinstance(item, dict) and keys:
+                    identity = tuple(_normalize(item.get(key)) for key in keys)
+                else:
+                    identity = _normalize(item)
+                if identity not in seen:
+                    seen.add(identity)
+                    items.append(item)
+        merged[field] = items
+        return merged
+
+    return reduce
+
+
+def first_with(predicate: Callable[[Dict[str, Any]], bool]) -> Reducer:
+    """The first chunk result matching ``predicate``, else the first one"""
+
+    def reduce(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        matching = (result for result in results if predicate(result))
+        return dict(next(matching, results[0]))
+
+    return reduce
+
+
+def identification(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Present if any chunk found it, absent only if every chunk is sure it isn't"""
+    for value in (1, 99):
+        for result in results:
+            if result.get("value") == value:
+                return dict(result)
+    return dict(results[0])
+
+
+def earliest_start_date(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """The chunk result naming the earliest start year"""
+
+    def year(result: Dict[str, Any]) -> int:
+        match = YEAR.search(str((result.get("start_date") or {}).get("date", "")))
+        return int(match.group(1)) if match else 10000
+
+    return dict(min(results, key=year))
+
+
+def generic(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Union every list field, other fields from the first chunk that has them"""
+    merged: Dict[str, Any] = {}
+    for result in results:
+        for key, value in result.items():
+            if isinstance(value, list):
+                merged[key] = merged.get(key, []) + value
+            elif merged.get(key) in (None, "", {}):
+                merged[key] = value
+    for key, value in merged.items():
+        if isinstance(value, list):
+            merged[key] = union(key)([{key: value}])[key]
+    return merged
+
+
+REDUCERS: Dict[str, Reducer] = {
+    # Same amount for the same year is the same budget line
+    "budget": union("budget_items", "text", "year"),
+    "description": first_with(lambda result: bool(result.get("text"))),
+    "evaluation": first_with(
+        lambda result: bool((result.get("evaluation") or {}).get("has_evaluation"))
+    ),
+    "identification": identification,
+    "objectives": union("objectives", "title"),
+    "policy_instruments": union("instruments", "instrument_id"),
+    "start_date": earliest_start_date,
+    "target_groups": union("target_groups", "target_group_id"),
+    "themes": union("themes", "theme_code"),
+}
+
+
+def reduce_results(prompt_type: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merged data of a prompt's chunk results"""
+    if len(results) == 1:
+        return results[0]
+    return REDUCERS.get(prompt_type, generic)(results)
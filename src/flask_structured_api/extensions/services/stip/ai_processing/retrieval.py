@@ -0,0 +1,204 @@
+"""
+Local relevance filtering of document text per STIP dimension.
+
+The document is split into passages once and indexed for BM25. Each prompt
+then only receives the passages ranked highest for a query built from its
+own instructions, response fields, reference data and a few dimension
+keywords, plus the initiative name.
+"""
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+from flask_structured_api.extensions.prompts.base import STIPPrompt
+from flask_structured_api.extensions.services.stip.ai_processing.chunking import (
+    count_tokens,
+)
+
+WORD = re.compile(r"[^\W_]+|[€$£¥]")
+SENTENCE = re.compile(r"(?<=[.!?;])\s+")
+PARAGRAPH = re.compile(r"\n\s*\n")
+YEAR = re.compile(r"^(19|20)\d\d$")
+CURRENCIES = frozenset("€$£¥")
+
+# Pseudo-terms so dimensions can ask for dates and amounts
+YEAR_TERM = "__year__"
+CURRENCY_TERM = "__currency__"
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have if in into is it its of on or that
+the their this to was were which with within any not no your you they them
+""".split())
+
+# Extra query terms per dimension, weighted above terms from the prompt
+DIMENSION_KEYWORDS: Dict[str, List[str]] = {
+    "budget": [
+        CURRENCY_TERM, "budget", "funding", "funds", "funded", "million",
+        "billion", "eur", "euro", "euros", "usd", "dollars", "allocated",
+        "allocation", "financing", "grant", "grants", "investment", "expenditure",
+    ],
+    "start_date": [
+        YEAR_TERM, "launched", "launch", "started", "start", "established",
+        "since", "began", "introduced", "adopted", "entered", "force",
+    ],
+    "evaluation": [
+        "evaluation", "evaluated", "evaluate", "assessment", "review",
+        "monitoring", "impact", "indicators", "audit",
+    ],
+    "objectives": [
+        "objective", "objectives", "aim", "aims", "goal", "goals", "purpose",
+        "target", "targets", "mission",
+    ],
+    "target_groups": ["beneficiaries", "eligible", "applicants", "recipients"],
+    "policy_instruments": ["programme", "program", "scheme", "instrument", "call"],
+}
+
+# BM25 parameters
+K1 = 1.5
+B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    terms = []
+    for term in WORD.findall(text.lower()):
+        if term in CURRENCIES:
+            terms.append(CURRENCY_TERM)
+        elif term not in STOPWORDS:
+            terms.append(term)
+            if YEAR.match(term):
+                terms.append(YEAR_TERM)
+    return terms
+
+
+def split_passages(text: str, size: int = 120) -> List[str]:
+    """
+    Passages of about ``size`` words along paragraph and sentence boundaries.
+
+    Short paragraphs (one line per paragraph in extracted PDFs) are joined,
+    long ones split between sentences; run-on text without punctuation is
+    cut every ``size`` words.
+    """
+    passages: List[str] = []
+    current: List[str] = []
+    count = 0
+
+    def flush():
+        nonlocal current, count
+        if current:
+            passages.append(" ".join(current))
+        current, count = [], 0
+
+    for paragraph in PARAGRAPH.split(text):
+        for sentence in SENTENCE.split(paragraph.strip()):
+            words = sentence.split()
+            for start in range(0, len(words), size):
+                piece = words[start:start + size]
+                if count and count + len(piece) > size:
+                    flush()
+                current.append(" ".join(piece))
+                count += len(piece)
+        if count >= size // 2:
+            flush()
+    flush()
+    return passages
+
+
+class PassageIndex:
+    """BM25 index over the passages of one document"""
+
+    def __init__(self, text: str, passage_words: int = 120):
+        self.passages = split_passages(text, passage_words)
+        self.term_counts = [Counter(tokenize(passage)) for passage in self.passages]
+        self.lengths = [sum(counts.values()) for counts in self.term_counts]
+        self.average_length = sum(self.lengths) / max(len(self.lengths), 1)
+        document_frequency = Counter(
+            term for counts in self.term_counts for term in counts
+        )
+        total = len(self.passages)
+        self.idf = {
+            term: math.log(1 + (total - df + 0.5) / (df + 0.5))
+            for term, df in document_frequency.items()
+        }
+
+    def scores(self, query: Dict[str, float]) -> List[float]:
+        scores = []
+        for counts, length in zip(self.term_counts, self.lengths):
+            norm = K1 * (1 - B + B * length / (self.average_length or 1))
+            score = 0.0
+            for term, tf in counts.items():
+                weight = query.get(term)
+                if weight:
+                    score += weight * self.idf[term] * tf * (K1 + 1) / (tf + norm)
+            scores.append(score)
+        return scores
+
+    def select(self, query: Dict[str, float], max_tokens: int, top_k: int) -> str:
+        """
+        Highest-ranked passages for ``query`` within ``max_tokens``.
+
+        The lead passage, which usually introduces the initiative, is always
+        kept. Passages are returned in document order.
+        """
+        scores = self.scores(query)
+        ranked = sorted(
+            (i for i in range(1, len(self.passages)) if scores[i] > 0),
+            key=lambda i: scores[i],
+            reverse=True,
+        )
+        # Nothing matched: fall back to the start of the document
+        candidates = [0] + (ranked or list(range(1, len(self.passages))))
+
+        selected = []
+        used = 0
+        for i in candidates:
+            if len(selected) == top_k:
+                break
+            tokens = count_tokens(self.passages[i])
+            if used + tokens > max_tokens:
+                continue
+            selected.append(i)
+            used += tokens
+        return "\n\n".join(self.passages[i] for i in sorted(selected))
+
+
+def _field_descriptions(response_fields: Dict[str, Any]) -> Iterable[str]:
+    for field_type, field_info in response_fields.values():
+        if getattr(field_info, "description", None):
+            yield field_info.description
+        for model in (field_type, *getattr(field_type, "__args__", ())):
+            for field in getattr(model, "model_fields", {}).values():
+                if field.description:
+                    yield field.description
+
+
+def _reference_texts(reference_data: Optional[Dict[str, Any]]) -> Iterable[str]:
+    for items in (reference_data or {}).values():
+        for item in items if isinstance(items, list) else [items]:
+            if isinstance(item, dict):
+                yield from (str(value) for value in item.values())
+            else:
+                yield str(item)
+
+
+def prompt_query(prompt: STIPPrompt) -> Dict[str, float]:
+    """Query term weights of a prompt, without the initiative name"""
+    texts = [
+        prompt.description,
+        prompt.system_message,
+        prompt.template.replace("{initiative_name}", ""),
+        *_field_descriptions(prompt.response_fields),
+        *_reference_texts(prompt.reference_data),
+    ]
+    query = {term: 1.0 for text in texts for term in tokenize(text)}
+    for term in DIMENSION_KEYWORDS.get(prompt.name, []):
+        query[term] = 2.0
+    return query
+
+
+def with_initiative(query: Dict[str, float], initiative_name: str) -> Dict[str, float]:
+    """``query`` with the initiative name's terms weighted highest"""
+    query = dict(query)
+    for term in tokenize(initiative_name):
+        query[term] = 3.0
+    return query
@@ -3,33 +3,38 @@ import socket
 import asyncio
 import logging
 import json
-import inspect
 from functools import wraps
 
-from flask import Flask, request, make_response
-from asgiref.wsgi import WsgiToAsgi
 from asgiref.sync import sync_to_async, async_to_sync
 from flask_openapi3 import Info, Tag
 from functools import partial
 from flask_migrate import Migrate
 
+from flask_structured_api.core.asgi import (
+    AsyncCompatibleWsgiToAsgi,
+    AsyncFlask,
+    NativeASGIApp,
+)
 from flask_structured_api.core.cli import init_cli
 from flask_structured_api.core.config import settings
 from flask_structured_api.core.db.shared import db  # Import shared instance
 from flask_structured_api.core.handlers import register_error_handlers
-from flask_structured_api.core.middleware import setup_request_context, setup_cors
+from flask_structured_api.core.middleware import (
+    setup_request_context,
+    setup_cors,
+    setup_rate_limiting,
+)
 from flask_structured_api.core.middleware.logging import (
     setup_request_logging,
     setup_response_logging,
 )
 from flask_structured_api.core.utils.logger import create_logger_system, get_standalone_logger
-from flask_structured_api.core.services.ai import AIService
-from flask_structured_api.core.ai.providers import get_provider
 from flask_structured_api.api.core import init_app
 from flask_structured_api.core.services.storage import StorageService
 
 _debugger_initialized = False
 _flask_app = None
+_asgi_app = None
 
 # Create standalone logger for system initialization
 init_logger = get_standalone_logger("init")
@@ -99,19 +104,6 @@ def cleanup_socket(sock):
         pass
 
 
-class AsyncFlask(Flask):
-    """Flask subclass that handles both sync and async responses"""
-
-    def make_response(self, rv):
-        """Override to handle both coroutine and regular returns"""
-        if inspect.iscoroutine(rv):
-            # For async endpoints, return the coroutine directly
-            # It will be handled by the ASGI wrapper
-            return rv
-        # For sync endpoints, handle normally
-        return super().make_response(rv)
-
-
 def create_flask_app():
     """Create and configure Flask application"""
     global _flask_app
@@ -169,6 +161,7 @@ def create_flask_app():
 
     # Register middleware in correct order
     setup_request_context(app)
+    setup_rate_limiting(app)
     # app.before_request(setup_request_logging)
 
     # Register blueprints and handlers
@@ -182,63 +175,35 @@ def create_flask_app():
     return app
 
 
-class AsyncCompatibleWsgiToAsgi(WsgiToAsgi):
-    """Custom ASGI wrapper that handles both sync and async responses"""
-
-    async def __call__(self, scope, receive, send):
-        if scope["type"] == "http":
-            async def modified_send(message):
-                if message["type"] == "http.response.start":
-                    headers = list(message.get("headers", []))
-                    headers = [h for h in headers if h[0].lower() != b"content-length"]
-                    headers.append((b"transfer-encoding", b"chunked"))
-                    message["headers"] = headers
-                await send(message)
-
-            response = await super().__call__(scope, receive, modified_send)
-
-            # If response is a coroutine, await it
-            if inspect.iscoroutine(response):
-                response = await response
-
-            return response
-        return await super().__call__(scope, receive, send)
-
-
 def create_app():
-    """Create main ASGI application"""
-    flask_app = create_flask_app()
-    app = AsyncFlask(__name__)
-
-    # Copy config and setup from create_flask_app
-    app.config.update(flask_app.config)
-
-    # Setup request context first
-    setup_request_context(app)
+    """
+    Create main ASGI application around the single Flask app.
 
-    # Then set up CORS
-    setup_cors(app)
+    With ASGI_NATIVE (the default) async views are awaited on the server's
+    event loop; otherwise every request goes through the WSGI bridge.
+    """
+    global _asgi_app
 
-    # Copy over loggers and services
-    for attr in ['loggers', 'system_logger', 'logger', 'db_logger',
-                 'ai_logger', 'backup_logger', 'api_logger',
-                 'ai_service', 'db', 'redis', 'storage_service']:
-        if hasattr(flask_app, attr):
-            setattr(app, attr, getattr(flask_app, attr))
+    if _asgi_app is not None:
+        return _asgi_app
 
-    # Register other middleware
-    init_app(app)
-    register_error_handlers(app)
+    flask_app = create_flask_app()
 
     # Initialize debugger if needed
     _init_debugger()
 
-    # Use our custom ASGI wrapper
-    asgi_app = AsyncCompatibleWsgiToAsgi(app)
-    asgi_app.flask_app = app
+    if settings.ASGI_NATIVE:
+        _asgi_app = NativeASGIApp(flask_app)
+    else:
+        _asgi_app = AsyncCompatibleWsgiToAsgi(flask_app)
+        _asgi_app.flask_app = flask_app
 
-    return asgi_app
+    return _asgi_app
 
 
-# Create app instance for Hypercorn
-app = create_app()
+def __getattr__(name: str):
+    # "factory:app" still works for Hypercorn, but importing the factory no
+    # longer builds the application
+    if name == "app":
+        return create_app()
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
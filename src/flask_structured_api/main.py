@@ -9,10 +9,8 @@ from flask_structured_api.core.ai.providers import get_provider
 
 def create_application():
     """Create and initialize the application"""
-    # Create both WSGI and ASGI apps using the same base Flask app
-    flask_app = create_flask_app()  # This will return the same instance
-    asgi_wrapped = create_app()     # This will use the same base instance
-    flask_asgi_app = asgi_wrapped.flask_app
+    # create_app wraps the single Flask app created by create_flask_app
+    flask_app = create_flask_app()
 
     # Initialize services within app context
     with flask_app.app_context():
@@ -26,13 +24,7 @@ def create_application():
         flask_app.stip_processor = STIPProcessor(file_store=file_store)
         flask_app.warning_collector = WarningCollector()
 
-        # Copy services to the underlying Flask app of the ASGI wrapper
-        flask_asgi_app.ai_service = flask_app.ai_service
-        flask_asgi_app.file_store = flask_app.file_store
-        flask_asgi_app.stip_processor = flask_app.stip_processor
-        flask_asgi_app.warning_collector = flask_app.warning_collector
-
-    return asgi_wrapped
+    return create_app()
 
 
 # Create the application instance